@@ -1,15 +1,41 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
+from .cache import init_cache
+from .compression import init_compression
 from .config import get_config
+from .events import init_events
+from .metrics import init_metrics
+from .models import init_engine
+from .pagination import InvalidCursor, handle_invalid_cursor
+from .passwords import PasswordHasherBusy, handle_password_hasher_busy, init_password_hasher
+from .ratelimit import init_rate_limiter
+from .scholarship_lifecycle import init_scholarship_lifecycle
+from .serialization import AppJSONProvider, InvalidFields, handle_invalid_fields
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.json = AppJSONProvider(app)
     app.config.from_mapping(get_config())
+    if app.config["TRUSTED_PROXY_COUNT"]:
+        proxies = app.config["TRUSTED_PROXY_COUNT"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies, x_host=proxies)
+    init_engine(app.config)
+    init_password_hasher(app.config)
+    init_cache(app.config)
+    init_events(app.config)
+    init_metrics(app)
+    init_scholarship_lifecycle(app)
+    init_rate_limiter(app)
+    init_compression(app)
 
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, expose_headers=["X-Next-Cursor", "ETag"])
     JWTManager(app)
+    app.register_error_handler(InvalidCursor, handle_invalid_cursor)
+    app.register_error_handler(PasswordHasherBusy, handle_password_hasher_busy)
+    app.register_error_handler(InvalidFields, handle_invalid_fields)
 
     from .routes.health import bp as health_bp
     from .routes.auth import bp as auth_bp
@@ -22,6 +48,8 @@ def create_app() -> Flask:
     from .routes.stories import bp as stories_bp
     from .routes.search import bp as search_bp
     from .routes.admin import bp as admin_bp
+    from .routes.metrics import bp as metrics_bp
+    from .routes.events import bp as events_bp
 
     app.register_blueprint(health_bp, url_prefix="/api")
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
@@ -34,6 +62,8 @@ def create_app() -> Flask:
     app.register_blueprint(stories_bp, url_prefix="/api/stories")
     app.register_blueprint(search_bp, url_prefix="/api/search")
     app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    app.register_blueprint(metrics_bp, url_prefix="/api")
+    app.register_blueprint(events_bp, url_prefix="/api/events")
 
     return app
 
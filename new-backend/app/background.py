@@ -0,0 +1,41 @@
+import logging
+import os
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+# Runs fn every `interval` seconds on a daemon thread. The thread is started
+# lazily from request code, and restarted if the process has forked since, so
+# preloading the app in a gunicorn master never leaves workers without it.
+class PeriodicTask:
+    def __init__(self, name, interval, fn):
+        self.name = name
+        self.interval = interval
+        self.fn = fn
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.fn()
+            except Exception:
+                logger.exception("Background task %s failed", self.name)
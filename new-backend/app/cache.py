@@ -0,0 +1,232 @@
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from .config import get_config
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# Response headers worth replaying on a cache hit.
+CACHED_HEADERS = ("Content-Type", "X-Next-Cursor", "ETag")
+
+
+class MemoryBackend:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Namespace versions live outside the LRU so eviction can never roll
+        # a namespace back to an older version and resurrect stale entries.
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_versions(self, namespaces):
+        with self._lock:
+            return [self._versions.get(ns, 0) for ns in namespaces]
+
+    def bump_version(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisBackend:
+    def __init__(self, url, prefix="alumni:cache:"):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    # Entries are (body, status, headers) stored as JSON with the body
+    # base64-encoded, so reading the cache never executes code from Redis.
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        try:
+            entry = json.loads(raw)
+            return base64.b64decode(entry["body"]), entry["status"], [tuple(h) for h in entry["headers"]]
+        except (ValueError, KeyError, TypeError):
+            # Written in an older format; refilled on this miss.
+            return None
+
+    def set(self, key, value, ttl):
+        body, status, headers = value
+        entry = {"body": base64.b64encode(body).decode("ascii"), "status": status, "headers": headers}
+        self.client.set(self.prefix + key, json.dumps(entry, separators=(",", ":")), ex=max(1, int(ttl)))
+
+    def get_versions(self, namespaces):
+        raw = self.client.mget([f"{self.prefix}ns:{ns}" for ns in namespaces])
+        return [int(v) if v is not None else 0 for v in raw]
+
+    def bump_version(self, namespace):
+        self.client.incr(f"{self.prefix}ns:{namespace}")
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    def __init__(self, backend, default_ttl):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _record(self, endpoint, outcome):
+        with self._stats_lock:
+            stats = self._stats.setdefault(endpoint, {"hits": 0, "misses": 0, "errors": 0})
+            stats[outcome] += 1
+
+    def _key(self, namespaces):
+        versions = self.backend.get_versions(namespaces)
+        tags = ",".join(f"{ns}@{v}" for ns, v in zip(namespaces, versions))
+        args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        view_args = ",".join(f"{k}={v}" for k, v in sorted((request.view_args or {}).items()))
+        return f"{tags}|{request.endpoint}|{view_args}|{args}"
+
+    def cached(self, namespaces, ttl, fn, *args, **kwargs):
+        endpoint = request.endpoint
+        refill_ttl = g.get("cache_refill_ttl")
+        try:
+            key = self._key(namespaces)
+            entry = self.backend.get(key) if refill_ttl is None else None
+        except Exception as e:
+            # A cache outage should degrade to uncached reads, not errors.
+            current_app.logger.warning("Cache read failed for %s: %s", endpoint, e)
+            self._record(endpoint, "errors")
+            return fn(*args, **kwargs)
+
+        if entry is not None:
+            self._record(endpoint, "hits")
+            body, status, headers = entry
+            response = Response(body, status=status, headers=headers)
+            response.headers["X-Cache"] = "HIT"
+            return response
+
+        if refill_ttl is None:
+            self._record(endpoint, "misses")
+        response = current_app.make_response(fn(*args, **kwargs))
+        if response.status_code == 200 and not response.is_streamed:
+            # Hashed once per fill so conditional requests on a hit compare
+            # against the stored ETag instead of re-hashing the body.
+            if "ETag" not in response.headers:
+                response.add_etag()
+            headers = [(h, response.headers[h]) for h in CACHED_HEADERS if h in response.headers]
+            try:
+                self.backend.set(key, (response.get_data(), response.status_code, headers),
+                                 refill_ttl or ttl or self.default_ttl)
+            except Exception as e:
+                current_app.logger.warning("Cache write failed for %s: %s", endpoint, e)
+                self._record(endpoint, "errors")
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    def invalidate(self, *namespaces):
+        for namespace in namespaces:
+            try:
+                self.backend.bump_version(namespace)
+            except Exception as e:
+                current_app.logger.warning("Cache invalidation failed for %s: %s", namespace, e)
+
+    def stats(self):
+        with self._stats_lock:
+            endpoints = {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+        hits = sum(s["hits"] for s in endpoints.values())
+        misses = sum(s["misses"] for s in endpoints.values())
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "endpoints": endpoints,
+        }
+
+
+def _build_cache(config) -> ResponseCache:
+    if config["CACHE_BACKEND"] == "redis":
+        backend = RedisBackend(config["CACHE_REDIS_URL"])
+    else:
+        backend = MemoryBackend(config["CACHE_MAX_ENTRIES"])
+    return ResponseCache(backend, config["CACHE_DEFAULT_TTL"])
+
+
+def init_cache(config) -> ResponseCache:
+    global _cache
+    with _cache_lock:
+        _cache = _build_cache(config)
+        return _cache
+
+
+def get_cache() -> ResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = _build_cache(get_config())
+    return _cache
+
+
+# per_user=True keys entries by the JWT identity and tags them with the
+# "user:<id>" namespace, so invalidate(f"user:{id}") drops one user's entries.
+def cached(*namespaces, ttl=None, per_user=False):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            scope = namespaces
+            if per_user:
+                verify_jwt_in_request()
+                scope = namespaces + (f"user:{get_jwt_identity()['id']}",)
+            return get_cache().cached(scope, ttl, fn, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def invalidate(*namespaces):
+    get_cache().invalidate(*namespaces)
+
+
+# Makes @cached views in the current request skip the lookup and store a
+# fresh entry for `ttl` seconds, without counting towards hit/miss stats.
+# Used to warm the cache ahead of traffic.
+def force_refill(ttl):
+    g.cache_refill_ttl = ttl
+
+
+def cache_stats() -> dict:
+    return get_cache().stats()
@@ -0,0 +1,98 @@
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+# Compresses responses whose mimetype is in COMPRESS_MIMETYPES: gzip, or
+# brotli when the package is installed and the client prefers it. Bodies
+# under COMPRESS_MIN_SIZE go out as-is. Streamed responses (exports) are
+# compressed chunk by chunk with a sync flush after each one, so clients
+# still receive rows as they are produced.
+class Compressor:
+    def __init__(self, config):
+        self.min_size = config["COMPRESS_MIN_SIZE"]
+        self.level = config["COMPRESS_LEVEL"]
+        self.brotli_quality = config["COMPRESS_BROTLI_QUALITY"]
+        self.mimetypes = frozenset(config["COMPRESS_MIMETYPES"])
+        self.streams = config["COMPRESS_STREAMS"]
+
+    def _encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted["br"] and accepted["br"] >= accepted["gzip"]:
+            return "br"
+        if accepted["gzip"]:
+            return "gzip"
+        return None
+
+    def _compress(self, data, encoding):
+        if encoding == "br":
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def _stream(self, chunks, source, encoding):
+        try:
+            if encoding == "br":
+                compressor = brotli.Compressor(quality=self.brotli_quality)
+                for chunk in chunks:
+                    data = compressor.process(chunk) + compressor.flush()
+                    if data:
+                        yield data
+                yield compressor.finish()
+            else:
+                compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                for chunk in chunks:
+                    data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+                    if data:
+                        yield data
+                yield compressor.flush()
+        finally:
+            # Replacing response.response hides the original iterable from
+            # Response.close(); close it here so an export's connection is
+            # released when the client disconnects.
+            if hasattr(source, "close"):
+                source.close()
+
+    def after_request(self, response):
+        # Event streams are never compressed: the compressor would hold
+        # events back until it had a block worth emitting.
+        if response.mimetype not in self.mimetypes or response.mimetype == "text/event-stream":
+            return response
+        response.vary.add("Accept-Encoding")
+        if (response.status_code != 200 or response.direct_passthrough
+                or "Content-Encoding" in response.headers or request.method == "HEAD"):
+            return response
+        if response.is_streamed and not self.streams:
+            return response
+
+        encoding = self._encoding()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), response.response, encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._compress(data, encoding))
+
+        response.headers["Content-Encoding"] = encoding
+        # The encoded bytes differ from the identity body, so a strong ETag
+        # would no longer be accurate; weak comparison still matches.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def init_compression(app):
+    compressor = Compressor(app.config)
+    app.after_request(compressor.after_request)
+    return compressor
@@ -9,12 +9,99 @@ def get_config():
         "password": os.getenv("DB_PASSWORD", "alumni_pass"),
         "name": os.getenv("DB_NAME", "alumni_connect"),
     }
+    worker_threads = int(os.getenv("APP_WORKER_THREADS", "0"))
 
     return {
         "SQLALCHEMY_DATABASE_URI": f"mysql+pymysql://{db['user']}:{db['password']}@{db['host']}:{db['port']}/{db['name']}",
         "SQLALCHEMY_TRACK_MODIFICATIONS": False,
+        "SQLALCHEMY_POOL_SIZE": int(os.getenv("DB_POOL_SIZE", "10")),
+        "SQLALCHEMY_MAX_OVERFLOW": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "SQLALCHEMY_POOL_RECYCLE": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "SQLALCHEMY_POOL_TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        "BCRYPT_ROUNDS": int(os.getenv("BCRYPT_ROUNDS", "12")),
+        "PASSWORD_HASH_WORKERS": int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+        "PASSWORD_HASH_QUEUE_DEPTH": int(os.getenv("PASSWORD_HASH_QUEUE_DEPTH", "16")),
+        "CACHE_BACKEND": os.getenv("CACHE_BACKEND", "memory"),
+        "CACHE_REDIS_URL": os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0"),
+        "CACHE_DEFAULT_TTL": int(os.getenv("CACHE_DEFAULT_TTL", "60")),
+        "CACHE_MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "1024")),
+        "DASHBOARD_STATS_INTERVAL": int(os.getenv("DASHBOARD_STATS_INTERVAL", "60")),
+        "SLOW_QUERY_SECONDS": float(os.getenv("SLOW_QUERY_SECONDS", "0.5")),
+        # Set by gunicorn.conf.py so /api/metrics adds up every worker's totals.
+        "METRICS_DIR": os.getenv("METRICS_DIR", ""),
+        "METRICS_FLUSH_SECONDS": float(os.getenv("METRICS_FLUSH_SECONDS", "5")),
+        # Addresses allowed to read /api/metrics and /api/health/{pool,cache}
+        # without an admin token (e.g. the Prometheus scraper).
+        "INTERNAL_NETWORKS": os.getenv("INTERNAL_NETWORKS", "127.0.0.0/8,::1/128"),
+        "EVENTS_BACKEND": os.getenv(
+            "EVENTS_BACKEND", "redis" if os.getenv("EVENTS_REDIS_URL") or os.getenv("CACHE_REDIS_URL") else "memory"
+        ),
+        "EVENTS_REDIS_URL": os.getenv("EVENTS_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")),
+        # Each stream pins a worker thread, so under threaded workers the
+        # default leaves half of them for ordinary requests.
+        "EVENTS_MAX_SUBSCRIBERS": int(os.getenv(
+            "EVENTS_MAX_SUBSCRIBERS", str(worker_threads // 2 if worker_threads else 200)
+        )),
+        "EVENTS_TOKEN_TTL": int(os.getenv("EVENTS_TOKEN_TTL", "60")),
+        "EVENTS_QUEUE_SIZE": int(os.getenv("EVENTS_QUEUE_SIZE", "100")),
+        "EVENTS_HEARTBEAT_SECONDS": float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15")),
+        "EVENTS_STREAM_TIMEOUT": int(os.getenv("EVENTS_STREAM_TIMEOUT", "300")),
+        "JOBS_BATCH_SIZE": int(os.getenv("JOBS_BATCH_SIZE", "10")),
+        "JOBS_POLL_INTERVAL": float(os.getenv("JOBS_POLL_INTERVAL", "1")),
+        "JOBS_MAX_ATTEMPTS": int(os.getenv("JOBS_MAX_ATTEMPTS", "5")),
+        "JOBS_RETRY_BACKOFF": int(os.getenv("JOBS_RETRY_BACKOFF", "30")),
+        "JOBS_LOCK_TIMEOUT": int(os.getenv("JOBS_LOCK_TIMEOUT", "300")),
+        "SMTP_HOST": os.getenv("SMTP_HOST", ""),
+        "SMTP_PORT": int(os.getenv("SMTP_PORT", "587")),
+        "SMTP_USER": os.getenv("SMTP_USER", ""),
+        "SMTP_PASSWORD": os.getenv("SMTP_PASSWORD", ""),
+        "SMTP_FROM": os.getenv("SMTP_FROM", "no-reply@alumni-connect.local"),
+        "SMTP_STARTTLS": os.getenv("SMTP_STARTTLS", "1") == "1",
+        "EXPORT_CHUNK_ROWS": int(os.getenv("EXPORT_CHUNK_ROWS", "1000")),
+        "USER_IMPORT_MAX_ROWS": int(os.getenv("USER_IMPORT_MAX_ROWS", "5000")),
+        "USER_IMPORT_BATCH_SIZE": int(os.getenv("USER_IMPORT_BATCH_SIZE", "200")),
+        "ELIGIBILITY_SYNC_SECONDS": float(os.getenv("ELIGIBILITY_SYNC_SECONDS", "5")),
+        "ELIGIBILITY_FULL_RELOAD_SECONDS": float(os.getenv("ELIGIBILITY_FULL_RELOAD_SECONDS", "600")),
+        "SCHOLARSHIP_LIFECYCLE_INTERVAL": int(os.getenv("SCHOLARSHIP_LIFECYCLE_INTERVAL", "300")),
+        "SCHOLARSHIP_CLOSE_BATCH_SIZE": int(os.getenv("SCHOLARSHIP_CLOSE_BATCH_SIZE", "500")),
+        "SCHOLARSHIP_PREWARM_DAYS": int(os.getenv("SCHOLARSHIP_PREWARM_DAYS", "3")),
+        "SCHOLARSHIP_PREWARM_LIMIT": int(os.getenv("SCHOLARSHIP_PREWARM_LIMIT", "50")),
+        # 0 means twice SCHOLARSHIP_LIFECYCLE_INTERVAL.
+        "SCHOLARSHIP_PREWARM_TTL": int(os.getenv("SCHOLARSHIP_PREWARM_TTL", "0")),
+        "RECOMMEND_SYNC_SECONDS": float(os.getenv("RECOMMEND_SYNC_SECONDS", "30")),
+        "RECOMMEND_REBUILD_SECONDS": float(os.getenv("RECOMMEND_REBUILD_SECONDS", "3600")),
+        "RECOMMEND_MAX_OVERLAY": int(os.getenv("RECOMMEND_MAX_OVERLAY", "2000")),
+        "RECOMMEND_LOAD_PENALTY": float(os.getenv("RECOMMEND_LOAD_PENALTY", "0.25")),
+        "FEED_SYNC_SECONDS": float(os.getenv("FEED_SYNC_SECONDS", "30")),
+        "COMPRESS_MIN_SIZE": int(os.getenv("COMPRESS_MIN_SIZE", "1024")),
+        "COMPRESS_LEVEL": int(os.getenv("COMPRESS_LEVEL", "6")),
+        "COMPRESS_BROTLI_QUALITY": int(os.getenv("COMPRESS_BROTLI_QUALITY", "5")),
+        "COMPRESS_MIMETYPES": [m.strip() for m in os.getenv(
+            "COMPRESS_MIMETYPES", "application/json,application/x-ndjson,text/csv,text/plain"
+        ).split(",") if m.strip()],
+        "COMPRESS_STREAMS": os.getenv("COMPRESS_STREAMS", "1") == "1",
+        "SUMMARY_EXCERPT_CHARS": int(os.getenv("SUMMARY_EXCERPT_CHARS", "200")),
+        "RATELIMIT_ENABLED": os.getenv("RATELIMIT_ENABLED", "1") == "1",
+        # Shared buckets by default whenever a Redis URL is configured.
+        "RATELIMIT_BACKEND": os.getenv(
+            "RATELIMIT_BACKEND", "redis" if os.getenv("RATELIMIT_REDIS_URL") or os.getenv("CACHE_REDIS_URL") else "memory"
+        ),
+        "RATELIMIT_REDIS_URL": os.getenv("RATELIMIT_REDIS_URL", os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")),
+        "RATELIMIT_MAX_KEYS": int(os.getenv("RATELIMIT_MAX_KEYS", "10000")),
+        "RATELIMIT_LOGIN_PER_EMAIL": os.getenv("RATELIMIT_LOGIN_PER_EMAIL", "5/300"),
+        "RATELIMIT_RULES": os.getenv(
+            "RATELIMIT_RULES",
+            "auth.login=10/60,auth.register=5/300,search.unified_search=30/60,messages.send_message=30/60"
+        ),
+        # Set by gunicorn.conf.py; per-process state (memory backends) is
+        # only exact when this is 1.
+        "WORKER_PROCESSES": int(os.getenv("APP_WORKER_PROCESSES", "1")),
+        # Threads per worker process when they bound concurrency (sync and
+        # gthread workers); 0 when unknown or unbounded (dev server, gevent).
+        "WORKER_THREADS": worker_threads,
+        # Number of reverse proxies in front of the app whose X-Forwarded-*
+        # headers are trusted (the Vite dev proxy counts as one).
+        "TRUSTED_PROXY_COUNT": int(os.getenv("TRUSTED_PROXY_COUNT", "0")),
         "SECRET_KEY": os.getenv("SECRET_KEY", "dev-secret"),
         "JWT_SECRET_KEY": os.getenv("JWT_SECRET_KEY", "jwt-secret"),
     }
-
-
@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from .background import PeriodicTask
+from .config import get_config
+from .models import get_engine
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+LOCK_NAME = "alumni_dashboard_stats"
+
+
+def _collect(conn):
+    result = conn.execute(text("""
+        SELECT
+            (SELECT COUNT(*) FROM users WHERE role = 'student') as total_students,
+            (SELECT COUNT(*) FROM users WHERE role = 'alumni') as total_alumni,
+            (SELECT COUNT(*) FROM users WHERE role = 'admin') as total_admins,
+            (SELECT COUNT(*) FROM opportunities WHERE is_active = TRUE) as active_opportunities,
+            (SELECT COUNT(*) FROM scholarships WHERE status = 'active') as active_scholarships,
+            (SELECT COUNT(*) FROM mentorship_requests WHERE status = 'pending') as pending_mentorships,
+            (SELECT COUNT(*) FROM applications) as total_applications,
+            (SELECT COUNT(*) FROM scholarship_applications) as total_scholarship_applications,
+            (SELECT COUNT(*) FROM messages WHERE is_read = FALSE) as unread_messages,
+            (SELECT COUNT(*) FROM stories) as total_stories
+    """))
+
+    stats = result.fetchone()
+
+    return {
+        "users": {
+            "total_students": stats.total_students,
+            "total_alumni": stats.total_alumni,
+            "total_admins": stats.total_admins,
+            "total": stats.total_students + stats.total_alumni + stats.total_admins
+        },
+        "opportunities": {
+            "active": stats.active_opportunities
+        },
+        "scholarships": {
+            "active": stats.active_scholarships,
+            "total_applications": stats.total_scholarship_applications
+        },
+        "mentorships": {
+            "pending": stats.pending_mentorships
+        },
+        "applications": {
+            "total": stats.total_applications
+        },
+        "messages": {
+            "unread": stats.unread_messages
+        },
+        "stories": {
+            "total": stats.total_stories
+        }
+    }
+
+
+def _load(conn):
+    row = conn.execute(text("""
+        SELECT stats, TIMESTAMPDIFF(MICROSECOND, taken_at, NOW(6)) / 1000000 as age
+        FROM dashboard_stats WHERE id = 1
+    """)).fetchone()
+    # End the read's transaction so a later read on this connection sees
+    # snapshots other workers commit in the meantime.
+    conn.commit()
+    if row is None:
+        return None
+    stats = json.loads(row.stats) if isinstance(row.stats, (str, bytes)) else row.stats
+    return stats, float(row.age)
+
+
+def _store(conn, stats):
+    conn.execute(text("""
+        INSERT INTO dashboard_stats (id, stats, taken_at) VALUES (1, :stats, NOW(6))
+        ON DUPLICATE KEY UPDATE stats = VALUES(stats), taken_at = VALUES(taken_at)
+    """), {"stats": json.dumps(stats)})
+    conn.commit()
+    return stats, 0.0
+
+
+# Holds the latest dashboard counts. A background task keeps them fresh every
+# `interval` seconds so the dashboard route only ever reads memory. The
+# counts themselves live in the dashboard_stats table: on each tick a worker
+# reads that row, and only when it is older than `interval` does one worker
+# (whichever takes the advisory lock) re-run the COUNT queries for everyone.
+class StatsSnapshot:
+    def __init__(self, interval):
+        self.interval = interval
+        self._current = None
+        self._refresh_lock = threading.Lock()
+        self._task = PeriodicTask("dashboard-stats", interval, self.refresh)
+
+    def _fetch(self, conn, force):
+        if force:
+            return _store(conn, _collect(conn))
+        loaded = _load(conn)
+        if loaded is not None and loaded[1] < self.interval:
+            return loaded
+        if not conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": LOCK_NAME}).scalar():
+            # Another worker is refreshing; its result is read next tick.
+            return loaded if loaded is not None else (_collect(conn), 0.0)
+        try:
+            loaded = _load(conn)
+            if loaded is not None and loaded[1] < self.interval:
+                return loaded
+            return _store(conn, _collect(conn))
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+            conn.commit()
+
+    def refresh(self, force=False):
+        with self._refresh_lock:
+            engine = get_engine()
+            with engine.connect() as conn:
+                stats, age = self._fetch(conn, force)
+            now = time.monotonic()
+            self._current = (stats, datetime.now(timezone.utc) - timedelta(seconds=age), now - age)
+
+    def get(self, force=False):
+        self._task.ensure_started()
+        if force or self._current is None:
+            self.refresh(force=force)
+
+        stats, taken_at, taken_monotonic = self._current
+        return {
+            **stats,
+            "snapshot": {
+                "taken_at": taken_at.isoformat(),
+                "age_seconds": round(time.monotonic() - taken_monotonic, 3)
+            }
+        }
+
+
+def get_stats_snapshot() -> StatsSnapshot:
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = StatsSnapshot(get_config()["DASHBOARD_STATS_INTERVAL"])
+    return _snapshot
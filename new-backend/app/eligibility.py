@@ -0,0 +1,207 @@
+import logging
+import math
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import date
+
+from sqlalchemy import text
+
+from .config import get_config
+from .models import get_engine
+
+
+logger = logging.getLogger(__name__)
+
+_index = None
+_index_lock = threading.Lock()
+
+# Rows committed by a transaction that started before the previous sync can
+# carry an updated_at slightly older than it; re-read that window each time.
+SYNC_OVERLAP_SECONDS = 5
+
+SCHOLARSHIP_COLUMNS = """
+    s.id, s.title, s.description, s.eligibility_criteria,
+    s.cgpa_requirement, s.category_requirement, s.major_requirement, s.amount, s.deadline,
+    s.status, s.created_at, u.name as created_by_name
+"""
+
+Entry = namedtuple("Entry", "id cgpa category majors item")
+
+
+def _key(value):
+    return value.strip().casefold() if isinstance(value, str) and value.strip() else None
+
+
+def serialize_scholarship(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "eligibility_criteria": row.eligibility_criteria,
+        "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
+        "category_requirement": row.category_requirement,
+        "major_requirement": row.major_requirement,
+        "amount": float(row.amount) if row.amount else None,
+        "deadline": row.deadline.isoformat() if row.deadline else None,
+        "status": row.status,
+        "created_by_name": row.created_by_name,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _entry(row):
+    majors = frozenset(filter(None, (_key(m) for m in (row.major_requirement or "").split(","))))
+    return Entry(
+        id=row.id,
+        cgpa=float(row.cgpa_requirement) if row.cgpa_requirement else 0.0,
+        category=_key(row.category_requirement),
+        majors=majors or None,
+        item=serialize_scholarship(row)
+    )
+
+
+# Active scholarships bucketed by category requirement (None = open to all),
+# each bucket sorted by (cgpa_requirement, id). A student's matches are a
+# prefix of at most two buckets, found with bisect: O(log n + k).
+#
+# Buckets are copy-on-write so readers never take a lock. Each worker keeps
+# its own index and pulls rows changed since its last sync (by updated_at)
+# at most every sync_interval seconds; writes in this worker apply at once.
+class EligibilityIndex:
+    def __init__(self, sync_interval, full_reload_interval):
+        self.sync_interval = sync_interval
+        self.full_reload_interval = full_reload_interval
+        self._entries = {}
+        self._buckets = {}
+        self._since = None
+        self._last_sync = 0.0
+        self._last_full = 0.0
+        self._sync_lock = threading.Lock()
+
+    def _fetch(self, conn, where, params):
+        return conn.execute(text(f"""
+            SELECT {SCHOLARSHIP_COLUMNS}
+            FROM scholarships s
+            LEFT JOIN users u ON s.created_by = u.id
+            WHERE {where}
+        """), params).fetchall()
+
+    def _load(self, rows):
+        entries = {row.id: _entry(row) for row in rows}
+        buckets = {}
+        for entry in sorted(entries.values(), key=lambda e: (e.cgpa, e.id)):
+            keys, bucket_entries = buckets.setdefault(entry.category, ([], []))
+            keys.append((entry.cgpa, entry.id))
+            bucket_entries.append(entry)
+        self._entries, self._buckets = entries, buckets
+
+    def _apply(self, rows, deleted=()):
+        changed = {}
+        for scholarship_id in deleted:
+            old = self._entries.pop(scholarship_id, None)
+            if old is not None:
+                changed.setdefault(old.category, ([], []))[1].append(old)
+        for row in rows:
+            old = self._entries.pop(row.id, None)
+            if old is not None:
+                changed.setdefault(old.category, ([], []))[1].append(old)
+            if row.status == "active":
+                new = self._entries[row.id] = _entry(row)
+                changed.setdefault(new.category, ([], []))[0].append(new)
+
+        buckets = dict(self._buckets)
+        for category, (added, removed) in changed.items():
+            keys, entries = buckets.get(category, ([], []))
+            keys, entries = list(keys), list(entries)
+            for entry in removed:
+                i = bisect_left(keys, (entry.cgpa, entry.id))
+                del keys[i], entries[i]
+            for entry in added:
+                i = bisect_left(keys, (entry.cgpa, entry.id))
+                keys.insert(i, (entry.cgpa, entry.id))
+                entries.insert(i, entry)
+            if keys:
+                buckets[category] = (keys, entries)
+            else:
+                buckets.pop(category, None)
+        self._buckets = buckets
+
+    def _sync(self):
+        engine = get_engine()
+        with engine.connect() as conn:
+            now = conn.execute(text("SELECT NOW()")).scalar()
+            full = self._since is None or time.monotonic() - self._last_full >= self.full_reload_interval
+            if full:
+                # Periodic full reloads also pick up renamed creators and
+                # hard-deleted rows, which updated_at cannot reveal.
+                self._load(self._fetch(conn, "s.status = 'active'", {}))
+                self._last_full = time.monotonic()
+            else:
+                self._apply(self._fetch(conn, "s.updated_at >= :since - INTERVAL :overlap SECOND",
+                                        {"since": self._since, "overlap": SYNC_OVERLAP_SECONDS}))
+        self._since = now
+        self._last_sync = time.monotonic()
+
+    def _maybe_sync(self):
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        # Only the first load blocks; afterwards one thread syncs while the
+        # others keep answering from the current buckets.
+        if not self._sync_lock.acquire(blocking=self._since is None):
+            return
+        try:
+            if time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+        finally:
+            self._sync_lock.release()
+
+    # Called after a write commits; a failure here must not fail the write,
+    # so it only forces a sync on the next read instead.
+    def refresh(self, scholarship_id):
+        with self._sync_lock:
+            if self._since is None:
+                return
+            try:
+                engine = get_engine()
+                with engine.connect() as conn:
+                    rows = self._fetch(conn, "s.id = :scholarship_id", {"scholarship_id": scholarship_id})
+                self._apply(rows, deleted=() if rows else (scholarship_id,))
+            except Exception:
+                logger.exception("Eligibility index refresh failed for scholarship %s", scholarship_id)
+                self._last_sync = 0.0
+
+    def eligible(self, cgpa, category, major):
+        self._maybe_sync()
+        buckets = self._buckets
+        category, major = _key(category), _key(major)
+
+        # Rows past their deadline stay indexed until the lifecycle task
+        # closes them, so filter them out here.
+        today = date.today().isoformat()
+        matches = []
+        for bucket_key in {None, category}:
+            bucket = buckets.get(bucket_key)
+            if not bucket:
+                continue
+            keys, entries = bucket
+            end = bisect_right(keys, (cgpa, math.inf))
+            matches.extend(
+                e.item for e in entries[:end]
+                if (e.majors is None or major in e.majors) and (e.item["deadline"] is None or e.item["deadline"] >= today)
+            )
+
+        # Same order as the old query: deadline ascending, NULL first.
+        matches.sort(key=lambda item: (item["deadline"] is not None, item["deadline"] or "", item["id"]))
+        return matches
+
+
+def get_eligibility_index() -> EligibilityIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                config = get_config()
+                _index = EligibilityIndex(config["ELIGIBILITY_SYNC_SECONDS"], config["ELIGIBILITY_FULL_RELOAD_SECONDS"])
+    return _index
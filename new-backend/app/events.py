@@ -0,0 +1,180 @@
+import json
+import logging
+import queue
+import threading
+
+from .config import get_config
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class MemorySubscription:
+    def __init__(self, broker, user_id, queue_size):
+        self.broker = broker
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=queue_size)
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker._unsubscribe(self)
+
+
+# In-process pub/sub: only reaches subscribers connected to the same worker,
+# so multi-worker deployments should use the redis broker.
+class MemoryBroker:
+    def __init__(self, max_subscribers, queue_size):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, event, data):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.queue.put_nowait((event, data))
+            except queue.Full:
+                # A stalled client must not block the publisher; it can
+                # resync from the REST endpoints when it catches up.
+                logger.warning("Dropping %s event for slow subscriber (user %s)", event, user_id)
+
+    def subscribe(self, user_id):
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise TooManySubscribers()
+            subscription = MemorySubscription(self, user_id, self.queue_size)
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            self._count += 1
+            return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions and subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self._count -= 1
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return self._count
+
+
+class RedisSubscription:
+    def __init__(self, broker, pubsub):
+        self.broker = broker
+        self.pubsub = pubsub
+
+    def get(self, timeout):
+        message = self.pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        payload = json.loads(message["data"])
+        return payload["event"], payload["data"]
+
+    def close(self):
+        try:
+            self.pubsub.close()
+        finally:
+            self.broker._release()
+
+
+class RedisBroker:
+    def __init__(self, url, max_subscribers, prefix="alumni:events:"):
+        if redis is None:
+            raise RuntimeError("EVENTS_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.max_subscribers = max_subscribers
+        self.prefix = prefix
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def publish(self, user_id, event, data):
+        self.client.publish(f"{self.prefix}{user_id}", json.dumps({"event": event, "data": data}))
+
+    def subscribe(self, user_id):
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise TooManySubscribers()
+            self._count += 1
+        try:
+            pubsub = self.client.pubsub()
+            pubsub.subscribe(f"{self.prefix}{user_id}")
+        except Exception:
+            self._release()
+            raise
+        return RedisSubscription(self, pubsub)
+
+    def _release(self):
+        with self._lock:
+            self._count -= 1
+
+    def subscriber_count(self):
+        with self._lock:
+            return self._count
+
+
+def _build_broker(config):
+    # A worker with no threads left for ordinary requests is a
+    # misconfiguration worth failing at startup for.
+    if config["WORKER_THREADS"] and config["EVENTS_MAX_SUBSCRIBERS"] >= config["WORKER_THREADS"]:
+        raise RuntimeError(
+            f"EVENTS_MAX_SUBSCRIBERS={config['EVENTS_MAX_SUBSCRIBERS']} would let event streams occupy all "
+            f"{config['WORKER_THREADS']} threads of a worker; lower it or use an async worker class"
+        )
+    if config["EVENTS_BACKEND"] == "redis":
+        return RedisBroker(config["EVENTS_REDIS_URL"], config["EVENTS_MAX_SUBSCRIBERS"])
+    if config["WORKER_PROCESSES"] > 1:
+        # Still boots (clients resync over REST), but say loudly that events
+        # published in one worker will not reach streams held by another.
+        logger.error(
+            "EVENTS_BACKEND=memory only delivers events within one process but %s workers are configured; "
+            "set EVENTS_REDIS_URL (or CACHE_REDIS_URL) to use the redis broker", config["WORKER_PROCESSES"]
+        )
+    return MemoryBroker(config["EVENTS_MAX_SUBSCRIBERS"], config["EVENTS_QUEUE_SIZE"])
+
+
+def init_events(config):
+    global _broker
+    with _broker_lock:
+        _broker = _build_broker(config)
+        return _broker
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = _build_broker(get_config())
+    return _broker
+
+
+# Publishing is best effort: the database write has already committed, and
+# clients that miss an event still see the change on their next fetch.
+def publish(user_id, event, data):
+    try:
+        get_broker().publish(user_id, event, data)
+    except Exception as e:
+        logger.warning("Publishing %s event to user %s failed: %s", event, user_id, e)
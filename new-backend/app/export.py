@@ -0,0 +1,86 @@
+import csv
+import io
+import logging
+from datetime import date, datetime, timezone
+
+from flask import Response, current_app, jsonify, request
+from sqlalchemy import text
+
+from .models import get_engine
+from .serialization import dumps
+
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+# Spreadsheets evaluate cells starting with these as formulas, so a
+# user-supplied "=HYPERLINK(...)" would run when an admin opens the export.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunks(columns, partitions):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for rows in partitions:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(columns, partitions):
+    for rows in partitions:
+        yield "".join(
+            dumps(dict(zip(columns, row))) + "\n"
+            for row in rows
+        )
+
+
+# Streams a query as CSV or NDJSON. The rows come from a server-side cursor
+# in chunks of EXPORT_CHUNK_ROWS, so memory use does not grow with the
+# table; the pooled connection is held until the download finishes.
+def export_response(sql, name, params=None):
+    fmt = request.args.get("format", "csv").lower()
+    if fmt not in FORMATS:
+        return jsonify({"error": f"Unsupported format, use one of: {', '.join(FORMATS)}"}), 400
+
+    chunk_rows = current_app.config["EXPORT_CHUNK_ROWS"]
+    engine = get_engine()
+
+    def generate():
+        try:
+            with engine.connect() as conn:
+                result = conn.execution_options(stream_results=True, yield_per=chunk_rows).execute(
+                    text(sql), params or {})
+                columns = list(result.keys())
+                chunks = _csv_chunks if fmt == "csv" else _ndjson_chunks
+                for chunk in chunks(columns, result.partitions()):
+                    yield chunk
+        except Exception:
+            # Headers are already sent; re-raising aborts the transfer so the
+            # client sees a failed download rather than a silently short file.
+            logger.exception("Export of %s failed mid-stream", name)
+            raise
+
+    filename = f"{name}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{'csv' if fmt == 'csv' else 'ndjson'}"
+    return Response(generate(), mimetype=FORMATS[fmt], headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no"
+    })
@@ -0,0 +1,198 @@
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+
+from sqlalchemy import bindparam, text
+
+from .config import get_config
+from .models import get_engine
+
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def job(name):
+    def decorator(fn):
+        HANDLERS[name] = fn
+        return fn
+    return decorator
+
+
+# Jobs are written with the caller's connection so they commit (or roll
+# back) together with the change that caused them.
+def enqueue(conn, name, payload=None, delay=0, max_attempts=None):
+    if max_attempts is None:
+        max_attempts = get_config()["JOBS_MAX_ATTEMPTS"]
+    conn.execute(text("""
+        INSERT INTO jobs (name, payload, max_attempts, run_at)
+        VALUES (:name, :payload, :max_attempts, NOW() + INTERVAL :delay SECOND)
+    """), {
+        "name": name,
+        "payload": json.dumps(payload or {}),
+        "max_attempts": max_attempts,
+        "delay": int(delay)
+    })
+
+
+def retry_dead_job(conn, job_id):
+    result = conn.execute(text("""
+        UPDATE jobs SET status = 'queued', attempts = 0, run_at = NOW(), last_error = NULL
+        WHERE id = :job_id AND status = 'dead'
+    """), {"job_id": job_id})
+    return result.rowcount > 0
+
+
+class Worker:
+    def __init__(self, app, batch_size, poll_interval, retry_backoff, lock_timeout):
+        self.app = app
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.lock_timeout = lock_timeout
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def _claim(self):
+        engine = get_engine()
+        with engine.connect() as conn:
+            # A worker that died mid-job leaves rows in 'running'; once their
+            # lock is older than lock_timeout they count as a failed attempt.
+            # Jobs that keep killing their worker end up dead-lettered rather
+            # than requeued forever.
+            conn.execute(text("""
+                UPDATE jobs SET status = 'dead', locked_by = NULL, locked_at = NULL,
+                                last_error = 'Lock expired: worker died or timed out'
+                WHERE status = 'running' AND locked_at < NOW() - INTERVAL :lock_timeout SECOND
+                  AND attempts >= max_attempts
+            """), {"lock_timeout": self.lock_timeout})
+            conn.execute(text("""
+                UPDATE jobs SET status = 'queued', locked_by = NULL, locked_at = NULL,
+                                last_error = 'Lock expired: worker died or timed out'
+                WHERE status = 'running' AND locked_at < NOW() - INTERVAL :lock_timeout SECOND
+            """), {"lock_timeout": self.lock_timeout})
+
+            result = conn.execute(text("""
+                SELECT id, name, payload, attempts, max_attempts FROM jobs
+                WHERE status = 'queued' AND run_at <= NOW()
+                ORDER BY run_at, id
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            """), {"batch_size": self.batch_size})
+            jobs = result.fetchall()
+
+            if jobs:
+                conn.execute(text("""
+                    UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                                    locked_by = :worker_id, locked_at = NOW()
+                    WHERE id IN :ids
+                """).bindparams(bindparam("ids", expanding=True)), {
+                    "worker_id": self.worker_id,
+                    "ids": [row.id for row in jobs]
+                })
+            conn.commit()
+            return jobs
+
+    # Every statement is guarded by our lock, so a job reclaimed by another
+    # worker after our lock expired is left to that worker: we neither delete
+    # it, nor requeue or dead-letter it over its run.
+    def _finish(self, row, error):
+        params = {"id": row.id, "worker_id": self.worker_id}
+        engine = get_engine()
+        with engine.connect() as conn:
+            if error is None:
+                result = conn.execute(text("""
+                    DELETE FROM jobs WHERE id = :id AND locked_by = :worker_id AND status = 'running'
+                """), params)
+            elif row.attempts + 1 >= row.max_attempts:
+                result = conn.execute(text("""
+                    UPDATE jobs SET status = 'dead', locked_by = NULL, locked_at = NULL, last_error = :error
+                    WHERE id = :id AND locked_by = :worker_id AND status = 'running'
+                """), {**params, "error": error})
+                if result.rowcount:
+                    logger.error("Job %s (%s) moved to dead-letter after %s attempts: %s",
+                                 row.id, row.name, row.attempts + 1, error)
+            else:
+                delay = self.retry_backoff * 2 ** row.attempts
+                result = conn.execute(text("""
+                    UPDATE jobs SET status = 'queued', locked_by = NULL, locked_at = NULL,
+                                    last_error = :error, run_at = NOW() + INTERVAL :delay SECOND
+                    WHERE id = :id AND locked_by = :worker_id AND status = 'running'
+                """), {**params, "error": error, "delay": int(delay)})
+                if result.rowcount:
+                    logger.warning("Job %s (%s) failed, retrying in %ss: %s", row.id, row.name, delay, error)
+            conn.commit()
+        if not result.rowcount:
+            logger.warning("Job %s (%s) was reclaimed by another worker before it finished; "
+                           "leaving it to that worker", row.id, row.name)
+
+    def _run_job(self, row):
+        handler = HANDLERS.get(row.name)
+        if handler is None:
+            return f"No handler registered for job '{row.name}'"
+        try:
+            payload = json.loads(row.payload) if isinstance(row.payload, (str, bytes)) else (row.payload or {})
+            with self.app.app_context():
+                handler(**payload)
+            return None
+        except Exception as e:
+            logger.exception("Job %s (%s) raised", row.id, row.name)
+            return f"{type(e).__name__}: {e}"
+
+    # Jobs in a batch run one after another, so each one's lock is renewed
+    # as it starts; otherwise the last jobs of a slow batch could pass
+    # lock_timeout while still waiting and be handed to another worker.
+    # Returns False if that already happened.
+    def _renew_lock(self, row):
+        engine = get_engine()
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                UPDATE jobs SET locked_at = NOW()
+                WHERE id = :id AND status = 'running' AND locked_by = :worker_id
+            """), {"id": row.id, "worker_id": self.worker_id})
+            conn.commit()
+            return result.rowcount > 0
+
+    def run_once(self):
+        jobs = self._claim()
+        for row in jobs:
+            if not self._renew_lock(row):
+                logger.warning("Job %s (%s) was reclaimed before it started; skipping", row.id, row.name)
+                continue
+            self._finish(row, self._run_job(row))
+        return len(jobs)
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        logger.info("Job worker %s started (%s handlers)", self.worker_id, len(HANDLERS))
+
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once()
+            except Exception:
+                logger.exception("Job worker %s failed to poll", self.worker_id)
+                processed = 0
+            # Drain back-to-back while there is work; sleep only when idle.
+            if processed < self.batch_size:
+                self._stop.wait(self.poll_interval)
+
+        logger.info("Job worker %s stopped", self.worker_id)
+
+
+def build_worker(app):
+    config = app.config
+    return Worker(
+        app,
+        batch_size=config["JOBS_BATCH_SIZE"],
+        poll_interval=config["JOBS_POLL_INTERVAL"],
+        retry_backoff=config["JOBS_RETRY_BACKOFF"],
+        lock_timeout=config["JOBS_LOCK_TIMEOUT"]
+    )
@@ -0,0 +1,30 @@
+import logging
+import smtplib
+from email.message import EmailMessage
+
+from flask import current_app
+
+
+logger = logging.getLogger(__name__)
+
+
+# Without SMTP_HOST mail is only logged, which keeps local and CI setups
+# working without a mail server.
+def send_email(to, subject, body):
+    config = current_app.config
+    if not config["SMTP_HOST"]:
+        logger.info("Email to %s (SMTP_HOST unset, not sent): %s", to, subject)
+        return
+
+    message = EmailMessage()
+    message["From"] = config["SMTP_FROM"]
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+
+    with smtplib.SMTP(config["SMTP_HOST"], config["SMTP_PORT"], timeout=30) as smtp:
+        if config["SMTP_STARTTLS"]:
+            smtp.starttls()
+        if config["SMTP_USER"]:
+            smtp.login(config["SMTP_USER"], config["SMTP_PASSWORD"])
+        smtp.send_message(message)
@@ -0,0 +1,343 @@
+import bisect
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from .background import PeriodicTask
+from .cache import cache_stats
+from .models import get_engine, pool_stats
+
+
+logger = logging.getLogger(__name__)
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+ROW_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000)
+
+_slow_query_seconds = float("inf")
+_metrics_dir = None
+_flusher = None
+
+# Pool figures that describe one process right now; they are reported per
+# live worker (labelled by pid) instead of being summed.
+POOL_GAUGES = (
+    ("db_pool_size", "size", "Configured connection pool size."),
+    ("db_pool_checked_out", "checked_out", "Connections currently checked out."),
+    ("db_pool_overflow", "overflow", "Connections open beyond the pool size."),
+    ("db_pool_wait_seconds_max", "wait_seconds_max", "Longest wait for a pooled connection."),
+)
+POOL_COUNTERS = (
+    ("db_pool_checkouts_total", "checkouts", "Connection checkouts."),
+    ("db_pool_timeouts_total", "timeouts", "Checkouts that timed out waiting for a connection."),
+    ("db_pool_wait_seconds_total", "wait_seconds_total", "Time spent waiting for a pooled connection."),
+)
+
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    @staticmethod
+    def merge(into, values):
+        for label_values, value in values.items():
+            into[label_values] = into.get(label_values, 0) + value
+
+    def render(self, values=None):
+        values = self.snapshot() if values is None else values
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=REQUEST_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {k: [list(counts), total, count] for k, (counts, total, count) in self._values.items()}
+
+    @staticmethod
+    def merge(into, values):
+        for label_values, (counts, total, count) in values.items():
+            series = into.get(label_values)
+            if series is None:
+                into[label_values] = [list(counts), total, count]
+            else:
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+                series[2] += count
+
+    def render(self, values=None):
+        values = self.snapshot() if values is None else values
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_number(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, label_values, le)} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def _single(name, kind, help_text, value):
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_format_number(value)}"]
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by endpoint.", ("method", "endpoint"))
+REQUESTS = Counter(
+    "http_requests_total", "HTTP responses by endpoint and status code.", ("method", "endpoint", "status"))
+SQL_DURATION = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time.", ("endpoint", "operation", "table"), SQL_BUCKETS)
+SQL_ROWS = Histogram(
+    "db_statement_rows", "Rows returned or affected per SQL statement.", ("endpoint", "operation", "table"), ROW_BUCKETS)
+SQL_ERRORS = Counter(
+    "db_statement_errors_total", "SQL statements that raised.", ("endpoint", "operation", "table"))
+
+METRICS = (REQUEST_DURATION, REQUESTS, SQL_DURATION, SQL_ROWS, SQL_ERRORS)
+
+
+def _endpoint_label():
+    if not has_request_context():
+        return "background"
+    return request.endpoint or "unmatched"
+
+
+def _statement_labels(statement):
+    operation = statement.lstrip(" \n\t(").split(None, 1)[0].upper() if statement.strip() else "UNKNOWN"
+    match = _TABLE_RE.search(statement)
+    return _endpoint_label(), operation, match.group(1).lower() if match else ""
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    labels = _statement_labels(statement)
+    SQL_DURATION.observe(elapsed, *labels)
+    # Server-side (streaming) cursors report -1 until fully consumed.
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        SQL_ROWS.observe(cursor.rowcount, *labels)
+    if elapsed >= _slow_query_seconds:
+        logger.warning("Slow SQL (%.3fs) in %s: %s", elapsed, labels[0], " ".join(statement.split())[:500])
+
+
+def _handle_error(context):
+    starts = context.connection.info.get("query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+    SQL_ERRORS.inc(*_statement_labels(context.statement or ""))
+
+
+def instrument_engine(engine, slow_query_seconds):
+    global _slow_query_seconds
+    _slow_query_seconds = slow_query_seconds
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _start_timer():
+    if _flusher is not None:
+        _flusher.ensure_started()
+    g.metrics_start = time.perf_counter()
+
+
+def _record_request(response):
+    start = g.pop("metrics_start", None)
+    if start is not None:
+        endpoint = _endpoint_label()
+        REQUEST_DURATION.observe(time.perf_counter() - start, request.method, endpoint)
+        REQUESTS.inc(request.method, endpoint, str(response.status_code))
+    return response
+
+
+def init_metrics(app):
+    global _metrics_dir, _flusher
+    instrument_engine(get_engine(), app.config["SLOW_QUERY_SECONDS"])
+    _metrics_dir = app.config["METRICS_DIR"] or None
+    if _metrics_dir:
+        os.makedirs(_metrics_dir, exist_ok=True)
+        _flusher = PeriodicTask("metrics-flush", app.config["METRICS_FLUSH_SECONDS"], flush_metrics)
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+
+# Multi-process mode (METRICS_DIR set, as gunicorn.conf.py does): each worker
+# writes its own totals to <pid>.json every METRICS_FLUSH_SECONDS and on exit,
+# and a scrape, whichever worker serves it, adds up every file. Files left by
+# workers that have exited are folded into archived.json, so counters keep
+# growing across worker restarts instead of dropping back.
+def _state():
+    return {
+        "metrics": {m.name: [[list(k), v] for k, v in m.snapshot().items()] for m in METRICS},
+        "pool": pool_stats(),
+        "cache": cache_stats()["endpoints"],
+    }
+
+
+def _write(path, state):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def flush_metrics():
+    if _metrics_dir:
+        _write(os.path.join(_metrics_dir, f"{os.getpid()}.json"), _state())
+
+
+def _merge_state(into, state):
+    for metric in METRICS:
+        values = {tuple(k): v for k, v in state["metrics"].get(metric.name, ())}
+        metric.merge(into["metrics"].setdefault(metric.name, {}), values)
+    for _, key, _ in POOL_COUNTERS:
+        into["pool"][key] = into["pool"].get(key, 0) + state["pool"].get(key, 0)
+    for endpoint, stats in state["cache"].items():
+        totals = into["cache"].setdefault(endpoint, {"hits": 0, "misses": 0, "errors": 0})
+        for outcome in totals:
+            totals[outcome] += stats.get(outcome, 0)
+
+
+def _collect_states():
+    if not _metrics_dir:
+        return None, {os.getpid(): _state()}
+
+    flush_metrics()
+    with open(os.path.join(_metrics_dir, ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(_metrics_dir, "archived.json")
+        archive = _read(archive_path) or {"metrics": {}, "pool": {}, "cache": {}}
+        archive = {**archive, "metrics": {name: {tuple(k): v for k, v in values}
+                                          for name, values in archive["metrics"].items()}}
+        live, dead = {}, []
+        for name in os.listdir(_metrics_dir):
+            if not name.endswith(".json") or not name[:-5].isdigit():
+                continue
+            pid, path = int(name[:-5]), os.path.join(_metrics_dir, name)
+            state = _read(path)
+            if state is None:
+                continue
+            if _alive(pid):
+                live[pid] = state
+            else:
+                _merge_state(archive, state)
+                dead.append(path)
+        if dead:
+            _write(archive_path, {**archive, "metrics": {name: [[list(k), v] for k, v in values.items()]
+                                                         for name, values in archive["metrics"].items()}})
+            for path in dead:
+                os.remove(path)
+    return archive, live
+
+
+def render_metrics():
+    archive, live = _collect_states()
+    totals = {"metrics": {}, "pool": {}, "cache": {}}
+    if archive is not None:
+        for metric in METRICS:
+            metric.merge(totals["metrics"].setdefault(metric.name, {}), archive["metrics"].get(metric.name, {}))
+        _merge_state(totals, {"metrics": {}, "pool": archive["pool"], "cache": archive["cache"]})
+    for state in live.values():
+        _merge_state(totals, state)
+
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render(totals["metrics"].get(metric.name, {})))
+
+    for name, key, help_text in POOL_GAUGES:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for pid, state in sorted(live.items()):
+            lines.append(f'{name}{{pid="{pid}"}} {_format_number(state["pool"][key])}')
+    for name, key, help_text in POOL_COUNTERS:
+        lines += _single(name, "counter", help_text, totals["pool"].get(key, 0))
+
+    lines += ["# HELP cache_requests_total Response cache lookups by endpoint and outcome.",
+              "# TYPE cache_requests_total counter"]
+    for endpoint, stats in sorted(totals["cache"].items()):
+        for outcome in ("hits", "misses", "errors"):
+            lines.append(f'cache_requests_total{{endpoint="{_escape(endpoint)}",outcome="{outcome}"}} {stats[outcome]}')
+
+    return "\n".join(lines) + "\n"
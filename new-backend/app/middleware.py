@@ -1,5 +1,6 @@
-from functools import wraps
-from flask import jsonify
+import ipaddress
+from functools import lru_cache, wraps
+from flask import current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 
 
@@ -38,3 +39,29 @@ def student_required(fn):
 
 def authenticated_required(fn):
     return role_required("student", "alumni", "admin")(fn)
+
+
+@lru_cache(maxsize=8)
+def _networks(spec):
+    return tuple(ipaddress.ip_network(n.strip()) for n in spec.split(",") if n.strip())
+
+
+def _is_internal(address):
+    try:
+        ip = ipaddress.ip_address(address or "")
+    except ValueError:
+        return False
+    return any(ip in network for network in _networks(current_app.config["INTERNAL_NETWORKS"]))
+
+
+# Operational endpoints: open to INTERNAL_NETWORKS (monitoring), otherwise
+# admins only.
+def internal_required(fn):
+    admin_fn = admin_required(fn)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _is_internal(request.remote_addr):
+            return fn(*args, **kwargs)
+        return admin_fn(*args, **kwargs)
+    return wrapper
@@ -1,11 +1,96 @@
+import threading
+import time
+
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from .config import get_config
 
 
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class TimedQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._wait_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._wait_lock:
+                self.checkouts += 1
+                self.total_wait += waited
+                self.max_wait = max(self.max_wait, waited)
+
+
+def _build_engine(config) -> Engine:
+    return create_engine(
+        config["SQLALCHEMY_DATABASE_URI"],
+        poolclass=TimedQueuePool,
+        pool_pre_ping=True,
+        pool_size=config["SQLALCHEMY_POOL_SIZE"],
+        max_overflow=config["SQLALCHEMY_MAX_OVERFLOW"],
+        pool_recycle=config["SQLALCHEMY_POOL_RECYCLE"],
+        pool_timeout=config["SQLALCHEMY_POOL_TIMEOUT"],
+    )
+
+
+def init_engine(config) -> Engine:
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = _build_engine(config)
+        return _engine
+
+
 def get_engine() -> Engine:
-    uri = get_config()["SQLALCHEMY_DATABASE_URI"]
-    return create_engine(uri, pool_pre_ping=True)
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = _build_engine(get_config())
+    return _engine
+
+
+def reset_engine_after_fork():
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+def pool_stats() -> dict:
+    pool = get_engine().pool
+    with pool._wait_lock:
+        checkouts = pool.checkouts
+        total_wait = pool.total_wait
+        max_wait = pool.max_wait
+        timeouts = pool.timeouts
+
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": pool._max_overflow,
+        "checkouts": checkouts,
+        "timeouts": timeouts,
+        "wait_seconds_total": round(total_wait, 6),
+        "wait_seconds_avg": round(total_wait / checkouts, 6) if checkouts else 0.0,
+        "wait_seconds_max": round(max_wait, 6),
+    }
 
 
 def ping_db() -> bool:
@@ -13,5 +98,3 @@ def ping_db() -> bool:
     with engine.connect() as conn:
         conn.execute(text("SELECT 1"))
     return True
-
-
@@ -0,0 +1,218 @@
+import math
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import bindparam, text
+
+from .config import get_config
+from .models import get_engine
+
+
+_index = None
+_index_lock = threading.Lock()
+
+# Term weight per field: a skill in the title matters more than one buried
+# in the description.
+FIELD_WEIGHTS = (("title", 2.0), ("requirements", 1.5), ("description", 1.0))
+
+# Share of the query taken from the opportunities the student applied to,
+# when they have applied to any; the rest comes from skills and major.
+HISTORY_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our the their to we will with
+    you your this that who able must should work working role team experience years year
+""".split())
+
+Snapshot = namedtuple("Snapshot", "fingerprint ids row_of items posters vocab idf matrix")
+
+
+def tokenize(value):
+    if not isinstance(value, str):
+        return []
+    return [t for t in _TOKEN_RE.findall(value.casefold()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _term_weights(fields):
+    counts = Counter()
+    for value, weight in fields:
+        for token in tokenize(value):
+            counts[token] += weight
+    # Sublinear tf keeps a long description from drowning out the title.
+    return {term: 1.0 + math.log(count) if count > 1 else count for term, count in counts.items()}
+
+
+def _serialize(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "company": row.company,
+        "description": row.description,
+        "requirements": row.requirements,
+        "location": row.location,
+        "salary_range": row.salary_range,
+        "type": row.type,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _build(rows, fingerprint):
+    docs = [_term_weights([(getattr(row, field), weight) for field, weight in FIELD_WEIGHTS]) for row in rows]
+    df = Counter(term for doc in docs for term in doc)
+    vocab = {term: col for col, term in enumerate(df)}
+    n = len(rows)
+    idf = np.log((1 + n) / (1 + np.array([df[t] for t in vocab], dtype=np.float64))) + 1.0
+
+    row_idx, col_idx, weights = [], [], []
+    for i, doc in enumerate(docs):
+        for term, weight in doc.items():
+            row_idx.append(i)
+            col_idx.append(vocab[term])
+            weights.append(weight)
+    row_idx = np.array(row_idx, dtype=np.int64)
+    col_idx = np.array(col_idx, dtype=np.int64)
+    data = np.array(weights, dtype=np.float64) * idf[col_idx] if len(col_idx) else np.zeros(0)
+    norms = np.sqrt(np.bincount(row_idx, weights=data * data, minlength=n))
+    if len(data):
+        data /= norms[row_idx]
+
+    ids = [row.id for row in rows]
+    return Snapshot(
+        fingerprint=fingerprint,
+        ids=np.array(ids, dtype=np.int64),
+        row_of={opportunity_id: i for i, opportunity_id in enumerate(ids)},
+        items=[_serialize(row) for row in rows],
+        posters=[row.posted_by for row in rows],
+        vocab=vocab,
+        idf=idf,
+        matrix=sparse.csr_matrix((data, (row_idx, col_idx)), shape=(n, len(vocab)))
+    )
+
+
+# TF-IDF matrix (active opportunity x term) over title, requirements and
+# description, one per worker. Opportunities change rarely, so instead of
+# patching rows the index is rebuilt whenever the table's fingerprint
+# (latest updated_at, highest id) moves. Both are read from the end of an
+# index (idx_opportunities_updated_at and the primary key), so the check
+# every sync_interval seconds stays cheap as the table grows, unlike
+# COUNT(*), which scans an index. Edits and deactivations bump updated_at
+# and inserts bump the id; the app never hard-deletes opportunities.
+# Poster names live in users, which the fingerprint does not cover, so
+# feed() reads them for the returned rows only.
+class OpportunityIndex:
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self._snapshot = None
+        self._last_sync = 0.0
+        self._sync_lock = threading.Lock()
+
+    def _sync(self):
+        engine = get_engine()
+        with engine.connect() as conn:
+            fingerprint = tuple(conn.execute(text("""
+                SELECT MAX(updated_at), MAX(id) FROM opportunities
+            """)).fetchone())
+            if self._snapshot is None or fingerprint != self._snapshot.fingerprint:
+                rows = conn.execute(text("""
+                    SELECT id, title, company, description, requirements,
+                           location, salary_range, type, posted_by, created_at
+                    FROM opportunities
+                    WHERE is_active = TRUE
+                    ORDER BY created_at DESC, id DESC
+                """)).fetchall()
+                self._snapshot = _build(rows, fingerprint)
+        self._last_sync = time.monotonic()
+
+    def _maybe_sync(self):
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=self._snapshot is None):
+            return
+        try:
+            if time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+        finally:
+            self._sync_lock.release()
+
+    # Checks the fingerprint now. Threads that arrive while a check is
+    # running wait for it and use its result instead of running another.
+    def _sync_now(self):
+        requested = time.monotonic()
+        with self._sync_lock:
+            if self._last_sync < requested:
+                self._sync()
+
+    # Forces a fingerprint check on the next read, for writes in this worker.
+    def mark_stale(self):
+        self._last_sync = 0.0
+
+    def _poster_names(self, poster_ids):
+        if not poster_ids:
+            return {}
+        engine = get_engine()
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT id, name FROM users WHERE id IN :ids
+            """).bindparams(bindparam("ids", expanding=True)), {"ids": sorted(poster_ids)})
+            return {row.id: row.name for row in result}
+
+    def _query(self, snapshot, profile_text, applied_rows):
+        query = np.zeros(len(snapshot.vocab))
+        for term, weight in _term_weights([(profile_text, 1.0)]).items():
+            col = snapshot.vocab.get(term)
+            if col is not None:
+                query[col] = weight * snapshot.idf[col]
+        norm = np.linalg.norm(query)
+        if norm:
+            query /= norm
+
+        if not applied_rows:
+            return query
+        history = np.asarray(snapshot.matrix[applied_rows].mean(axis=0)).ravel()
+        history /= np.linalg.norm(history) or 1.0
+        if not norm:
+            return history
+        return (1 - HISTORY_WEIGHT) * query + HISTORY_WEIGHT * history
+
+    # Returns (item, score) pairs for the top `limit` active opportunities the
+    # student has not applied to. Ties (including students with an empty
+    # profile, who score 0 everywhere) fall back to newest first.
+    #
+    # fresh=True checks the fingerprint before reading instead of trusting a
+    # check up to sync_interval old. Callers that cache the result use it, so
+    # a worker whose index lags another worker's write cannot store the old
+    # feed under the namespace version that write just bumped.
+    def feed(self, profile_text, applied_ids, limit, fresh=False):
+        if fresh:
+            self._sync_now()
+        else:
+            self._maybe_sync()
+        snapshot = self._snapshot
+        if not len(snapshot.ids):
+            return []
+
+        applied_rows = [snapshot.row_of[i] for i in applied_ids if i in snapshot.row_of]
+        scores = snapshot.matrix @ self._query(snapshot, profile_text, applied_rows)
+        scores[applied_rows] = -1.0
+
+        # Rows are stored newest first, so a stable sort on score keeps
+        # recency as the tie-breaker.
+        candidates = np.flatnonzero(scores >= 0)
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")[:limit]]
+        names = self._poster_names({snapshot.posters[i] for i in candidates} - {None})
+        return [({**snapshot.items[i], "posted_by_name": names.get(snapshot.posters[i])}, float(scores[i]))
+                for i in candidates]
+
+
+def get_opportunity_index() -> OpportunityIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = OpportunityIndex(get_config()["FEED_SYNC_SECONDS"])
+    return _index
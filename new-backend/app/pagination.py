@@ -0,0 +1,118 @@
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import jsonify, request
+
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def handle_invalid_cursor(error):
+    return jsonify({"error": str(error)}), 400
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(values):
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list):
+            raise InvalidCursor("Invalid cursor")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def parse_limit():
+    try:
+        limit = int(request.args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    return max(1, min(limit, MAX_LIMIT))
+
+
+# Keyset pagination over an ORDER BY of (sql_expr, row_attr, descending)
+# columns. The last column must be unique (usually the primary key) so every
+# row has a distinct position and pages never skip or repeat rows.
+class KeysetPage:
+    def __init__(self, *columns):
+        self.columns = columns
+        self.limit = parse_limit()
+        self.next_cursor = None
+
+        cursor = request.args.get("cursor")
+        self.cursor = decode_cursor(cursor) if cursor else None
+        if self.cursor is not None and len(self.cursor) != len(columns):
+            raise InvalidCursor("Invalid cursor")
+
+    @property
+    def order_by(self):
+        return ", ".join(f"{expr} {'DESC' if desc else 'ASC'}" for expr, _, desc in self.columns)
+
+    def where(self, prefix="AND"):
+        if self.cursor is None:
+            return ""
+
+        # (a, b, c) > (x, y, z) expanded so mixed directions work:
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        # Equality is NULL-safe (<=>) so a nullable sort column still
+        # matches the rest of its NULL group; a later unique column orders it.
+        branches = []
+        for i, (expr, _, desc) in enumerate(self.columns):
+            terms = [f"{e} <=> :cursor_{j}" for j, (e, _, _) in enumerate(self.columns[:i])]
+            terms.append(f"{expr} {'<' if desc else '>'} :cursor_{i}")
+            branches.append("(" + " AND ".join(terms) + ")")
+        return f"{prefix} ({' OR '.join(branches)})"
+
+    @property
+    def params(self):
+        params = {"page_limit": self.limit + 1}
+        if self.cursor is not None:
+            params.update({f"cursor_{i}": value for i, value in enumerate(self.cursor)})
+        return params
+
+    def rows(self, result):
+        rows = result.fetchmany(self.limit + 1)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            self.next_cursor = encode_cursor([getattr(last, attr) for _, attr, _ in self.columns])
+        return rows
+
+    def response(self, items):
+        response = jsonify(items)
+        if self.next_cursor:
+            response.headers["X-Next-Cursor"] = self.next_cursor
+        return response
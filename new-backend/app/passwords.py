@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from flask import jsonify
+
+from .config import get_config
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def handle_password_hasher_busy(error):
+    response = jsonify({"error": "Server is busy, please try again shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _verify(password, password_hash):
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the
+# work off the request threads. Slots cover running plus queued calls; once
+# they are all taken new calls fail fast with PasswordHasherBusy.
+class PasswordHasher:
+    def __init__(self, rounds, workers, queue_depth):
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    # Bulk hashing (user import jobs) shares the bounded pool but waits for
+    # free slots instead of failing, so it queues no deeper than login does.
+    def hash_many(self, passwords):
+        futures = []
+        for password in passwords:
+            self._slots.acquire()
+            try:
+                future = self._get_executor().submit(_hash, password, self.rounds)
+            except Exception:
+                self._slots.release()
+                raise
+            future.add_done_callback(lambda _: self._slots.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def verify(self, password, password_hash):
+        return self._run(_verify, password, password_hash)
+
+    def needs_rehash(self, password_hash):
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def reset_after_fork(self):
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+
+
+def _build_hasher(config) -> PasswordHasher:
+    return PasswordHasher(
+        rounds=config["BCRYPT_ROUNDS"],
+        workers=config["PASSWORD_HASH_WORKERS"],
+        queue_depth=config["PASSWORD_HASH_QUEUE_DEPTH"],
+    )
+
+
+def init_password_hasher(config) -> PasswordHasher:
+    global _hasher
+    with _hasher_lock:
+        _hasher = _build_hasher(config)
+        return _hasher
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = _build_hasher(get_config())
+    return _hasher
+
+
+def hash_password(password):
+    return get_password_hasher().hash(password)
+
+
+def hash_passwords(passwords):
+    return get_password_hasher().hash_many(passwords)
+
+
+def verify_password(password, password_hash):
+    return get_password_hasher().verify(password, password_hash)
+
+
+def needs_rehash(password_hash):
+    return get_password_hasher().needs_rehash(password_hash)
+
+
+def reset_password_hasher_after_fork():
+    if _hasher is not None:
+        _hasher.reset_after_fork()
@@ -0,0 +1,175 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+Rule = namedtuple("Rule", "name capacity rate")
+
+
+def parse_limit(name, limit):
+    try:
+        capacity, period = limit.split("/")
+        capacity, period = int(capacity), float(period)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit for {name}: {limit!r}")
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Invalid rate limit for {name}: {limit!r}")
+    return Rule(name, capacity, capacity / period)
+
+
+# "auth.login=10/60,search=30/60": each entry allows `capacity` requests per
+# `period` seconds to an endpoint, or to a whole blueprint by its name.
+def parse_rules(spec):
+    rules = {}
+    for entry in filter(None, (e.strip() for e in spec.split(","))):
+        try:
+            name, limit = entry.split("=")
+        except ValueError:
+            raise ValueError(f"Invalid RATELIMIT_RULES entry: {entry!r}")
+        rules[name.strip()] = parse_limit(name.strip(), limit.strip())
+    return rules
+
+
+class MemoryBackend:
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Returns (allowed, seconds until the next token).
+    def take(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # An evicted bucket comes back full, so only the least recently
+            # seen clients can gain from eviction.
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+# Refill and take in one script so concurrent workers cannot both spend the
+# last token; Redis' clock is used so worker clock skew does not matter.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry)}
+"""
+
+
+class RedisBackend:
+    def __init__(self, url, prefix="alumni:ratelimit:"):
+        if redis is None:
+            raise RuntimeError("RATELIMIT_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._take = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key, capacity, rate):
+        allowed, retry = self._take(keys=[self.prefix + key], args=[capacity, rate])
+        return bool(allowed), float(retry)
+
+
+# Token buckets checked before the view runs, for endpoints or blueprints
+# named in RATELIMIT_RULES. Requests with a valid JWT are keyed by user id,
+# others by client IP; behind a proxy, set TRUSTED_PROXY_COUNT so the IP is
+# the client's rather than the proxy's. Logins also draw from a bucket per
+# submitted email, which catches credential stuffing spread over many IPs.
+class RateLimiter:
+    def __init__(self, config):
+        self.enabled = config["RATELIMIT_ENABLED"]
+        self.rules = parse_rules(config["RATELIMIT_RULES"])
+        self.login_rule = parse_limit("auth.login:email", config["RATELIMIT_LOGIN_PER_EMAIL"]) \
+            if config["RATELIMIT_LOGIN_PER_EMAIL"] else None
+        if config["RATELIMIT_BACKEND"] == "redis":
+            self.backend = RedisBackend(config["RATELIMIT_REDIS_URL"])
+        else:
+            self.backend = MemoryBackend(config["RATELIMIT_MAX_KEYS"])
+            if self.enabled and config["WORKER_PROCESSES"] > 1:
+                logger.warning("RATELIMIT_BACKEND=memory keeps buckets per worker: with %s workers each limit "
+                               "is effectively %sx higher; set RATELIMIT_REDIS_URL to share them",
+                               config["WORKER_PROCESSES"], config["WORKER_PROCESSES"])
+
+    def _rule(self):
+        return self.rules.get(request.endpoint) or self.rules.get(request.blueprint)
+
+    def _client(self):
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            identity = None
+        if isinstance(identity, dict) and "id" in identity:
+            return f"user:{identity['id']}"
+        return f"ip:{request.remote_addr}"
+
+    def _buckets(self):
+        rule = self._rule()
+        if rule is not None:
+            yield rule, f"{rule.name}:{self._client()}"
+        if self.login_rule is not None and request.endpoint == "auth.login":
+            data = request.get_json(silent=True)
+            email = data.get("email") if isinstance(data, dict) else None
+            if isinstance(email, str) and email.strip():
+                yield self.login_rule, f"{self.login_rule.name}:{email.strip().lower()}"
+
+    def check(self):
+        if not self.enabled or request.method == "OPTIONS":
+            return None
+
+        retry_after = 0.0
+        try:
+            for rule, key in self._buckets():
+                allowed, wait = self.backend.take(key, rule.capacity, rule.rate)
+                if not allowed:
+                    retry_after = max(retry_after, wait)
+        except Exception as e:
+            # Like the cache, a store outage lets traffic through.
+            current_app.logger.warning("Rate limit check failed for %s: %s", request.endpoint, e)
+            return None
+        if not retry_after:
+            return None
+
+        response = jsonify({"error": "Too many requests, please slow down"})
+        response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response, 429
+
+
+def init_rate_limiter(app):
+    limiter = RateLimiter(app.config)
+    app.before_request(limiter.check)
+    return limiter
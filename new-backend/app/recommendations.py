@@ -0,0 +1,234 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter, namedtuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import text
+
+from .config import get_config
+from .models import get_engine
+
+
+logger = logging.getLogger(__name__)
+
+_index = None
+_index_lock = threading.Lock()
+
+SYNC_OVERLAP_SECONDS = 5
+
+# Relative weight of each profile field before IDF; a shared major says more
+# than a shared word in a job title.
+FIELD_WEIGHTS = {"skill": 1.0, "major": 1.5, "company": 0.75, "position": 0.5}
+
+_LIST_RE = re.compile(r"[,;|\n]+")
+_WORD_RE = re.compile(r"[a-z0-9+#.]+")
+
+Snapshot = namedtuple("Snapshot", "ids row_of vocab idf matrix loads")
+
+
+def _normalize(value):
+    return " ".join(value.casefold().split()) if isinstance(value, str) else ""
+
+
+def profile_features(skills, major, company, position):
+    features = {}
+    for skill in _LIST_RE.split(_normalize(skills)):
+        if skill.strip():
+            features[f"skill:{skill.strip()}"] = FIELD_WEIGHTS["skill"]
+    if _normalize(major):
+        features[f"major:{_normalize(major)}"] = FIELD_WEIGHTS["major"]
+    if _normalize(company):
+        features[f"company:{_normalize(company)}"] = FIELD_WEIGHTS["company"]
+    for word in _WORD_RE.findall(_normalize(position)):
+        if len(word) > 2:
+            features[f"position:{word}"] = FIELD_WEIGHTS["position"]
+    return features
+
+
+def _weighted(features, snapshot):
+    # Features no alumnus had at build time get the rarest-term IDF.
+    unseen_idf = float(snapshot.idf.max()) if len(snapshot.idf) else 1.0
+    vector = {}
+    for feature, weight in features.items():
+        col = snapshot.vocab.get(feature)
+        vector[feature] = weight * (float(snapshot.idf[col]) if col is not None else unseen_idf)
+    norm = sum(v * v for v in vector.values()) ** 0.5
+    return {f: v / norm for f, v in vector.items()} if norm else {}
+
+
+def _build(rows, loads):
+    features = [profile_features(r.skills, r.major, r.company, r.position) for r in rows]
+    df = Counter(f for fs in features for f in fs)
+    vocab = {feature: col for col, feature in enumerate(df)}
+    n = len(rows)
+    idf = np.log((1 + n) / (1 + np.array([df[f] for f in vocab], dtype=np.float64))) + 1.0
+
+    row_idx, col_idx, weights = [], [], []
+    for i, fs in enumerate(features):
+        for feature, weight in fs.items():
+            row_idx.append(i)
+            col_idx.append(vocab[feature])
+            weights.append(weight)
+    row_idx = np.array(row_idx, dtype=np.int64)
+    col_idx = np.array(col_idx, dtype=np.int64)
+    data = np.array(weights, dtype=np.float64) * idf[col_idx] if len(col_idx) else np.zeros(0)
+
+    # L2-normalise rows so a dot product with a normalised query is cosine.
+    norms = np.sqrt(np.bincount(row_idx, weights=data * data, minlength=n))
+    if len(data):
+        data /= norms[row_idx]
+
+    ids = np.array([r.id for r in rows], dtype=np.int64)
+    # CSC: a query only touches the columns of the student's features.
+    matrix = sparse.csc_matrix((data, (row_idx, col_idx)), shape=(n, len(vocab)))
+    return Snapshot(
+        ids=ids,
+        row_of={int(i): row for row, i in enumerate(ids)},
+        vocab=vocab,
+        idf=idf,
+        matrix=matrix,
+        loads=np.array([loads.get(int(i), 0) for i in ids], dtype=np.float64)
+    )
+
+
+# Alumni profiles as a sparse (alumni x feature) TF-IDF matrix, one per
+# worker. Profiles changed since the last build live in a small overlay that
+# is scored separately and masks the stale matrix row; the matrix is rebuilt
+# once the overlay grows past max_overlay or every rebuild_interval seconds.
+class MentorIndex:
+    def __init__(self, sync_interval, rebuild_interval, max_overlay, load_penalty):
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.max_overlay = max_overlay
+        self.load_penalty = load_penalty
+        self._snapshot = None
+        self._overlay = {}
+        self._loads = {}
+        self._since = None
+        self._last_sync = 0.0
+        self._last_build = 0.0
+        self._sync_lock = threading.Lock()
+
+    def _fetch_loads(self, conn):
+        result = conn.execute(text("""
+            SELECT mentor_id, COUNT(*) as active FROM mentorship_requests
+            WHERE status = 'accepted'
+            GROUP BY mentor_id
+        """))
+        return {row.mentor_id: row.active for row in result}
+
+    def _sync(self):
+        engine = get_engine()
+        with engine.connect() as conn:
+            now = conn.execute(text("SELECT NOW()")).scalar()
+            loads = self._fetch_loads(conn)
+            overlay = None
+            if self._snapshot is not None and time.monotonic() - self._last_build < self.rebuild_interval:
+                result = conn.execute(text("""
+                    SELECT id, role, skills, major, company, position FROM users
+                    WHERE updated_at >= :since - INTERVAL :overlap SECOND
+                """), {"since": self._since, "overlap": SYNC_OVERLAP_SECONDS})
+                overlay = dict(self._overlay)
+                for row in result:
+                    overlay[row.id] = row if row.role == "alumni" else None
+
+            if overlay is None or len(overlay) > self.max_overlay:
+                rows = conn.execute(text("""
+                    SELECT id, skills, major, company, position FROM users WHERE role = 'alumni'
+                """)).fetchall()
+                self._snapshot, self._overlay, self._loads = _build(rows, loads), {}, loads
+                self._last_build = time.monotonic()
+            else:
+                snapshot = self._snapshot
+                loads_array = np.array([loads.get(int(i), 0) for i in snapshot.ids], dtype=np.float64)
+                self._snapshot = snapshot._replace(loads=loads_array)
+                self._overlay, self._loads = overlay, loads
+        self._since = now
+        self._last_sync = time.monotonic()
+
+    def _maybe_sync(self):
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=self._snapshot is None):
+            return
+        try:
+            if time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync()
+        finally:
+            self._sync_lock.release()
+
+    # Applies a profile change made by this worker without waiting for the
+    # next sync. Failures only force an early sync.
+    def refresh_user(self, user_id):
+        with self._sync_lock:
+            if self._snapshot is None:
+                return
+            try:
+                engine = get_engine()
+                with engine.connect() as conn:
+                    row = conn.execute(text("""
+                        SELECT id, role, skills, major, company, position FROM users WHERE id = :user_id
+                    """), {"user_id": user_id}).fetchone()
+                overlay = dict(self._overlay)
+                overlay[user_id] = row if row is not None and row.role == "alumni" else None
+                self._overlay = overlay
+            except Exception:
+                logger.exception("Mentor index refresh failed for user %s", user_id)
+                self._last_sync = 0.0
+
+    # Returns up to k (alumni_id, score, active_mentees) tuples, best first.
+    # Score is cosine similarity damped by current mentoring load.
+    def recommend(self, features, exclude_ids, k):
+        self._maybe_sync()
+        snapshot, overlay, loads = self._snapshot, self._overlay, self._loads
+        query = _weighted(features, snapshot)
+        if not query:
+            return []
+
+        cols = [snapshot.vocab[f] for f in query if f in snapshot.vocab]
+        if cols:
+            weights = np.array([query[f] for f in query if f in snapshot.vocab])
+            scores = snapshot.matrix[:, cols] @ weights
+        else:
+            scores = np.zeros(len(snapshot.ids))
+        scores = scores / (1.0 + self.load_penalty * snapshot.loads)
+
+        for user_id in list(overlay) + list(exclude_ids):
+            row = snapshot.row_of.get(user_id)
+            if row is not None:
+                scores[row] = 0.0
+
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = [(int(snapshot.ids[i]), float(scores[i])) for i in candidates]
+
+        for user_id, row in overlay.items():
+            if row is None or user_id in exclude_ids:
+                continue
+            vector = _weighted(profile_features(row.skills, row.major, row.company, row.position), snapshot)
+            score = sum(w * vector.get(f, 0.0) for f, w in query.items())
+            score /= 1.0 + self.load_penalty * loads.get(user_id, 0)
+            if score > 0:
+                ranked.append((user_id, score))
+
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return [(user_id, score, loads.get(user_id, 0)) for user_id, score in ranked[:k]]
+
+
+def get_mentor_index() -> MentorIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                config = get_config()
+                _index = MentorIndex(
+                    sync_interval=config["RECOMMEND_SYNC_SECONDS"],
+                    rebuild_interval=config["RECOMMEND_REBUILD_SECONDS"],
+                    max_overlay=config["RECOMMEND_MAX_OVERLAY"],
+                    load_penalty=config["RECOMMEND_LOAD_PENALTY"]
+                )
+    return _index
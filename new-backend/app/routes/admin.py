@@ -1,62 +1,49 @@
-from flask import Blueprint, jsonify, request
+import json
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import invalidate
+from ..dashboard_stats import get_stats_snapshot
+from ..eligibility import get_eligibility_index
+from ..export import export_response
+from ..jobs import retry_dead_job
 from ..models import get_engine
+from ..pagination import KeysetPage
+from ..recommendations import get_mentor_index
 from ..middleware import admin_required
+from ..opportunity_feed import get_opportunity_index
+from ..passwords import hash_password
+from ..serialization import Columns
+from ..user_import import get_import, parse_csv, start_import
 from sqlalchemy import text
-import bcrypt
 
 bp = Blueprint("admin", __name__)
 
+USER_COLUMNS = Columns(
+    "id", "name", "email", "role", "graduation_year", "major", "company", "position",
+    "cgpa", "category", "phone", "email_verified", "created_at"
+)
+OPPORTUNITY_COLUMNS = Columns(
+    "o.id", "o.title", "o.company", "o.type", "o.is_active",
+    "u.name as posted_by_name", "u.email as posted_by_email", "o.created_at"
+)
+SCHOLARSHIP_COLUMNS = Columns(
+    "s.id", "s.title", "s.amount", "s.deadline", "s.status", "s.cgpa_requirement", "s.category_requirement",
+    "u.name as created_by_name", "u.email as created_by_email",
+    "(SELECT COUNT(*) FROM scholarship_applications WHERE scholarship_id = s.id) as application_count",
+    "s.created_at"
+)
+APPLICATION_COLUMNS = Columns(
+    "a.id", "a.type", "a.status", "u.name as applicant_name", "u.email as applicant_email",
+    "o.title as opportunity_title", "s.title as scholarship_title", "a.created_at"
+)
+
 
 @bp.get("/dashboard")
 @admin_required
 def get_dashboard_stats():
-    engine = get_engine()
+    force = request.args.get("refresh", "").lower() in ("1", "true", "yes")
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT
-                    (SELECT COUNT(*) FROM users WHERE role = 'student') as total_students,
-                    (SELECT COUNT(*) FROM users WHERE role = 'alumni') as total_alumni,
-                    (SELECT COUNT(*) FROM users WHERE role = 'admin') as total_admins,
-                    (SELECT COUNT(*) FROM opportunities WHERE is_active = TRUE) as active_opportunities,
-                    (SELECT COUNT(*) FROM scholarships WHERE status = 'active') as active_scholarships,
-                    (SELECT COUNT(*) FROM mentorship_requests WHERE status = 'pending') as pending_mentorships,
-                    (SELECT COUNT(*) FROM applications) as total_applications,
-                    (SELECT COUNT(*) FROM scholarship_applications) as total_scholarship_applications,
-                    (SELECT COUNT(*) FROM messages WHERE is_read = FALSE) as unread_messages,
-                    (SELECT COUNT(*) FROM stories) as total_stories
-            """))
-
-            stats = result.fetchone()
-
-            return jsonify({
-                "users": {
-                    "total_students": stats.total_students,
-                    "total_alumni": stats.total_alumni,
-                    "total_admins": stats.total_admins,
-                    "total": stats.total_students + stats.total_alumni + stats.total_admins
-                },
-                "opportunities": {
-                    "active": stats.active_opportunities
-                },
-                "scholarships": {
-                    "active": stats.active_scholarships,
-                    "total_applications": stats.total_scholarship_applications
-                },
-                "mentorships": {
-                    "pending": stats.pending_mentorships
-                },
-                "applications": {
-                    "total": stats.total_applications
-                },
-                "messages": {
-                    "unread": stats.unread_messages
-                },
-                "stories": {
-                    "total": stats.total_stories
-                }
-            }), 200
+        return jsonify(get_stats_snapshot().get(force=force)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -64,39 +51,34 @@ def get_dashboard_stats():
 @bp.get("/users")
 @admin_required
 def list_all_users():
+    page = KeysetPage(("created_at", "created_at", True), ("id", "id", True))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT id, name, email, role, graduation_year, major, company, position,
-                       cgpa, category, phone, email_verified, created_at
+            result = conn.execute(text(f"""
+                SELECT {USER_COLUMNS.select}
                 FROM users
-                ORDER BY created_at DESC
-            """))
-
-            users = []
-            for row in result:
-                users.append({
-                    "id": row.id,
-                    "name": row.name,
-                    "email": row.email,
-                    "role": row.role,
-                    "graduation_year": row.graduation_year,
-                    "major": row.major,
-                    "company": row.company,
-                    "position": row.position,
-                    "cgpa": float(row.cgpa) if row.cgpa else None,
-                    "category": row.category,
-                    "phone": row.phone,
-                    "email_verified": row.email_verified,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
 
-            return jsonify(users), 200
+            return page.response(USER_COLUMNS.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@bp.get("/users/export")
+@admin_required
+def export_users():
+    return export_response("""
+        SELECT id, name, email, role, graduation_year, major, company, position,
+               cgpa, category, phone, email_verified, created_at
+        FROM users
+        ORDER BY id
+    """, "users")
+
+
 @bp.put("/users/<int:user_id>")
 @admin_required
 def update_user(user_id):
@@ -155,6 +137,8 @@ def update_user(user_id):
             query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = :user_id"
             conn.execute(text(query), params)
             conn.commit()
+            invalidate("users")
+            get_mentor_index().refresh_user(user_id)
 
             return jsonify({"message": "User updated successfully"}), 200
     except Exception as e:
@@ -178,6 +162,8 @@ def delete_user(user_id):
 
             conn.execute(text("DELETE FROM users WHERE id = :user_id"), {"user_id": user_id})
             conn.commit()
+            invalidate("users")
+            get_mentor_index().refresh_user(user_id)
 
             return jsonify({"message": "User deleted successfully"}), 200
     except Exception as e:
@@ -195,7 +181,7 @@ def create_user():
     if data["role"] not in ["student", "alumni", "admin"]:
         return jsonify({"error": "Invalid role"}), 400
 
-    password_hash = bcrypt.hashpw(data["password"].encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    password_hash = hash_password(data["password"])
 
     engine = get_engine()
     try:
@@ -225,40 +211,74 @@ def create_user():
                 "phone": data.get("phone")
             })
             conn.commit()
+            invalidate("users")
 
             return jsonify({"message": "User created successfully"}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@bp.post("/users/import")
+@admin_required
+def import_users_bulk():
+    current_user = get_jwt_identity()
+    max_rows = current_app.config["USER_IMPORT_MAX_ROWS"]
+
+    try:
+        if "file" in request.files:
+            rows = parse_csv(request.files["file"].read().decode("utf-8-sig"))
+        elif request.mimetype == "text/csv":
+            rows = parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            rows = data.get("users") if isinstance(data, dict) else data
+    except UnicodeDecodeError:
+        return jsonify({"error": "CSV file must be UTF-8 encoded"}), 400
+
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"error": "Provide a CSV file or a JSON list of users"}), 400
+    if len(rows) > max_rows:
+        return jsonify({"error": f"At most {max_rows} users per import"}), 400
+
+    try:
+        import_id = start_import(rows, current_app.config["USER_IMPORT_BATCH_SIZE"], current_user["id"])
+        response = jsonify(get_import(import_id))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+    response.headers["Location"] = f"/api/admin/users/import/{import_id}"
+    return response, 202
+
+
+@bp.get("/users/import/<int:import_id>")
+@admin_required
+def get_user_import(import_id):
+    try:
+        user_import = get_import(import_id)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    if user_import is None:
+        return jsonify({"error": "Import not found"}), 404
+    return jsonify(user_import), 200
+
+
 @bp.get("/opportunities")
 @admin_required
 def list_all_opportunities():
+    page = KeysetPage(("o.created_at", "created_at", True), ("o.id", "id", True))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT o.id, o.title, o.company, o.type, o.is_active, o.created_at,
-                       u.name as posted_by_name, u.email as posted_by_email
+            result = conn.execute(text(f"""
+                SELECT {OPPORTUNITY_COLUMNS.select}
                 FROM opportunities o
                 LEFT JOIN users u ON o.posted_by = u.id
-                ORDER BY o.created_at DESC
-            """))
-
-            opportunities = []
-            for row in result:
-                opportunities.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "company": row.company,
-                    "type": row.type,
-                    "is_active": row.is_active,
-                    "posted_by_name": row.posted_by_name,
-                    "posted_by_email": row.posted_by_email,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
 
-            return jsonify(opportunities), 200
+            return page.response(OPPORTUNITY_COLUMNS.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -275,6 +295,8 @@ def admin_delete_opportunity(opportunity_id):
 
             conn.execute(text("UPDATE opportunities SET is_active = FALSE WHERE id = :id"), {"id": opportunity_id})
             conn.commit()
+            invalidate("opportunities")
+            get_opportunity_index().mark_stale()
 
             return jsonify({"message": "Opportunity deleted successfully"}), 200
     except Exception as e:
@@ -284,40 +306,38 @@ def admin_delete_opportunity(opportunity_id):
 @bp.get("/scholarships")
 @admin_required
 def list_all_scholarships():
+    page = KeysetPage(("s.created_at", "created_at", True), ("s.id", "id", True))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.amount, s.deadline, s.status, s.created_at,
-                       s.cgpa_requirement, s.category_requirement,
-                       u.name as created_by_name, u.email as created_by_email,
-                       (SELECT COUNT(*) FROM scholarship_applications WHERE scholarship_id = s.id) as application_count
+            result = conn.execute(text(f"""
+                SELECT {SCHOLARSHIP_COLUMNS.select}
                 FROM scholarships s
                 LEFT JOIN users u ON s.created_by = u.id
-                ORDER BY s.created_at DESC
-            """))
-
-            scholarships = []
-            for row in result:
-                scholarships.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "amount": float(row.amount) if row.amount else None,
-                    "deadline": row.deadline.isoformat() if row.deadline else None,
-                    "status": row.status,
-                    "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
-                    "category_requirement": row.category_requirement,
-                    "created_by_name": row.created_by_name,
-                    "created_by_email": row.created_by_email,
-                    "application_count": row.application_count,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
 
-            return jsonify(scholarships), 200
+            return page.response(SCHOLARSHIP_COLUMNS.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@bp.get("/scholarships/export")
+@admin_required
+def export_scholarships():
+    return export_response("""
+        SELECT s.id, s.title, s.amount, s.deadline, s.status, s.created_at,
+               s.cgpa_requirement, s.category_requirement,
+               u.name as created_by_name, u.email as created_by_email,
+               (SELECT COUNT(*) FROM scholarship_applications WHERE scholarship_id = s.id) as application_count
+        FROM scholarships s
+        LEFT JOIN users u ON s.created_by = u.id
+        ORDER BY s.id
+    """, "scholarships")
+
+
 @bp.delete("/scholarships/<int:scholarship_id>")
 @admin_required
 def admin_delete_scholarship(scholarship_id):
@@ -330,6 +350,8 @@ def admin_delete_scholarship(scholarship_id):
 
             conn.execute(text("UPDATE scholarships SET status = 'inactive' WHERE id = :id"), {"id": scholarship_id})
             conn.commit()
+            invalidate("scholarships")
+            get_eligibility_index().refresh(scholarship_id)
 
             return jsonify({"message": "Scholarship deleted successfully"}), 200
     except Exception as e:
@@ -339,34 +361,90 @@ def admin_delete_scholarship(scholarship_id):
 @bp.get("/applications")
 @admin_required
 def list_all_applications():
+    page = KeysetPage(("a.created_at", "created_at", True), ("a.id", "id", True))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT a.id, a.type, a.status, a.created_at,
-                       u.name as applicant_name, u.email as applicant_email,
-                       o.title as opportunity_title,
-                       s.title as scholarship_title
+            result = conn.execute(text(f"""
+                SELECT {APPLICATION_COLUMNS.select}
                 FROM applications a
                 JOIN users u ON a.applicant_id = u.id
                 LEFT JOIN opportunities o ON a.opportunity_id = o.id
                 LEFT JOIN scholarships s ON a.scholarship_id = s.id
-                ORDER BY a.created_at DESC
-            """))
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
+
+            return page.response(APPLICATION_COLUMNS.dump(page.rows(result))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 
-            applications = []
-            for row in result:
-                applications.append({
+@bp.get("/applications/export")
+@admin_required
+def export_applications():
+    return export_response("""
+        SELECT a.id, a.type, a.status, a.created_at,
+               u.name as applicant_name, u.email as applicant_email,
+               o.title as opportunity_title,
+               s.title as scholarship_title
+        FROM applications a
+        JOIN users u ON a.applicant_id = u.id
+        LEFT JOIN opportunities o ON a.opportunity_id = o.id
+        LEFT JOIN scholarships s ON a.scholarship_id = s.id
+        ORDER BY a.id
+    """, "applications")
+
+
+@bp.get("/jobs")
+@admin_required
+def list_jobs():
+    page = KeysetPage(("id", "id", True))
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT status, COUNT(*) as count FROM jobs GROUP BY status
+            """))
+            counts = {"queued": 0, "running": 0, "dead": 0}
+            counts.update({row.status: row.count for row in result})
+
+            # The dead-letter list: jobs that exhausted their retries.
+            result = conn.execute(text(f"""
+                SELECT id, name, payload, attempts, last_error, created_at
+                FROM jobs
+                WHERE status = 'dead' {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
+
+            dead = []
+            for row in page.rows(result):
+                dead.append({
                     "id": row.id,
-                    "type": row.type,
-                    "status": row.status,
-                    "applicant_name": row.applicant_name,
-                    "applicant_email": row.applicant_email,
-                    "opportunity_title": row.opportunity_title,
-                    "scholarship_title": row.scholarship_title,
+                    "name": row.name,
+                    "payload": json.loads(row.payload) if row.payload else None,
+                    "attempts": row.attempts,
+                    "last_error": row.last_error,
                     "created_at": row.created_at.isoformat() if row.created_at else None
                 })
 
-            return jsonify(applications), 200
+            return page.response({"counts": counts, "dead": dead}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.post("/jobs/<int:job_id>/retry")
+@admin_required
+def retry_job(job_id):
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            if not retry_dead_job(conn, job_id):
+                return jsonify({"error": "Dead job not found"}), 404
+            conn.commit()
+
+            return jsonify({"message": "Job requeued"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
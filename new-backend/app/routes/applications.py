@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import invalidate
 from ..models import get_engine
 from sqlalchemy import text
 
@@ -78,6 +79,9 @@ def create_application():
                 "cover_letter": cover_letter
             })
             conn.commit()
+            if opportunity_id:
+                # The feed hides opportunities already applied to.
+                invalidate(f"user:{current_user['id']}")
             
             return jsonify({
                 "message": "Application submitted successfully",
@@ -1,7 +1,8 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-import bcrypt
+from ..cache import invalidate
 from ..models import get_engine
+from ..passwords import hash_password, needs_rehash, verify_password
 from sqlalchemy import text
 
 bp = Blueprint("auth", __name__)
@@ -19,7 +20,7 @@ def register():
         return jsonify({"error": "Email, password, and name are required"}), 400
     
     # Hash password
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    password_hash = hash_password(password)
     
     engine = get_engine()
     try:
@@ -40,6 +41,7 @@ def register():
                 "role": role
             })
             conn.commit()
+            invalidate("users")
             
             return jsonify({"message": "User registered successfully"}), 201
     except Exception as e:
@@ -63,33 +65,50 @@ def login():
             """), {"email": email})
             
             user = result.fetchone()
-            if not user:
-                return jsonify({"error": "Invalid credentials"}), 401
-            
-            # Verify password
-            if not bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
-                return jsonify({"error": "Invalid credentials"}), 401
-            
-            # Create JWT token
-            access_token = create_access_token(identity={
-                "id": user.id,
-                "email": user.email,
-                "name": user.name,
-                "role": user.role
-            })
-            
-            return jsonify({
-                "access_token": access_token,
-                "user": {
-                    "id": user.id,
-                    "email": user.email,
-                    "name": user.name,
-                    "role": user.role
-                }
-            }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    if not user:
+        return jsonify({"error": "Invalid credentials"}), 401
+
+    # Verify password
+    if not verify_password(password, user.password_hash):
+        return jsonify({"error": "Invalid credentials"}), 401
+
+    # Upgrade hashes made with an older work factor while we have the plaintext
+    if needs_rehash(user.password_hash):
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("""
+                    UPDATE users SET password_hash = :new_hash
+                    WHERE id = :user_id AND password_hash = :old_hash
+                """), {
+                    "new_hash": hash_password(password),
+                    "old_hash": user.password_hash,
+                    "user_id": user.id
+                })
+                conn.commit()
+        except Exception as e:
+            current_app.logger.warning("Password rehash skipped for user %s: %s", user.id, e)
+
+    # Create JWT token
+    access_token = create_access_token(identity={
+        "id": user.id,
+        "email": user.email,
+        "name": user.name,
+        "role": user.role
+    })
+
+    return jsonify({
+        "access_token": access_token,
+        "user": {
+            "id": user.id,
+            "email": user.email,
+            "name": user.name,
+            "role": user.role
+        }
+    }), 200
+
 
 @bp.get("/me")
 @jwt_required()
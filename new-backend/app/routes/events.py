@@ -0,0 +1,75 @@
+import json
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from ..events import TooManySubscribers, get_broker
+
+
+bp = Blueprint("events", __name__)
+
+
+def _format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def _stream_tokens():
+    return URLSafeTimedSerializer(current_app.config["JWT_SECRET_KEY"], salt="events-stream")
+
+
+# EventSource cannot set an Authorization header, and an access token in the
+# URL would end up in proxy logs and browser history. Clients exchange their
+# JWT here for a token that only opens a stream and expires after
+# EVENTS_TOKEN_TTL seconds, then connect with ?token=<token>.
+@bp.post("/token")
+@jwt_required()
+def stream_token():
+    current_user = get_jwt_identity()
+    return jsonify({
+        "token": _stream_tokens().dumps(current_user["id"]),
+        "expires_in": current_app.config["EVENTS_TOKEN_TTL"]
+    })
+
+
+@bp.get("/stream")
+def stream():
+    token = request.args.get("token")
+    if token is not None:
+        try:
+            user_id = _stream_tokens().loads(token, max_age=current_app.config["EVENTS_TOKEN_TTL"])
+        except BadSignature:
+            return jsonify({"error": "Invalid or expired stream token"}), 401
+    else:
+        verify_jwt_in_request()
+        user_id = get_jwt_identity()["id"]
+    heartbeat = current_app.config["EVENTS_HEARTBEAT_SECONDS"]
+    max_duration = current_app.config["EVENTS_STREAM_TIMEOUT"]
+
+    try:
+        subscription = get_broker().subscribe(user_id)
+    except TooManySubscribers:
+        response = jsonify({"error": "Too many open event streams, please retry shortly"})
+        response.headers["Retry-After"] = "5"
+        return response, 503
+
+    def generate():
+        # Streams end after max_duration so a worker thread is never pinned
+        # forever. A stream token has usually expired by then, so clients
+        # reopen with a new one rather than relying on EventSource's retry.
+        deadline = time.monotonic() + max_duration
+        try:
+            yield "retry: 3000\n\n"
+            while time.monotonic() < deadline:
+                message = subscription.get(timeout=heartbeat)
+                if message is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield _format_event(*message)
+        finally:
+            subscription.close()
+
+    return Response(generate(), mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"
+    })
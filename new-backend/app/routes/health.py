@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify
-from ..models import ping_db
+from ..cache import cache_stats
+from ..dashboard_stats import get_stats_snapshot
+from ..middleware import authenticated_required, internal_required
+from ..models import ping_db, pool_stats
 
 
 bp = Blueprint("health", __name__)
@@ -14,3 +17,28 @@ def health():
         return jsonify({"status": "degraded", "error": str(exc)}), 500
 
 
+@bp.get("/health/pool")
+@internal_required
+def health_pool():
+    return jsonify(pool_stats())
+
+
+@bp.get("/health/cache")
+@internal_required
+def health_cache():
+    return jsonify(cache_stats())
+
+
+# Headline counts for signed-in users, served from the shared dashboard
+# snapshot so the home page does not download whole lists to count them.
+@bp.get("/stats")
+@authenticated_required
+def public_stats():
+    try:
+        stats = get_stats_snapshot().get()
+        return jsonify({
+            "opportunities": stats["opportunities"]["active"],
+            "stories": stats["stories"]["total"]
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
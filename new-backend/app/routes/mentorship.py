@@ -1,28 +1,36 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..events import publish
+from ..jobs import enqueue
+from ..middleware import student_required
 from ..models import get_engine
-from sqlalchemy import text
+from ..pagination import KeysetPage
+from ..recommendations import get_mentor_index, profile_features
+from sqlalchemy import bindparam, text
 
 bp = Blueprint("mentorship", __name__)
 
 
 @bp.get("/")
 def list_mentorships():
+    page = KeysetPage(("mr.created_at", "created_at", True), ("mr.id", "id", True))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
+            result = conn.execute(text(f"""
                 SELECT mr.id, mr.subject, mr.message, mr.status, mr.created_at,
                        s.name as student_name, m.name as mentor_name,
                        s.email as student_email, m.email as mentor_email
                 FROM mentorship_requests mr
                 LEFT JOIN users s ON mr.student_id = s.id
                 LEFT JOIN users m ON mr.mentor_id = m.id
-                ORDER BY mr.created_at DESC
-            """))
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
             
             mentorships = []
-            for row in result:
+            for row in page.rows(result):
                 mentorships.append({
                     "id": row.id,
                     "subject": row.subject,
@@ -35,7 +43,74 @@ def list_mentorships():
                     "created_at": row.created_at.isoformat() if row.created_at else None
                 })
             
-            return jsonify(mentorships), 200
+            return page.response(mentorships), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.get("/recommendations")
+@student_required
+def recommend_mentors():
+    current_user = get_jwt_identity()
+    try:
+        limit = max(1, min(int(request.args.get("limit", 10)), 50))
+    except ValueError:
+        limit = 10
+
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT skills, major, company, position FROM users WHERE id = :user_id
+            """), {"user_id": current_user["id"]})
+
+            student = result.fetchone()
+            if not student:
+                return jsonify({"error": "User not found"}), 404
+
+            # Mentors the student is already waiting on or working with
+            result = conn.execute(text("""
+                SELECT mentor_id FROM mentorship_requests
+                WHERE student_id = :user_id AND status IN ('pending', 'accepted')
+            """), {"user_id": current_user["id"]})
+            exclude_ids = {row.mentor_id for row in result}
+
+            features = profile_features(student.skills, student.major, student.company, student.position)
+            # Ask for extra candidates: some may have been deleted or changed
+            # role since this worker's index last synced.
+            ranked = get_mentor_index().recommend(features, exclude_ids, limit * 2)
+            if not ranked:
+                return jsonify([]), 200
+
+            result = conn.execute(text("""
+                SELECT id, name, graduation_year, major, company, position, skills
+                FROM users
+                WHERE id IN :ids AND role = 'alumni'
+            """).bindparams(bindparam("ids", expanding=True)), {"ids": [user_id for user_id, _, _ in ranked]})
+            alumni = {row.id: row for row in result}
+
+            recommendations = []
+            for user_id, score, active_mentees in ranked:
+                row = alumni.get(user_id)
+                if row is None:
+                    continue
+                matched = features.keys() & profile_features(row.skills, row.major, row.company, row.position).keys()
+                recommendations.append({
+                    "id": row.id,
+                    "name": row.name,
+                    "graduation_year": row.graduation_year,
+                    "major": row.major,
+                    "company": row.company,
+                    "position": row.position,
+                    "skills": row.skills,
+                    "score": round(score, 4),
+                    "active_mentees": active_mentees,
+                    "matched_on": sorted(matched)
+                })
+                if len(recommendations) == limit:
+                    break
+
+            return jsonify(recommendations), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -78,7 +153,16 @@ def request_mentorship():
                 "subject": subject,
                 "message": message
             })
+            enqueue(conn, "mentorship_requested", {"request_id": result.lastrowid})
             conn.commit()
+
+            publish(mentor.id, "mentorship", {
+                "id": result.lastrowid,
+                "status": "pending",
+                "student_id": current_user["id"],
+                "student_name": current_user.get("name"),
+                "subject": subject
+            })
             
             return jsonify({
                 "message": "Mentorship request sent successfully",
@@ -104,7 +188,7 @@ def update_mentorship_status(request_id):
         with engine.connect() as conn:
             # Check if user is the mentor for this request
             result = conn.execute(text("""
-                SELECT mentor_id FROM mentorship_requests WHERE id = :request_id
+                SELECT student_id, mentor_id, subject FROM mentorship_requests WHERE id = :request_id
             """), {"request_id": request_id})
             
             request_data = result.fetchone()
@@ -119,6 +203,14 @@ def update_mentorship_status(request_id):
                 UPDATE mentorship_requests SET status = :status WHERE id = :request_id
             """), {"status": new_status, "request_id": request_id})
             conn.commit()
+
+            publish(request_data.student_id, "mentorship", {
+                "id": request_id,
+                "status": new_status,
+                "mentor_id": current_user["id"],
+                "mentor_name": current_user.get("name"),
+                "subject": request_data.subject
+            })
             
             return jsonify({"message": f"Mentorship request {new_status} successfully"}), 200
     except Exception as e:
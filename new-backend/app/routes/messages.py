@@ -1,43 +1,143 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..events import publish
 from ..models import get_engine
-from sqlalchemy import text
+from ..pagination import KeysetPage
+from ..serialization import Columns, Nested
+from sqlalchemy import bindparam, text
 
 bp = Blueprint("messages", __name__)
 
+MAX_BATCH_IDS = 1000
+
+# is_from_me compares against :user_id, so bind it wherever these are selected.
+MESSAGE_COLUMNS = Columns(
+    "t.id", "t.subject", "t.content", "t.is_read", "s.name as sender_name", "r.name as receiver_name",
+    "t.sender_id = :user_id as is_from_me", "t.created_at"
+)
+CONVERSATION_COLUMNS = Columns(
+    "cm.conversation_id as id",
+    Nested("other_user", "u.id as other_user_id", "u.name as other_user_name", "u.role as other_user_role"),
+    "cm.unread_count",
+    Nested("last_message", "cm.last_message_id", "m.subject as last_message_subject",
+           "LEFT(m.content, 200) as last_message_snippet", "m.sender_id = :user_id as last_message_is_from_me",
+           "m.created_at as last_message_created_at")
+)
+CONVERSATION_MESSAGE_COLUMNS = Columns(
+    "id", "sender_id", "receiver_id", "subject", "content", "is_read", "sender_id = :user_id as is_from_me",
+    "created_at"
+)
+
 
 @bp.get("/")
 @jwt_required()
 def list_messages():
+    current_user = get_jwt_identity()
+    page = KeysetPage(("created_at", "created_at", True), ("id", "id", True))
+    engine = get_engine()
+
+    try:
+        with engine.connect() as conn:
+            # Two index range scans (received, sent) instead of one OR that
+            # defeats both (receiver_id, created_at) and (sender_id, created_at).
+            result = conn.execute(text(f"""
+                SELECT {MESSAGE_COLUMNS.select}
+                FROM (
+                    (SELECT id, sender_id, receiver_id, subject, content, is_read, created_at
+                     FROM messages
+                     WHERE receiver_id = :user_id {page.where()}
+                     ORDER BY {page.order_by} LIMIT :page_limit)
+                    UNION ALL
+                    (SELECT id, sender_id, receiver_id, subject, content, is_read, created_at
+                     FROM messages
+                     WHERE sender_id = :user_id AND receiver_id <> :user_id {page.where()}
+                     ORDER BY {page.order_by} LIMIT :page_limit)
+                ) t
+                LEFT JOIN users s ON t.sender_id = s.id
+                LEFT JOIN users r ON t.receiver_id = r.id
+                ORDER BY t.created_at DESC, t.id DESC
+                LIMIT :page_limit
+            """), {**page.params, "user_id": current_user["id"]})
+
+            return page.response(MESSAGE_COLUMNS.dump(page.rows(result))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.get("/conversations")
+@jwt_required()
+def list_conversations():
+    current_user = get_jwt_identity()
+    page = KeysetPage(("cm.last_message_id", "last_message_id", True))
+    engine = get_engine()
+
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text(f"""
+                SELECT {CONVERSATION_COLUMNS.select}
+                FROM conversation_members cm
+                JOIN users u ON cm.other_user_id = u.id
+                LEFT JOIN messages m ON cm.last_message_id = m.id
+                WHERE cm.user_id = :user_id AND cm.last_message_id IS NOT NULL {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "user_id": current_user["id"]})
+
+            return page.response(CONVERSATION_COLUMNS.dump(page.rows(result))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.get("/conversations/<int:conversation_id>")
+@jwt_required()
+def list_conversation_messages(conversation_id):
+    current_user = get_jwt_identity()
+    page = KeysetPage(("id", "id", True))
+    engine = get_engine()
+
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT conversation_id FROM conversation_members
+                WHERE conversation_id = :conversation_id AND user_id = :user_id
+            """), {"conversation_id": conversation_id, "user_id": current_user["id"]})
+
+            if not result.fetchone():
+                return jsonify({"error": "Conversation not found"}), 404
+
+            result = conn.execute(text(f"""
+                SELECT {CONVERSATION_MESSAGE_COLUMNS.select}
+                FROM messages
+                WHERE conversation_id = :conversation_id {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "conversation_id": conversation_id, "user_id": current_user["id"]})
+
+            return page.response(CONVERSATION_MESSAGE_COLUMNS.dump(page.rows(result))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.get("/unread")
+@jwt_required()
+def unread_count():
     current_user = get_jwt_identity()
     engine = get_engine()
-    
+
     try:
         with engine.connect() as conn:
             result = conn.execute(text("""
-                SELECT m.id, m.subject, m.content, m.is_read, m.created_at,
-                       s.name as sender_name, r.name as receiver_name
-                FROM messages m
-                LEFT JOIN users s ON m.sender_id = s.id
-                LEFT JOIN users r ON m.receiver_id = r.id
-                WHERE m.receiver_id = :user_id OR m.sender_id = :user_id
-                ORDER BY m.created_at DESC
+                SELECT COALESCE(SUM(unread_count), 0) as unread,
+                       COALESCE(SUM(unread_count > 0), 0) as unread_conversations
+                FROM conversation_members
+                WHERE user_id = :user_id
             """), {"user_id": current_user["id"]})
-            
-            messages = []
-            for row in result:
-                messages.append({
-                    "id": row.id,
-                    "subject": row.subject,
-                    "content": row.content,
-                    "is_read": row.is_read,
-                    "sender_name": row.sender_name,
-                    "receiver_name": row.receiver_name,
-                    "is_from_me": row.sender_name == current_user["name"],
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
-            
-            return jsonify(messages), 200
+
+            row = result.fetchone()
+            return jsonify({
+                "unread": int(row.unread),
+                "unread_conversations": int(row.unread_conversations)
+            }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -47,14 +147,14 @@ def list_messages():
 def send_message():
     current_user = get_jwt_identity()
     data = request.get_json()
-    
+
     receiver_id = data.get("receiver_id")
     subject = data.get("subject")
     content = data.get("content")
-    
+
     if not receiver_id or not content:
         return jsonify({"error": "Receiver ID and content are required"}), 400
-    
+
     engine = get_engine()
     try:
         with engine.connect() as conn:
@@ -62,26 +162,65 @@ def send_message():
             receiver_result = conn.execute(text("""
                 SELECT id, name FROM users WHERE id = :receiver_id
             """), {"receiver_id": receiver_id})
-            
+
             receiver = receiver_result.fetchone()
             if not receiver:
                 return jsonify({"error": "Receiver not found"}), 404
-            
+
+            # Find or create the thread; LAST_INSERT_ID(id) makes lastrowid
+            # return the existing row's id when the pair already exists.
+            user_low_id, user_high_id = sorted((current_user["id"], receiver.id))
+            result = conn.execute(text("""
+                INSERT INTO conversations (user_low_id, user_high_id)
+                VALUES (:user_low_id, :user_high_id)
+                ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+            """), {"user_low_id": user_low_id, "user_high_id": user_high_id})
+            conversation_id = result.lastrowid
+
             # Send message
             result = conn.execute(text("""
-                INSERT INTO messages (sender_id, receiver_id, subject, content)
-                VALUES (:sender_id, :receiver_id, :subject, :content)
+                INSERT INTO messages (sender_id, receiver_id, subject, content, conversation_id)
+                VALUES (:sender_id, :receiver_id, :subject, :content, :conversation_id)
             """), {
                 "sender_id": current_user["id"],
-                "receiver_id": receiver_id,
+                "receiver_id": receiver.id,
                 "subject": subject,
-                "content": content
+                "content": content,
+                "conversation_id": conversation_id
+            })
+            message_id = result.lastrowid
+
+            conn.execute(text("""
+                UPDATE conversations SET last_message_id = :message_id WHERE id = :conversation_id
+            """), {"message_id": message_id, "conversation_id": conversation_id})
+            conn.execute(text("""
+                INSERT INTO conversation_members (conversation_id, user_id, other_user_id, unread_count, last_message_id)
+                VALUES (:conversation_id, :sender_id, :receiver_id, 0, :message_id),
+                       (:conversation_id, :receiver_id, :sender_id, 1, :message_id)
+                ON DUPLICATE KEY UPDATE
+                    unread_count = unread_count + VALUES(unread_count),
+                    last_message_id = VALUES(last_message_id)
+            """), {
+                "conversation_id": conversation_id,
+                "sender_id": current_user["id"],
+                "receiver_id": receiver.id,
+                "message_id": message_id
             })
             conn.commit()
-            
+
+            publish(receiver.id, "message", {
+                "id": message_id,
+                "conversation_id": conversation_id,
+                "sender_id": current_user["id"],
+                "sender_name": current_user.get("name"),
+                "subject": subject,
+                "snippet": content[:200]
+            })
+
             return jsonify({
                 "message": "Message sent successfully",
-                "id": result.lastrowid,
+                "id": message_id,
+                "conversation_id": conversation_id,
                 "receiver_name": receiver.name
             }), 201
     except Exception as e:
@@ -93,27 +232,111 @@ def send_message():
 def mark_as_read(message_id):
     current_user = get_jwt_identity()
     engine = get_engine()
-    
+
     try:
         with engine.connect() as conn:
             # Check if user is the receiver
             result = conn.execute(text("""
-                SELECT receiver_id FROM messages WHERE id = :message_id
+                SELECT receiver_id, conversation_id FROM messages WHERE id = :message_id
             """), {"message_id": message_id})
-            
+
             message = result.fetchone()
             if not message:
                 return jsonify({"error": "Message not found"}), 404
-            
+
             if message.receiver_id != current_user["id"]:
                 return jsonify({"error": "Unauthorized"}), 403
-            
-            # Mark as read
-            conn.execute(text("""
-                UPDATE messages SET is_read = TRUE WHERE id = :message_id
+
+            # Mark as read; only an unread message counts against the thread
+            result = conn.execute(text("""
+                UPDATE messages SET is_read = TRUE WHERE id = :message_id AND is_read = FALSE
             """), {"message_id": message_id})
+
+            if result.rowcount and message.conversation_id:
+                conn.execute(text("""
+                    UPDATE conversation_members SET unread_count = GREATEST(unread_count - 1, 0)
+                    WHERE conversation_id = :conversation_id AND user_id = :user_id
+                """), {"conversation_id": message.conversation_id, "user_id": current_user["id"]})
             conn.commit()
-            
+
             return jsonify({"message": "Message marked as read"}), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+def _refresh_unread_counts(conn, user_id, conversation_ids):
+    if not conversation_ids:
+        return
+    conn.execute(text("""
+        UPDATE conversation_members cm
+        SET unread_count = (
+            SELECT COUNT(*) FROM messages m
+            WHERE m.receiver_id = cm.user_id AND m.is_read = FALSE AND m.conversation_id = cm.conversation_id
+        )
+        WHERE cm.user_id = :user_id AND cm.conversation_id IN :conversation_ids
+    """).bindparams(bindparam("conversation_ids", expanding=True)), {
+        "user_id": user_id,
+        "conversation_ids": list(conversation_ids)
+    })
+
+
+def _is_id(value):
+    # JSON true/false decode to bool, which is an int subclass.
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+@bp.post("/read")
+@jwt_required()
+def mark_many_as_read():
+    current_user = get_jwt_identity()
+    data = request.get_json() or {}
+
+    ids = data.get("ids")
+    conversation_id = data.get("conversation_id")
+    up_to_id = data.get("up_to_id")
+
+    if ids is not None:
+        if not isinstance(ids, list) or not ids or not all(_is_id(i) for i in ids):
+            return jsonify({"error": "ids must be a non-empty list of message IDs"}), 400
+        if len(ids) > MAX_BATCH_IDS:
+            return jsonify({"error": f"At most {MAX_BATCH_IDS} ids per request"}), 400
+    elif conversation_id is None:
+        return jsonify({"error": "Either ids or conversation_id is required"}), 400
+    elif not _is_id(conversation_id):
+        return jsonify({"error": "conversation_id must be a positive integer"}), 400
+    elif up_to_id is not None and not _is_id(up_to_id):
+        return jsonify({"error": "up_to_id must be a positive integer"}), 400
+
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            # Every statement is scoped to receiver_id, so IDs belonging to
+            # other users are silently ignored rather than updated.
+            if ids is not None:
+                result = conn.execute(text("""
+                    SELECT DISTINCT conversation_id FROM messages
+                    WHERE receiver_id = :user_id AND is_read = FALSE AND id IN :ids
+                """).bindparams(bindparam("ids", expanding=True)), {"user_id": current_user["id"], "ids": ids})
+                conversation_ids = {row.conversation_id for row in result if row.conversation_id}
+
+                result = conn.execute(text("""
+                    UPDATE messages SET is_read = TRUE
+                    WHERE receiver_id = :user_id AND is_read = FALSE AND id IN :ids
+                """).bindparams(bindparam("ids", expanding=True)), {"user_id": current_user["id"], "ids": ids})
+            else:
+                conversation_ids = {conversation_id}
+                up_to_clause = "AND id <= :up_to_id" if up_to_id is not None else ""
+                result = conn.execute(text(f"""
+                    UPDATE messages SET is_read = TRUE
+                    WHERE conversation_id = :conversation_id AND receiver_id = :user_id
+                      AND is_read = FALSE {up_to_clause}
+                """), {"conversation_id": conversation_id, "user_id": current_user["id"], "up_to_id": up_to_id})
+
+            updated = result.rowcount
+            if updated:
+                _refresh_unread_counts(conn, current_user["id"], conversation_ids)
+            conn.commit()
+
+            return jsonify({"message": "Messages marked as read", "updated": updated}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,12 @@
+from flask import Blueprint, Response
+from ..metrics import render_metrics
+from ..middleware import internal_required
+
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.get("/metrics")
+@internal_required
+def metrics():
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
@@ -1,43 +1,86 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import cached, invalidate
+from ..conditional import conditional
 from ..models import get_engine
-from ..middleware import alumni_required, admin_required
+from ..pagination import KeysetPage
+from ..serialization import Columns, excerpt, project
+from ..middleware import alumni_required, admin_required, student_required
+from ..opportunity_feed import get_opportunity_index
 from sqlalchemy import text
 
 bp = Blueprint("opportunities", __name__)
 
+LIST_COLUMNS = Columns(
+    "o.id", "o.title", "o.company", "o.description", "o.requirements",
+    "o.location", "o.salary_range", "o.type", "u.name as posted_by_name", "o.created_at"
+)
+SUMMARY_COLUMNS = Columns(
+    "o.id", "o.title", "o.company", excerpt("o.description"),
+    "o.location", "o.type", "u.name as posted_by_name", "o.created_at"
+)
+DETAIL_COLUMNS = Columns(
+    "o.id", "o.title", "o.company", "o.description", "o.requirements",
+    "o.location", "o.salary_range", "o.type", "o.posted_by",
+    "u.name as posted_by_name", "u.email as posted_by_email", "o.created_at"
+)
+
 
 @bp.get("/")
+@conditional()
+@cached("opportunities", "users")
 def list_opportunities():
+    page = KeysetPage(("o.created_at", "created_at", True), ("o.id", "id", True))
+    columns = project(LIST_COLUMNS, SUMMARY_COLUMNS)
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT o.id, o.title, o.company, o.description, o.requirements, 
-                       o.location, o.salary_range, o.type, o.created_at,
-                       u.name as posted_by_name
+            result = conn.execute(text(f"""
+                SELECT {columns.select_with("o.created_at", "o.id")}
                 FROM opportunities o
                 LEFT JOIN users u ON o.posted_by = u.id
                 WHERE o.is_active = TRUE
-                ORDER BY o.created_at DESC
-            """))
-            
-            opportunities = []
-            for row in result:
-                opportunities.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "company": row.company,
-                    "description": row.description,
-                    "requirements": row.requirements,
-                    "location": row.location,
-                    "salary_range": row.salary_range,
-                    "type": row.type,
-                    "posted_by_name": row.posted_by_name,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
-            
-            return jsonify(opportunities), 200
+                {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "excerpt_chars": current_app.config["SUMMARY_EXCERPT_CHARS"]})
+
+            return page.response(columns.dump(page.rows(result))), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.get("/feed")
+@student_required
+@cached("opportunities", "users", per_user=True)
+def opportunity_feed():
+    current_user = get_jwt_identity()
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+    except ValueError:
+        limit = 20
+
+    engine = get_engine()
+    try:
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT skills, major FROM users WHERE id = :user_id
+            """), {"user_id": current_user["id"]})
+
+            profile = result.fetchone()
+            if not profile:
+                return jsonify({"error": "User not found"}), 404
+
+            result = conn.execute(text("""
+                SELECT opportunity_id FROM applications
+                WHERE applicant_id = :user_id AND opportunity_id IS NOT NULL
+            """), {"user_id": current_user["id"]})
+            applied_ids = [row.opportunity_id for row in result]
+
+        profile_text = " ".join(filter(None, (profile.skills, profile.major)))
+        feed = get_opportunity_index().feed(profile_text, applied_ids, limit, fresh=True)
+
+        return jsonify([{**item, "score": round(score, 4)} for item, score in feed]), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -67,21 +110,36 @@ def create_opportunity():
                 "posted_by": current_user["id"]
             })
             conn.commit()
+            invalidate("opportunities")
+            get_opportunity_index().mark_stale()
             
             return jsonify({"message": "Opportunity created successfully", "id": result.lastrowid}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _opportunity_version(opportunity_id):
+    engine = get_engine()
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT UNIX_TIMESTAMP(o.updated_at) as updated, UNIX_TIMESTAMP(u.updated_at) as poster_updated
+            FROM opportunities o
+            LEFT JOIN users u ON o.posted_by = u.id
+            WHERE o.id = :opportunity_id AND o.is_active = TRUE
+        """), {"opportunity_id": opportunity_id}).fetchone()
+    if row is None:
+        return None
+    return (row.updated, row.poster_updated), max(filter(None, (row.updated, row.poster_updated)), default=None)
+
+
 @bp.get("/<int:opportunity_id>")
+@conditional(_opportunity_version)
 def get_opportunity(opportunity_id):
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT o.id, o.title, o.company, o.description, o.requirements,
-                       o.location, o.salary_range, o.type, o.created_at, o.posted_by,
-                       u.name as posted_by_name, u.email as posted_by_email
+            result = conn.execute(text(f"""
+                SELECT {DETAIL_COLUMNS.select}
                 FROM opportunities o
                 LEFT JOIN users u ON o.posted_by = u.id
                 WHERE o.id = :opportunity_id AND o.is_active = TRUE
@@ -91,20 +149,7 @@ def get_opportunity(opportunity_id):
             if not opportunity:
                 return jsonify({"error": "Opportunity not found"}), 404
 
-            return jsonify({
-                "id": opportunity.id,
-                "title": opportunity.title,
-                "company": opportunity.company,
-                "description": opportunity.description,
-                "requirements": opportunity.requirements,
-                "location": opportunity.location,
-                "salary_range": opportunity.salary_range,
-                "type": opportunity.type,
-                "posted_by": opportunity.posted_by,
-                "posted_by_name": opportunity.posted_by_name,
-                "posted_by_email": opportunity.posted_by_email,
-                "created_at": opportunity.created_at.isoformat() if opportunity.created_at else None
-            }), 200
+            return jsonify(DETAIL_COLUMNS.dump_one(opportunity)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -146,6 +191,8 @@ def update_opportunity(opportunity_id):
                 "type": data.get("type")
             })
             conn.commit()
+            invalidate("opportunities")
+            get_opportunity_index().mark_stale()
 
             return jsonify({"message": "Opportunity updated successfully"}), 200
     except Exception as e:
@@ -175,6 +222,8 @@ def delete_opportunity(opportunity_id):
                 UPDATE opportunities SET is_active = FALSE WHERE id = :opportunity_id
             """), {"opportunity_id": opportunity_id})
             conn.commit()
+            invalidate("opportunities")
+            get_opportunity_index().mark_stale()
 
             return jsonify({"message": "Opportunity deleted successfully"}), 200
     except Exception as e:
@@ -1,44 +1,60 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import cached, invalidate
+from ..conditional import conditional
+from ..eligibility import get_eligibility_index
+from ..jobs import enqueue
 from ..models import get_engine
+from ..pagination import KeysetPage
+from ..serialization import Columns
 from ..middleware import alumni_required, student_required, authenticated_required
 from sqlalchemy import text
 
 bp = Blueprint("scholarships", __name__)
 
+LIST_COLUMNS = Columns(
+    "s.id", "s.title", "s.description", "s.eligibility_criteria",
+    "s.cgpa_requirement", "s.category_requirement", "s.major_requirement", "s.amount", "s.deadline",
+    "s.status", "u.name as created_by_name", "s.created_at"
+)
+DETAIL_COLUMNS = Columns(
+    "s.id", "s.title", "s.description", "s.eligibility_criteria",
+    "s.cgpa_requirement", "s.category_requirement", "s.major_requirement", "s.amount", "s.deadline",
+    "s.status", "s.created_by", "u.name as created_by_name", "u.email as created_by_email", "s.created_at"
+)
+APPLICANT_COLUMNS = Columns(
+    "sa.id", "sa.student_id", "u.name as student_name", "u.email as student_email", "u.cgpa as student_cgpa",
+    "u.category as student_category", "u.major as student_major", "sa.application_date", "sa.status",
+    "sa.cover_letter", "sa.additional_info"
+)
+MY_APPLICATION_COLUMNS = Columns(
+    "sa.id", "sa.scholarship_id", "s.title as scholarship_title", "s.amount as scholarship_amount",
+    "s.deadline as scholarship_deadline", "s.status as scholarship_status", "sa.application_date", "sa.status"
+)
+
 
 @bp.get("/")
+@conditional()
+@cached("scholarships", "users")
 def list_scholarships():
+    # Open-ended scholarships last. no_deadline is a generated column, so
+    # idx_scholarships_status_no_deadline returns rows in this order.
+    page = KeysetPage(("s.no_deadline", "no_deadline", False), ("s.deadline", "deadline", False),
+                      ("s.id", "id", False))
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.description, s.eligibility_criteria,
-                       s.cgpa_requirement, s.category_requirement, s.amount, s.deadline,
-                       s.status, s.created_at, u.name as created_by_name
+            result = conn.execute(text(f"""
+                SELECT {LIST_COLUMNS.select_with("s.no_deadline")}
                 FROM scholarships s
                 LEFT JOIN users u ON s.created_by = u.id
-                WHERE s.status = 'active'
-                ORDER BY s.deadline ASC
-            """))
-
-            scholarships = []
-            for row in result:
-                scholarships.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "description": row.description,
-                    "eligibility_criteria": row.eligibility_criteria,
-                    "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
-                    "category_requirement": row.category_requirement,
-                    "amount": float(row.amount) if row.amount else None,
-                    "deadline": row.deadline.isoformat() if row.deadline else None,
-                    "status": row.status,
-                    "created_by_name": row.created_by_name,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
-
-            return jsonify(scholarships), 200
+                WHERE s.status = 'active' AND (s.deadline IS NULL OR s.deadline >= CURDATE())
+                {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), page.params)
+
+            return page.response(LIST_COLUMNS.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -52,45 +68,17 @@ def get_eligible_scholarships():
     try:
         with engine.connect() as conn:
             result = conn.execute(text("""
-                SELECT cgpa, category FROM users WHERE id = :user_id
+                SELECT cgpa, category, major FROM users WHERE id = :user_id
             """), {"user_id": current_user["id"]})
 
             user_data = result.fetchone()
             if not user_data:
                 return jsonify({"error": "User not found"}), 404
 
-            user_cgpa = user_data.cgpa if user_data.cgpa else 0.0
-            user_category = user_data.category
+        user_cgpa = float(user_data.cgpa) if user_data.cgpa else 0.0
+        scholarships = get_eligibility_index().eligible(user_cgpa, user_data.category, user_data.major)
 
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.description, s.eligibility_criteria,
-                       s.cgpa_requirement, s.category_requirement, s.amount, s.deadline,
-                       s.status, s.created_at, u.name as created_by_name
-                FROM scholarships s
-                LEFT JOIN users u ON s.created_by = u.id
-                WHERE s.status = 'active'
-                  AND (s.cgpa_requirement IS NULL OR s.cgpa_requirement <= :user_cgpa)
-                  AND (s.category_requirement IS NULL OR s.category_requirement = :user_category)
-                ORDER BY s.deadline ASC
-            """), {"user_cgpa": user_cgpa, "user_category": user_category})
-
-            scholarships = []
-            for row in result:
-                scholarships.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "description": row.description,
-                    "eligibility_criteria": row.eligibility_criteria,
-                    "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
-                    "category_requirement": row.category_requirement,
-                    "amount": float(row.amount) if row.amount else None,
-                    "deadline": row.deadline.isoformat() if row.deadline else None,
-                    "status": row.status,
-                    "created_by_name": row.created_by_name,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
-
-            return jsonify(scholarships), 200
+        return jsonify(scholarships), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -109,10 +97,10 @@ def create_scholarship():
         with engine.connect() as conn:
             result = conn.execute(text("""
                 INSERT INTO scholarships (title, description, eligibility_criteria,
-                                        cgpa_requirement, category_requirement, amount,
-                                        deadline, created_by, status)
+                                        cgpa_requirement, category_requirement, major_requirement,
+                                        amount, deadline, created_by, status)
                 VALUES (:title, :description, :eligibility_criteria,
-                       :cgpa_requirement, :category_requirement, :amount,
+                       :cgpa_requirement, :category_requirement, :major_requirement, :amount,
                        :deadline, :created_by, :status)
             """), {
                 "title": data["title"],
@@ -120,28 +108,44 @@ def create_scholarship():
                 "eligibility_criteria": data.get("eligibility_criteria"),
                 "cgpa_requirement": data.get("cgpa_requirement"),
                 "category_requirement": data.get("category_requirement"),
+                "major_requirement": data.get("major_requirement"),
                 "amount": data["amount"],
                 "deadline": data.get("deadline"),
                 "created_by": current_user["id"],
                 "status": data.get("status", "active")
             })
             conn.commit()
+            invalidate("scholarships")
+            get_eligibility_index().refresh(result.lastrowid)
 
             return jsonify({"message": "Scholarship created successfully", "id": result.lastrowid}), 201
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+def _scholarship_version(scholarship_id):
+    engine = get_engine()
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT UNIX_TIMESTAMP(s.updated_at) as updated, UNIX_TIMESTAMP(u.updated_at) as creator_updated
+            FROM scholarships s
+            LEFT JOIN users u ON s.created_by = u.id
+            WHERE s.id = :scholarship_id
+        """), {"scholarship_id": scholarship_id}).fetchone()
+    if row is None:
+        return None
+    return (row.updated, row.creator_updated), max(filter(None, (row.updated, row.creator_updated)), default=None)
+
+
 @bp.get("/<int:scholarship_id>")
+@conditional(_scholarship_version)
+@cached("scholarships", "users")
 def get_scholarship(scholarship_id):
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.description, s.eligibility_criteria,
-                       s.cgpa_requirement, s.category_requirement, s.amount, s.deadline,
-                       s.status, s.created_by, s.created_at,
-                       u.name as created_by_name, u.email as created_by_email
+            result = conn.execute(text(f"""
+                SELECT {DETAIL_COLUMNS.select}
                 FROM scholarships s
                 LEFT JOIN users u ON s.created_by = u.id
                 WHERE s.id = :scholarship_id
@@ -151,21 +155,7 @@ def get_scholarship(scholarship_id):
             if not scholarship:
                 return jsonify({"error": "Scholarship not found"}), 404
 
-            return jsonify({
-                "id": scholarship.id,
-                "title": scholarship.title,
-                "description": scholarship.description,
-                "eligibility_criteria": scholarship.eligibility_criteria,
-                "cgpa_requirement": float(scholarship.cgpa_requirement) if scholarship.cgpa_requirement else None,
-                "category_requirement": scholarship.category_requirement,
-                "amount": float(scholarship.amount) if scholarship.amount else None,
-                "deadline": scholarship.deadline.isoformat() if scholarship.deadline else None,
-                "status": scholarship.status,
-                "created_by": scholarship.created_by,
-                "created_by_name": scholarship.created_by_name,
-                "created_by_email": scholarship.created_by_email,
-                "created_at": scholarship.created_at.isoformat() if scholarship.created_at else None
-            }), 200
+            return jsonify(DETAIL_COLUMNS.dump_one(scholarship)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -196,6 +186,7 @@ def update_scholarship(scholarship_id):
                     eligibility_criteria = :eligibility_criteria,
                     cgpa_requirement = :cgpa_requirement,
                     category_requirement = :category_requirement,
+                    major_requirement = :major_requirement,
                     amount = :amount, deadline = :deadline, status = :status
                 WHERE id = :scholarship_id
             """), {
@@ -205,11 +196,14 @@ def update_scholarship(scholarship_id):
                 "eligibility_criteria": data.get("eligibility_criteria"),
                 "cgpa_requirement": data.get("cgpa_requirement"),
                 "category_requirement": data.get("category_requirement"),
+                "major_requirement": data.get("major_requirement"),
                 "amount": data.get("amount"),
                 "deadline": data.get("deadline"),
                 "status": data.get("status", "active")
             })
             conn.commit()
+            invalidate("scholarships")
+            get_eligibility_index().refresh(scholarship_id)
 
             return jsonify({"message": "Scholarship updated successfully"}), 200
     except Exception as e:
@@ -239,6 +233,8 @@ def delete_scholarship(scholarship_id):
                 UPDATE scholarships SET status = 'inactive' WHERE id = :scholarship_id
             """), {"scholarship_id": scholarship_id})
             conn.commit()
+            invalidate("scholarships")
+            get_eligibility_index().refresh(scholarship_id)
 
             return jsonify({"message": "Scholarship deleted successfully"}), 200
     except Exception as e:
@@ -255,11 +251,12 @@ def apply_for_scholarship(scholarship_id):
     try:
         with engine.connect() as conn:
             result = conn.execute(text("""
-                SELECT id FROM scholarships WHERE id = :scholarship_id AND status = 'active'
+                SELECT id FROM scholarships
+                WHERE id = :scholarship_id AND status = 'active' AND (deadline IS NULL OR deadline >= CURDATE())
             """), {"scholarship_id": scholarship_id})
 
             if not result.fetchone():
-                return jsonify({"error": "Scholarship not found or inactive"}), 404
+                return jsonify({"error": "Scholarship not found, inactive or past its deadline"}), 404
 
             result = conn.execute(text("""
                 SELECT id FROM scholarship_applications
@@ -269,7 +266,7 @@ def apply_for_scholarship(scholarship_id):
             if result.fetchone():
                 return jsonify({"error": "You have already applied for this scholarship"}), 400
 
-            conn.execute(text("""
+            result = conn.execute(text("""
                 INSERT INTO scholarship_applications (student_id, scholarship_id, cover_letter, additional_info)
                 VALUES (:student_id, :scholarship_id, :cover_letter, :additional_info)
             """), {
@@ -278,6 +275,7 @@ def apply_for_scholarship(scholarship_id):
                 "cover_letter": data.get("cover_letter"),
                 "additional_info": data.get("additional_info")
             })
+            enqueue(conn, "scholarship_application_submitted", {"application_id": result.lastrowid})
             conn.commit()
 
             return jsonify({"message": "Application submitted successfully"}), 201
@@ -304,33 +302,15 @@ def get_scholarship_applications(scholarship_id):
             if scholarship.created_by != current_user["id"] and current_user["role"] != "admin":
                 return jsonify({"error": "Access denied"}), 403
 
-            result = conn.execute(text("""
-                SELECT sa.id, sa.student_id, sa.application_date, sa.status,
-                       sa.cover_letter, sa.additional_info,
-                       u.name, u.email, u.cgpa, u.category, u.major
+            result = conn.execute(text(f"""
+                SELECT {APPLICANT_COLUMNS.select}
                 FROM scholarship_applications sa
                 JOIN users u ON sa.student_id = u.id
                 WHERE sa.scholarship_id = :scholarship_id
                 ORDER BY sa.application_date DESC
             """), {"scholarship_id": scholarship_id})
 
-            applications = []
-            for row in result:
-                applications.append({
-                    "id": row.id,
-                    "student_id": row.student_id,
-                    "student_name": row.name,
-                    "student_email": row.email,
-                    "student_cgpa": float(row.cgpa) if row.cgpa else None,
-                    "student_category": row.category,
-                    "student_major": row.major,
-                    "application_date": row.application_date.isoformat() if row.application_date else None,
-                    "status": row.status,
-                    "cover_letter": row.cover_letter,
-                    "additional_info": row.additional_info
-                })
-
-            return jsonify(applications), 200
+            return jsonify(APPLICANT_COLUMNS.dump(result)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -343,29 +323,15 @@ def get_my_applications():
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT sa.id, sa.scholarship_id, sa.application_date, sa.status,
-                       s.title, s.amount, s.deadline, s.status as scholarship_status
+            result = conn.execute(text(f"""
+                SELECT {MY_APPLICATION_COLUMNS.select}
                 FROM scholarship_applications sa
                 JOIN scholarships s ON sa.scholarship_id = s.id
                 WHERE sa.student_id = :student_id
                 ORDER BY sa.application_date DESC
             """), {"student_id": current_user["id"]})
 
-            applications = []
-            for row in result:
-                applications.append({
-                    "id": row.id,
-                    "scholarship_id": row.scholarship_id,
-                    "scholarship_title": row.title,
-                    "scholarship_amount": float(row.amount) if row.amount else None,
-                    "scholarship_deadline": row.deadline.isoformat() if row.deadline else None,
-                    "scholarship_status": row.scholarship_status,
-                    "application_date": row.application_date.isoformat() if row.application_date else None,
-                    "status": row.status
-                })
-
-            return jsonify(applications), 200
+            return jsonify(MY_APPLICATION_COLUMNS.dump(result)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -404,6 +370,8 @@ def update_application_status(application_id):
                 SET status = :status
                 WHERE id = :application_id
             """), {"application_id": application_id, "status": data["status"]})
+            enqueue(conn, "scholarship_application_status_changed",
+                    {"application_id": application_id, "status": data["status"]})
             conn.commit()
 
             return jsonify({"message": "Application status updated successfully"}), 200
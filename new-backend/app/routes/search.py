@@ -1,9 +1,54 @@
 from flask import Blueprint, jsonify, request
 from ..models import get_engine
+from ..search_index import boolean_query, match_expression
 from sqlalchemy import text
 
 bp = Blueprint("search", __name__)
 
+DEFAULT_PER_TYPE = 10
+MAX_PER_TYPE = 50
+
+# Each source selects the same column list so the branches can be combined
+# with UNION ALL. {score} and {condition} are filled in per request.
+SEARCH_SOURCES = {
+    "student": ("users", "name", """
+        SELECT 'student' as type, id, name as title, bio as description,
+               major, NULL as company, cgpa, NULL as cgpa_requirement, {score} as score
+        FROM users
+        WHERE role = 'student' AND {condition}
+    """),
+    "alumni": ("users", "name", """
+        SELECT 'alumni' as type, id, name as title, bio as description,
+               NULL as major, company, NULL as cgpa, NULL as cgpa_requirement, {score} as score
+        FROM users
+        WHERE role = 'alumni' AND {condition}
+    """),
+    "opportunity": ("opportunities", "title", """
+        SELECT 'opportunity' as type, id, title, description,
+               NULL as major, company, NULL as cgpa, NULL as cgpa_requirement, {score} as score
+        FROM opportunities
+        WHERE is_active = TRUE AND {condition}
+    """),
+    "mentorship": ("mentorship_requests", "subject", """
+        SELECT 'mentorship' as type, id, subject as title, message as description,
+               NULL as major, NULL as company, NULL as cgpa, NULL as cgpa_requirement, {score} as score
+        FROM mentorship_requests
+        WHERE {condition}
+    """),
+    "scholarship": ("scholarships", "title", """
+        SELECT 'scholarship' as type, id, title, description,
+               NULL as major, NULL as company, NULL as cgpa, cgpa_requirement, {score} as score
+        FROM scholarships
+        WHERE status = 'active' AND {condition}
+    """),
+}
+
+
+# LIKE pattern matching titles that start with `query` literally: the
+# wildcards % and _ and the escape character itself are escaped.
+def _like_prefix(query):
+    return query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
 
 @bp.get("/")
 def unified_search():
@@ -12,42 +57,40 @@ def unified_search():
     if not query or len(query) < 2:
         return jsonify({"error": "Search query must be at least 2 characters"}), 400
 
+    types = request.args.get("types")
+    if types:
+        types = [t for t in types.split(",") if t in SEARCH_SOURCES]
+        if not types:
+            return jsonify({"error": f"types must be any of: {', '.join(SEARCH_SOURCES)}"}), 400
+    else:
+        types = list(SEARCH_SOURCES)
+
+    try:
+        per_type = int(request.args.get("limit", DEFAULT_PER_TYPE))
+    except ValueError:
+        per_type = DEFAULT_PER_TYPE
+    per_type = max(1, min(per_type, MAX_PER_TYPE))
+
+    terms = boolean_query(query)
+    branches = []
+    for search_type in types:
+        table, title_column, sql = SEARCH_SOURCES[search_type]
+        if terms:
+            match = f"{match_expression(table)} AGAINST (:terms IN BOOLEAN MODE)"
+            sql = sql.format(score=match, condition=match)
+        else:
+            # Too short for the FULLTEXT index; fall back to an indexable prefix match.
+            sql = sql.format(score="0", condition=f"{title_column} LIKE :prefix ESCAPE '\\\\'")
+        branches.append(f"({sql} ORDER BY score DESC LIMIT :per_type)")
+
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            search_term = f"%{query}%"
-
-            result = conn.execute(text("""
-                SELECT 'student' as type, id, name as title, bio as description, major, cgpa
-                FROM users
-                WHERE role = 'student' AND (name LIKE :search_term OR major LIKE :search_term OR bio LIKE :search_term)
-
-                UNION
-
-                SELECT 'alumni' as type, id, name as title, bio as description, company, NULL
-                FROM users
-                WHERE role = 'alumni' AND (name LIKE :search_term OR company LIKE :search_term OR position LIKE :search_term OR bio LIKE :search_term)
-
-                UNION
-
-                SELECT 'opportunity' as type, id, title, description, company, NULL
-                FROM opportunities
-                WHERE is_active = TRUE AND (title LIKE :search_term OR company LIKE :search_term OR description LIKE :search_term OR requirements LIKE :search_term)
-
-                UNION
-
-                SELECT 'mentorship' as type, id, subject as title, message as description, NULL, NULL
-                FROM mentorship_requests
-                WHERE subject LIKE :search_term OR message LIKE :search_term
-
-                UNION
-
-                SELECT 'scholarship' as type, id, title, description, NULL, cgpa_requirement
-                FROM scholarships
-                WHERE status = 'active' AND (title LIKE :search_term OR description LIKE :search_term OR eligibility_criteria LIKE :search_term)
-
-                LIMIT 50
-            """), {"search_term": search_term})
+            result = conn.execute(text(" UNION ALL ".join(branches) + " ORDER BY score DESC"), {
+                "terms": terms,
+                "prefix": _like_prefix(query),
+                "per_type": per_type
+            })
 
             results = []
             for row in result:
@@ -55,7 +98,8 @@ def unified_search():
                     "type": row.type,
                     "id": row.id,
                     "title": row.title,
-                    "description": row.description[:200] if row.description else None
+                    "description": row.description[:200] if row.description else None,
+                    "score": float(row.score)
                 }
 
                 if row.type == "student":
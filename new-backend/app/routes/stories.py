@@ -1,38 +1,47 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import cached, invalidate
+from ..conditional import conditional
 from ..models import get_engine
+from ..pagination import KeysetPage
+from ..serialization import Columns, excerpt, project
 from sqlalchemy import text
 
 bp = Blueprint("stories", __name__)
 
+LIST_COLUMNS = Columns(
+    "s.id", "s.title", "s.content", "s.category", "s.is_featured",
+    "u.name as author_name", "u.role as author_role", "s.created_at"
+)
+SUMMARY_COLUMNS = Columns(
+    "s.id", "s.title", excerpt("s.content"), "s.category", "s.is_featured",
+    "u.name as author_name", "u.role as author_role", "s.created_at"
+)
+DETAIL_COLUMNS = Columns(
+    "s.id", "s.title", "s.content", "s.category", "s.is_featured",
+    "u.name as author_name", "u.role as author_role", "u.bio as author_bio", "s.created_at"
+)
+
 
 @bp.get("/")
+@conditional()
+@cached("stories", "users")
 def list_stories():
+    page = KeysetPage(("s.is_featured", "is_featured", True), ("s.created_at", "created_at", True), ("s.id", "id", True))
+    columns = project(LIST_COLUMNS, SUMMARY_COLUMNS)
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.content, s.category, s.is_featured, s.created_at,
-                       u.name as author_name, u.role as author_role
+            result = conn.execute(text(f"""
+                SELECT {columns.select_with("s.is_featured", "s.created_at", "s.id")}
                 FROM stories s
                 LEFT JOIN users u ON s.author_id = u.id
-                ORDER BY s.is_featured DESC, s.created_at DESC
-            """))
-            
-            stories = []
-            for row in result:
-                stories.append({
-                    "id": row.id,
-                    "title": row.title,
-                    "content": row.content,
-                    "category": row.category,
-                    "is_featured": row.is_featured,
-                    "author_name": row.author_name,
-                    "author_role": row.author_role,
-                    "created_at": row.created_at.isoformat() if row.created_at else None
-                })
-            
-            return jsonify(stories), 200
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "excerpt_chars": current_app.config["SUMMARY_EXCERPT_CHARS"]})
+
+            return page.response(columns.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -63,6 +72,7 @@ def create_story():
                 "category": category
             })
             conn.commit()
+            invalidate("stories")
             
             return jsonify({
                 "message": "Story created successfully",
@@ -73,13 +83,13 @@ def create_story():
 
 
 @bp.get("/<int:story_id>")
+@conditional()
 def get_story(story_id):
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT s.id, s.title, s.content, s.category, s.is_featured, s.created_at,
-                       u.name as author_name, u.role as author_role, u.bio as author_bio
+            result = conn.execute(text(f"""
+                SELECT {DETAIL_COLUMNS.select}
                 FROM stories s
                 LEFT JOIN users u ON s.author_id = u.id
                 WHERE s.id = :story_id
@@ -89,17 +99,7 @@ def get_story(story_id):
             if not story:
                 return jsonify({"error": "Story not found"}), 404
             
-            return jsonify({
-                "id": story.id,
-                "title": story.title,
-                "content": story.content,
-                "category": story.category,
-                "is_featured": story.is_featured,
-                "author_name": story.author_name,
-                "author_role": story.author_role,
-                "author_bio": story.author_bio,
-                "created_at": story.created_at.isoformat() if story.created_at else None
-            }), 200
+            return jsonify(DETAIL_COLUMNS.dump_one(story)), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -1,103 +1,117 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from ..cache import cached, invalidate
+from ..conditional import conditional
 from ..models import get_engine
+from ..pagination import KeysetPage
+from ..recommendations import get_mentor_index
+from ..serialization import Columns, excerpt, project
 from sqlalchemy import text
 
 bp = Blueprint("users", __name__)
 
+USER_COLUMNS = Columns("id", "name", "role", "graduation_year", "major", "company", "position", "bio", "skills")
+ALUMNI_COLUMNS = Columns("id", "name", "graduation_year", "major", "company", "position", "bio", "skills")
+STUDENT_COLUMNS = Columns("id", "name", "graduation_year", "major", "bio", "skills")
+USER_SUMMARY_COLUMNS = Columns("id", "name", "role", "graduation_year", "major", "company", "position", excerpt("bio"))
+ALUMNI_SUMMARY_COLUMNS = Columns("id", "name", "graduation_year", "major", "company", "position", excerpt("bio"))
+STUDENT_SUMMARY_COLUMNS = Columns("id", "name", "graduation_year", "major", excerpt("bio"))
+
 
 @bp.get("/")
+@conditional()
 def list_users():
+    page = KeysetPage(("name", "name", False), ("id", "id", False))
+    columns = project(USER_COLUMNS, USER_SUMMARY_COLUMNS)
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT id, name, role, graduation_year, major, company, position, bio, skills
-                FROM users ORDER BY name
-            """))
-            
-            users = []
-            for row in result:
-                users.append({
-                    "id": row.id,
-                    "name": row.name,
-                    "role": row.role,
-                    "graduation_year": row.graduation_year,
-                    "major": row.major,
-                    "company": row.company,
-                    "position": row.position,
-                    "bio": row.bio,
-                    "skills": row.skills
-                })
-            
-            return jsonify(users), 200
+            result = conn.execute(text(f"""
+                SELECT {columns.select_with("name", "id")}
+                FROM users
+                {page.where("WHERE")}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "excerpt_chars": current_app.config["SUMMARY_EXCERPT_CHARS"]})
+
+            return page.response(columns.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bp.get("/alumni")
+@conditional()
+@cached("users")
 def list_alumni():
+    page = KeysetPage(("name", "name", False), ("id", "id", False))
+    columns = project(ALUMNI_COLUMNS, ALUMNI_SUMMARY_COLUMNS)
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT id, name, graduation_year, major, company, position, bio, skills
-                FROM users WHERE role = 'alumni' ORDER BY name
-            """))
-            
-            alumni = []
-            for row in result:
-                alumni.append({
-                    "id": row.id,
-                    "name": row.name,
-                    "graduation_year": row.graduation_year,
-                    "major": row.major,
-                    "company": row.company,
-                    "position": row.position,
-                    "bio": row.bio,
-                    "skills": row.skills
-                })
-            
-            return jsonify(alumni), 200
+            result = conn.execute(text(f"""
+                SELECT {columns.select_with("name", "id")}
+                FROM users
+                WHERE role = 'alumni' {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "excerpt_chars": current_app.config["SUMMARY_EXCERPT_CHARS"]})
+
+            return page.response(columns.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bp.get("/students")
+@conditional()
 def list_students():
+    page = KeysetPage(("name", "name", False), ("id", "id", False))
+    columns = project(STUDENT_COLUMNS, STUDENT_SUMMARY_COLUMNS)
     engine = get_engine()
     try:
         with engine.connect() as conn:
-            result = conn.execute(text("""
-                SELECT id, name, graduation_year, major, bio, skills
-                FROM users WHERE role = 'student' ORDER BY name
-            """))
-            
-            students = []
-            for row in result:
-                students.append({
-                    "id": row.id,
-                    "name": row.name,
-                    "graduation_year": row.graduation_year,
-                    "major": row.major,
-                    "bio": row.bio,
-                    "skills": row.skills
-                })
-            
-            return jsonify(students), 200
+            result = conn.execute(text(f"""
+                SELECT {columns.select_with("name", "id")}
+                FROM users
+                WHERE role = 'student' {page.where()}
+                ORDER BY {page.order_by}
+                LIMIT :page_limit
+            """), {**page.params, "excerpt_chars": current_app.config["SUMMARY_EXCERPT_CHARS"]})
+
+            return page.response(columns.dump(page.rows(result))), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bp.get("/<int:user_id>")
+@conditional()
 def get_user(user_id):
     engine = get_engine()
     try:
         with engine.connect() as conn:
+            # Role-specific stats ride along as scalar subqueries; CASE only
+            # evaluates the branch that matches the user's role.
             result = conn.execute(text("""
-                SELECT id, name, email, role, graduation_year, major, company, position,
-                       bio, skills, cgpa, category, phone, email_verified, created_at
-                FROM users WHERE id = :user_id
+                SELECT u.id, u.name, u.email, u.role, u.graduation_year, u.major, u.company, u.position,
+                       u.bio, u.skills, u.cgpa, u.category, u.phone, u.email_verified, u.created_at,
+                       CASE WHEN u.role = 'student' THEN
+                           (SELECT COUNT(*) FROM scholarship_applications WHERE student_id = u.id)
+                       END as scholarship_applications_count,
+                       CASE WHEN u.role = 'student' THEN
+                           (SELECT COUNT(*) FROM applications WHERE applicant_id = u.id)
+                       END as job_applications_count,
+                       CASE WHEN u.role = 'student' THEN
+                           (SELECT COUNT(*) FROM mentorship_requests WHERE student_id = u.id)
+                       END as mentorship_requests_count,
+                       CASE WHEN u.role = 'alumni' THEN
+                           (SELECT COUNT(*) FROM opportunities WHERE posted_by = u.id AND is_active = TRUE)
+                       END as active_opportunities_count,
+                       CASE WHEN u.role = 'alumni' THEN
+                           (SELECT COUNT(*) FROM scholarships WHERE created_by = u.id AND status = 'active')
+                       END as active_scholarships_count,
+                       CASE WHEN u.role = 'alumni' THEN
+                           (SELECT COUNT(*) FROM mentorship_requests WHERE mentor_id = u.id AND status = 'accepted')
+                       END as mentorship_count
+                FROM users u WHERE u.id = :user_id
             """), {"user_id": user_id})
 
             user = result.fetchone()
@@ -123,36 +137,14 @@ def get_user(user_id):
             }
 
             if user.role == "student":
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM scholarship_applications WHERE student_id = :user_id
-                """), {"user_id": user_id})
-                user_data["scholarship_applications_count"] = result.fetchone().count
-
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM applications WHERE applicant_id = :user_id
-                """), {"user_id": user_id})
-                user_data["job_applications_count"] = result.fetchone().count
-
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM mentorship_requests WHERE student_id = :user_id
-                """), {"user_id": user_id})
-                user_data["mentorship_requests_count"] = result.fetchone().count
+                user_data["scholarship_applications_count"] = user.scholarship_applications_count
+                user_data["job_applications_count"] = user.job_applications_count
+                user_data["mentorship_requests_count"] = user.mentorship_requests_count
 
             elif user.role == "alumni":
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM opportunities WHERE posted_by = :user_id AND is_active = TRUE
-                """), {"user_id": user_id})
-                user_data["active_opportunities_count"] = result.fetchone().count
-
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM scholarships WHERE created_by = :user_id AND status = 'active'
-                """), {"user_id": user_id})
-                user_data["active_scholarships_count"] = result.fetchone().count
-
-                result = conn.execute(text("""
-                    SELECT COUNT(*) as count FROM mentorship_requests WHERE mentor_id = :user_id AND status = 'accepted'
-                """), {"user_id": user_id})
-                user_data["mentorship_count"] = result.fetchone().count
+                user_data["active_opportunities_count"] = user.active_opportunities_count
+                user_data["active_scholarships_count"] = user.active_scholarships_count
+                user_data["mentorship_count"] = user.mentorship_count
 
             return jsonify(user_data), 200
     except Exception as e:
@@ -188,6 +180,9 @@ def update_profile():
                 "phone": data.get("phone")
             })
             conn.commit()
+            invalidate("users")
+            get_mentor_index().refresh_user(current_user["id"])
+            invalidate(f"user:{current_user['id']}")
 
             return jsonify({"message": "Profile updated successfully"}), 200
     except Exception as e:
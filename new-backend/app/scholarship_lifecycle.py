@@ -0,0 +1,104 @@
+import logging
+
+from flask import request
+from sqlalchemy import text
+
+from .background import PeriodicTask
+from .cache import force_refill, invalidate
+from .models import get_engine
+
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = "alumni_scholarship_lifecycle"
+
+
+def close_expired_scholarships(batch_size):
+    engine = get_engine()
+    closed = 0
+    with engine.connect() as conn:
+        # Every worker runs this task; the advisory lock lets one of them do
+        # the closing per tick and the rest skip it.
+        if not conn.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": LOCK_NAME}).scalar():
+            return 0
+        try:
+            # Small batches over (status, deadline) keep each transaction's
+            # row locks short even when a large backlog has expired.
+            while True:
+                result = conn.execute(text("""
+                    UPDATE scholarships SET status = 'closed'
+                    WHERE status = 'active' AND deadline < CURDATE()
+                    ORDER BY deadline
+                    LIMIT :batch_size
+                """), {"batch_size": batch_size})
+                conn.commit()
+                closed += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+            conn.commit()
+
+    if closed:
+        logger.info("Closed %s scholarships past their deadline", closed)
+    return closed
+
+
+def closing_soon(days, limit):
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT id FROM scholarships
+            WHERE status = 'active' AND deadline BETWEEN CURDATE() AND CURDATE() + INTERVAL :days DAY
+            ORDER BY deadline
+            LIMIT :limit
+        """), {"days": days, "limit": limit})
+        return [row.id for row in result]
+
+
+# Closes expired scholarships and pre-warms the response cache for the ones
+# about to close, when application traffic peaks. Warming calls the app's own
+# views, so the cached entries are exactly what clients request, but skips
+# the request hooks (rate limits, metrics, compression) a real request runs.
+class ScholarshipLifecycle:
+    def __init__(self, app):
+        config = app.config
+        self.app = app
+        self.batch_size = config["SCHOLARSHIP_CLOSE_BATCH_SIZE"]
+        self.prewarm_days = config["SCHOLARSHIP_PREWARM_DAYS"]
+        self.prewarm_limit = config["SCHOLARSHIP_PREWARM_LIMIT"]
+        self.enabled = config["SCHOLARSHIP_LIFECYCLE_INTERVAL"] > 0
+        # Outlive the interval so warmed entries are still there at the
+        # next tick, which refills them.
+        self.prewarm_ttl = config["SCHOLARSHIP_PREWARM_TTL"] or 2 * config["SCHOLARSHIP_LIFECYCLE_INTERVAL"]
+        self._task = PeriodicTask("scholarship-lifecycle", config["SCHOLARSHIP_LIFECYCLE_INTERVAL"], self.run)
+
+    def ensure_started(self):
+        if self.enabled:
+            self._task.ensure_started()
+
+    def prewarm(self):
+        ids = closing_soon(self.prewarm_days, self.prewarm_limit) if self.prewarm_limit else []
+        for path in ["/api/scholarships/"] + [f"/api/scholarships/{i}" for i in ids]:
+            with self.app.test_request_context(path):
+                force_refill(self.prewarm_ttl)
+                try:
+                    self.app.view_functions[request.endpoint](**request.view_args)
+                except Exception as e:
+                    logger.warning("Pre-warming %s failed: %s", path, e)
+        return len(ids)
+
+    def run(self):
+        if close_expired_scholarships(self.batch_size):
+            with self.app.app_context():
+                invalidate("scholarships")
+        self.prewarm()
+
+
+def init_scholarship_lifecycle(app):
+    lifecycle = ScholarshipLifecycle(app)
+
+    # Started from request code so a preloaded gunicorn master never owns
+    # the thread; after the first request this is a pid check.
+    app.before_request(lifecycle.ensure_started)
+    return lifecycle
@@ -0,0 +1,32 @@
+import re
+
+
+# MATCH() column lists must match a FULLTEXT index exactly, so the search
+# route builds its MATCH expressions from these definitions. The indexes are
+# created by migrations/versions/0003_search_fulltext_indexes.py.
+FULLTEXT_INDEXES = {
+    "users": ("ft_users_search", ("name", "major", "company", "position", "bio")),
+    "opportunities": ("ft_opportunities_search", ("title", "company", "description", "requirements")),
+    "mentorship_requests": ("ft_mentorship_requests_search", ("subject", "message")),
+    "scholarships": ("ft_scholarships_search", ("title", "description", "eligibility_criteria")),
+}
+
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by default).
+MIN_TOKEN_LENGTH = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def match_expression(table, alias=None):
+    _, columns = FULLTEXT_INDEXES[table]
+    prefix = f"{alias}." if alias else ""
+    return f"MATCH({', '.join(prefix + c for c in columns)})"
+
+
+def boolean_query(query):
+    # Every word must match, and the last one may be a prefix of a longer
+    # word so results show up while the user is still typing.
+    tokens = [t for t in _TOKEN_RE.findall(query.lower()) if len(t) >= MIN_TOKEN_LENGTH]
+    if not tokens:
+        return None
+    return " ".join([f"+{t}" for t in tokens[:-1]] + [f"+{tokens[-1]}*"])
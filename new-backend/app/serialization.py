@@ -0,0 +1,150 @@
+import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask import jsonify, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+_ALIAS_RE = re.compile(r"\s+as\s+", re.IGNORECASE)
+
+VIEWS = ("full", "summary")
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+def handle_invalid_fields(error):
+    return jsonify({"error": str(error)}), 400
+
+
+def _column_key(column):
+    return _ALIAS_RE.split(column)[-1].rsplit(".", 1)[-1].strip()
+
+
+# Select expression for a server-side excerpt; bind :excerpt_chars
+# (SUMMARY_EXCERPT_CHARS) when the query runs.
+def excerpt(column, key="excerpt"):
+    return f"LEFT({column}, :excerpt_chars) as {key}"
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return DefaultJSONProvider.default(value)
+
+
+def dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=json_default, separators=(",", ":"))
+
+
+# A query's output columns, written as SQL select expressions ("o.title",
+# "u.name as posted_by_name"). The same object renders the SELECT list and
+# turns result rows into dicts keyed by column name, so routes no longer
+# convert field by field: Decimal, date and datetime values pass through and
+# the JSON provider encodes them. Extra columns selected after these (e.g.
+# a pagination sort key) are left out of the dicts.
+class Columns:
+    def __init__(self, *columns):
+        self.groups = tuple(c for c in columns if isinstance(c, Nested))
+        self.columns = tuple(c for c in columns if not isinstance(c, Nested))
+        self.keys = tuple(_column_key(c) for c in self.columns)
+        self.by_key = dict(zip(self.keys, self.columns))
+
+    @property
+    def select(self):
+        return ", ".join(self.columns + tuple(col for group in self.groups for col in group.columns))
+
+    # SELECT list plus any of `columns` (e.g. the pagination sort keys) not
+    # already selected. They come last, so dump() leaves them out.
+    def select_with(self, *columns):
+        selected = set(self.by_key).union(*(group.labels for group in self.groups))
+        return ", ".join((self.select,) + tuple(c for c in columns if _column_key(c) not in selected))
+
+    def dump(self, rows):
+        if self.groups:
+            return [self.dump_one(row) for row in rows]
+        keys = self.keys
+        return [dict(zip(keys, row)) for row in rows]
+
+    def dump_one(self, row):
+        item = dict(zip(self.keys, row))
+        start = len(self.keys)
+        for group in self.groups:
+            stop = start + len(group.keys)
+            item[group.name] = dict(zip(group.keys, row[start:stop]))
+            start = stop
+        return item
+
+
+# Columns dumped as one object under `name` ("other_user": {"id": ...}).
+# Select them with a "<name>_" alias prefix (u.id as other_user_id) so the
+# labels stay unique in the query; the prefix is dropped from the keys.
+# Groups are selected after the parent's own columns.
+class Nested:
+    def __init__(self, name, *columns):
+        self.name = name
+        self.columns = columns
+        self.labels = tuple(_column_key(c) for c in columns)
+        prefix = f"{name}_"
+        self.keys = tuple(k[len(prefix):] if k.startswith(prefix) else k for k in self.labels)
+
+
+# jsonify() backed by orjson when it is installed, stdlib json otherwise.
+# Both encode dates as ISO 8601 and Decimals as numbers, and keep keys in
+# insertion (i.e. column) order.
+class AppJSONProvider(DefaultJSONProvider):
+    sort_keys = False
+    default = staticmethod(json_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=json_default, option=option),
+                                        mimetype=self.mimetype)
+
+
+# Picks the columns a list request asked for: ?view=summary swaps in the
+# route's summary columns (short fields plus an excerpt), ?fields=a,b
+# selects individual columns from either set. "id" is always included.
+# The result drives the SELECT list, so unrequested columns are not selected.
+def project(full, summary):
+    view = request.args.get("view", "full")
+    if view not in VIEWS:
+        raise InvalidFields(f"Unknown view, use one of: {', '.join(VIEWS)}")
+    columns = summary if view == "summary" else full
+
+    fields = request.args.get("fields")
+    if not fields:
+        return columns
+    available = {**full.by_key, **summary.by_key}
+    requested = ["id"] + [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+    unknown = [f for f in requested if f not in available]
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}")
+    return Columns(*(available[f] for f in dict.fromkeys(requested)))
@@ -0,0 +1,85 @@
+from sqlalchemy import text
+
+from .cache import invalidate
+from .jobs import job
+from .mailer import send_email
+from .models import get_engine
+from .user_import import import_batch
+
+
+@job("scholarship_application_submitted")
+def notify_scholarship_application(application_id):
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT s.title, o.name as owner_name, o.email as owner_email, st.name as student_name
+            FROM scholarship_applications sa
+            JOIN scholarships s ON sa.scholarship_id = s.id
+            JOIN users o ON s.created_by = o.id
+            JOIN users st ON sa.student_id = st.id
+            WHERE sa.id = :application_id
+        """), {"application_id": application_id})
+        row = result.fetchone()
+
+    # The application may have been deleted before the job ran.
+    if row is None:
+        return
+
+    send_email(
+        row.owner_email,
+        f"New application for {row.title}",
+        f"Hi {row.owner_name},\n\n{row.student_name} has applied for your scholarship \"{row.title}\".\n"
+    )
+
+
+@job("scholarship_application_status_changed")
+def notify_scholarship_application_status(application_id, status):
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT s.title, st.name as student_name, st.email as student_email
+            FROM scholarship_applications sa
+            JOIN scholarships s ON sa.scholarship_id = s.id
+            JOIN users st ON sa.student_id = st.id
+            WHERE sa.id = :application_id
+        """), {"application_id": application_id})
+        row = result.fetchone()
+
+    if row is None:
+        return
+
+    send_email(
+        row.student_email,
+        f"Your application for {row.title} is now {status.replace('_', ' ')}",
+        f"Hi {row.student_name},\n\nThe status of your application for \"{row.title}\" "
+        f"changed to {status.replace('_', ' ')}.\n"
+    )
+
+
+@job("mentorship_requested")
+def notify_mentorship_request(request_id):
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT mr.subject, m.name as mentor_name, m.email as mentor_email, s.name as student_name
+            FROM mentorship_requests mr
+            JOIN users m ON mr.mentor_id = m.id
+            JOIN users s ON mr.student_id = s.id
+            WHERE mr.id = :request_id
+        """), {"request_id": request_id})
+        row = result.fetchone()
+
+    if row is None:
+        return
+
+    send_email(
+        row.mentor_email,
+        f"New mentorship request: {row.subject}",
+        f"Hi {row.mentor_name},\n\n{row.student_name} has asked you to mentor them on \"{row.subject}\".\n"
+    )
+
+
+@job("user_import_batch")
+def import_user_batch(import_id, rows, batch=None):
+    if import_batch(import_id, rows, batch):
+        invalidate("users")
@@ -0,0 +1,258 @@
+import base64
+import csv
+import hashlib
+import io
+import json
+
+from cryptography.fernet import Fernet, InvalidToken
+from sqlalchemy import bindparam, text
+from sqlalchemy.exc import DBAPIError
+
+from .config import get_config
+from .jobs import enqueue
+from .models import get_engine
+from .passwords import hash_passwords
+
+
+ROLES = ("student", "alumni", "admin")
+OPTIONAL_FIELDS = ("graduation_year", "major", "company", "position", "bio", "skills", "cgpa", "category", "phone")
+
+INSERT_USER = text("""
+    INSERT INTO users (email, password_hash, name, role, graduation_year, major,
+                       company, position, bio, skills, cgpa, category, phone)
+    VALUES (:email, :password_hash, :name, :role, :graduation_year, :major,
+            :company, :position, :bio, :skills, :cgpa, :category, :phone)
+""")
+
+
+def parse_csv(data):
+    reader = csv.DictReader(io.StringIO(data))
+    # CSV has no nulls; treat empty cells as missing values.
+    return [{k.strip(): (v.strip() or None) if isinstance(v, str) else v for k, v in row.items() if k} for row in reader]
+
+
+def _validate(row):
+    if not isinstance(row, dict):
+        return "Row must be an object"
+    if not row.get("email") or not row.get("password") or not row.get("name") or not row.get("role"):
+        return "Email, password, name, and role are required"
+    if not isinstance(row["email"], str) or not isinstance(row["password"], str):
+        return "Email and password must be strings"
+    if row["role"] not in ROLES:
+        return "Invalid role"
+    try:
+        if row.get("graduation_year") is not None:
+            row["graduation_year"] = int(row["graduation_year"])
+        if row.get("cgpa") is not None:
+            row["cgpa"] = float(row["cgpa"])
+    except (TypeError, ValueError):
+        return "graduation_year and cgpa must be numeric"
+    if row.get("cgpa") is not None and not 0 <= row["cgpa"] <= 10:
+        return "cgpa must be between 0 and 10"
+    return None
+
+
+def _existing_emails(conn, emails, batch_size):
+    existing = set()
+    for i in range(0, len(emails), batch_size):
+        result = conn.execute(text("SELECT email FROM users WHERE email IN :emails").bindparams(
+            bindparam("emails", expanding=True)), {"emails": emails[i:i + batch_size]})
+        existing.update(row.email.lower() for row in result)
+    return existing
+
+
+# Plaintext passwords wait in the jobs table until a worker hashes them,
+# so they are stored encrypted with a key derived from SECRET_KEY.
+def _fernet():
+    key = hashlib.sha256(get_config()["SECRET_KEY"].encode("utf-8")).digest()
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def _row_error(e):
+    if "Duplicate" in str(e.orig):
+        return "User with this email already exists"
+    return str(e.orig)
+
+
+# Runs inside the caller's transaction; savepoints undo a failed insert
+# without losing the rest of it.
+def _insert_chunk(conn, chunk, results):
+    try:
+        # A list of parameter sets runs as executemany, which PyMySQL sends
+        # as a single multi-row INSERT.
+        with conn.begin_nested():
+            conn.execute(INSERT_USER, [params for _, params in chunk])
+        for index, params in chunk:
+            results[index] = {"row": index, "email": params["email"], "status": "created"}
+        return
+    except DBAPIError as e:
+        if e.connection_invalidated:
+            raise
+
+    # A duplicate email registered since the uniqueness check, or a value the
+    # column rejects (too long, out of range): retry row by row so only the
+    # offending rows fail.
+    for index, params in chunk:
+        try:
+            with conn.begin_nested():
+                conn.execute(INSERT_USER, params)
+            results[index] = {"row": index, "email": params["email"], "status": "created"}
+        except DBAPIError as e:
+            if e.connection_invalidated:
+                raise
+            results[index] = {"row": index, "email": params["email"], "status": "error", "error": _row_error(e)}
+
+
+# Validates rows and checks existing emails up front, records those
+# failures on a new user_imports row and enqueues one job per batch of the
+# rest. bcrypt hashing, the slow part, happens in the job worker; returns
+# the import id.
+def start_import(rows, batch_size, created_by):
+    results = {}
+    valid = []
+    seen = set()
+
+    for index, row in enumerate(rows):
+        error = _validate(row)
+        if error is None:
+            email = row["email"].strip().lower()
+            if email in seen:
+                error = "Duplicate email in import"
+            seen.add(email)
+        if error:
+            results[index] = {"row": index, "email": row.get("email") if isinstance(row, dict) else None,
+                              "status": "error", "error": error}
+        else:
+            valid.append((index, row))
+
+    engine = get_engine()
+    with engine.connect() as conn:
+        existing = _existing_emails(conn, [row["email"].strip() for _, row in valid], batch_size) if valid else set()
+
+        pending = []
+        fernet = _fernet()
+        for index, row in valid:
+            if row["email"].strip().lower() in existing:
+                results[index] = {"row": index, "email": row["email"], "status": "error",
+                                  "error": "User with this email already exists"}
+                continue
+            item = {field: row.get(field) for field in OPTIONAL_FIELDS}
+            item.update({
+                "row": index,
+                "email": row["email"].strip(),
+                "password": fernet.encrypt(row["password"].encode("utf-8")).decode("ascii"),
+                "name": row["name"],
+                "role": row["role"]
+            })
+            pending.append(item)
+
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        result = conn.execute(text("""
+            INSERT INTO user_imports (created_by, total, failed, pending_batches, results, finished_at)
+            VALUES (:created_by, :total, :failed, :pending_batches, :results,
+                    IF(:pending_batches = 0, NOW(), NULL))
+        """), {
+            "created_by": created_by,
+            "total": len(rows),
+            "failed": len(results),
+            "pending_batches": len(batches),
+            "results": json.dumps(list(results.values()))
+        })
+        import_id = result.lastrowid
+        for number, batch in enumerate(batches):
+            enqueue(conn, "user_import_batch", {"import_id": import_id, "batch": number, "rows": batch})
+        conn.commit()
+    return import_id
+
+
+# Job body for one batch: hash, insert, then fold the per-row results into
+# the import. The batch marker, the inserts and the progress update commit
+# together, so a job retried after its batch committed (the worker died
+# before deleting it) changes nothing, and one that failed part way through
+# starts over from a clean slate. Batches are independent transactions, so
+# a failed batch keeps the ones already committed. `batch` is None for
+# jobs queued before batches were numbered.
+def import_batch(import_id, rows, batch=None):
+    results = {}
+    fernet = _fernet()
+    passwords = []
+    for item in rows:
+        try:
+            passwords.append(fernet.decrypt(item["password"].encode("ascii")).decode("utf-8"))
+        except InvalidToken:
+            # SECRET_KEY changed since the import was queued.
+            passwords.append(None)
+            results[item["row"]] = {"row": item["row"], "email": item["email"], "status": "error",
+                                    "error": "Password could not be decrypted, import this row again"}
+
+    readable = [(item, password) for item, password in zip(rows, passwords) if password is not None]
+    password_hashes = hash_passwords([password for _, password in readable])
+
+    engine = get_engine()
+    with engine.connect() as conn:
+        if batch is not None:
+            # Also locks the marker, so a concurrent run of the same batch
+            # waits here and then finds it done.
+            result = conn.execute(text("""
+                INSERT IGNORE INTO user_import_batches (import_id, batch) VALUES (:import_id, :batch)
+            """), {"import_id": import_id, "batch": batch})
+            if not result.rowcount:
+                conn.rollback()
+                return 0
+
+        chunk = []
+        for (item, _), password_hash in zip(readable, password_hashes):
+            params = {field: item.get(field) for field in OPTIONAL_FIELDS}
+            params.update({
+                "email": item["email"],
+                "password_hash": password_hash,
+                "name": item["name"],
+                "role": item["role"]
+            })
+            chunk.append((item["row"], params))
+        if chunk:
+            _insert_chunk(conn, chunk, results)
+
+        created = sum(1 for r in results.values() if r["status"] == "created")
+        # MySQL applies SET assignments left to right, so finished_at sees
+        # the decremented pending_batches.
+        conn.execute(text("""
+            UPDATE user_imports
+            SET created = created + :created,
+                failed = failed + :failed,
+                results = JSON_MERGE_PRESERVE(results, CAST(:results AS JSON)),
+                pending_batches = pending_batches - 1,
+                finished_at = IF(pending_batches = 0, NOW(), NULL)
+            WHERE id = :import_id
+        """), {
+            "import_id": import_id,
+            "created": created,
+            "failed": len(results) - created,
+            "results": json.dumps(list(results.values()))
+        })
+        conn.commit()
+    return created
+
+
+def get_import(import_id):
+    engine = get_engine()
+    with engine.connect() as conn:
+        row = conn.execute(text("""
+            SELECT id, created_by, total, created, failed, pending_batches, results, created_at, finished_at
+            FROM user_imports WHERE id = :import_id
+        """), {"import_id": import_id}).fetchone()
+    if row is None:
+        return None
+    results = json.loads(row.results) if isinstance(row.results, (str, bytes)) else row.results
+    return {
+        "id": row.id,
+        "status": "running" if row.pending_batches else "done",
+        "total": row.total,
+        "created": row.created,
+        "failed": row.failed,
+        "pending_batches": row.pending_batches,
+        "created_by": row.created_by,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+        "results": sorted(results or [], key=lambda r: r["row"])
+    }
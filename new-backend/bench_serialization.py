@@ -0,0 +1,224 @@
+import argparse
+import random
+import string
+import timeit
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.routes.admin import SCHOLARSHIP_COLUMNS as ADMIN_SCHOLARSHIP_COLUMNS
+from app.routes.admin import USER_COLUMNS as ADMIN_USER_COLUMNS
+from app.routes.messages import CONVERSATION_COLUMNS
+from app.routes.opportunities import LIST_COLUMNS as OPPORTUNITY_COLUMNS
+from app.routes.scholarships import LIST_COLUMNS as SCHOLARSHIP_COLUMNS
+from app.routes.stories import LIST_COLUMNS as STORY_COLUMNS
+from app.routes.users import USER_COLUMNS
+from app.serialization import AppJSONProvider, orjson
+
+# Compares the list routes' old serialisation (a dict built per row with
+# isoformat()/float(), then stdlib jsonify) against Columns.dump() and the
+# app's JSON provider, on synthetic rows shaped like each route's query.
+# No database is needed.
+
+
+def _text(words):
+    return " ".join("".join(random.choices(string.ascii_lowercase, k=random.randint(3, 10))) for _ in range(words))
+
+
+def _when(days):
+    return datetime(2024, 1, 1, 9, 30) + timedelta(days=days, seconds=random.randint(0, 86400))
+
+
+def _opportunity(i):
+    return (i, _text(5), _text(2), _text(120), _text(40), _text(2), "50k-70k", "job", _text(2), _when(i % 365))
+
+
+def _scholarship(i):
+    return (i, _text(5), _text(80), _text(30), Decimal("7.50"), "general", "cs,ee", Decimal("50000.00"),
+            date(2025, 1, 1) + timedelta(days=i % 365), "active", _text(2), _when(i % 365))
+
+
+def _story(i):
+    return (i, _text(6), _text(400), "career", i % 7 == 0, _text(2), "alumni", _when(i % 365))
+
+
+def _user(i):
+    return (i, _text(2), "alumni", 2015 + i % 10, "cs", _text(2), _text(3), _text(60), "python, sql, react")
+
+
+def _admin_user(i):
+    return (i, _text(2), f"user{i}@example.com", "student", 2015 + i % 10, "cs", _text(2), _text(3),
+            Decimal("8.25"), "general", "555-0100", i % 2, _when(i % 365))
+
+
+def _admin_scholarship(i):
+    return (i, _text(5), Decimal("50000.00"), date(2025, 1, 1) + timedelta(days=i % 365), "active",
+            Decimal("7.50"), "general", _text(2), f"admin{i}@example.com", i % 40, _when(i % 365))
+
+
+def _conversation(i):
+    return (i, i % 3, i + 1, _text(2), "alumni", i * 10, _text(5), _text(30), i % 2, _when(i % 365))
+
+
+def _old_opportunity(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "company": row.company,
+        "description": row.description,
+        "requirements": row.requirements,
+        "location": row.location,
+        "salary_range": row.salary_range,
+        "type": row.type,
+        "posted_by_name": row.posted_by_name,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _old_scholarship(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "description": row.description,
+        "eligibility_criteria": row.eligibility_criteria,
+        "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
+        "category_requirement": row.category_requirement,
+        "major_requirement": row.major_requirement,
+        "amount": float(row.amount) if row.amount else None,
+        "deadline": row.deadline.isoformat() if row.deadline else None,
+        "status": row.status,
+        "created_by_name": row.created_by_name,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _old_story(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "content": row.content,
+        "category": row.category,
+        "is_featured": row.is_featured,
+        "author_name": row.author_name,
+        "author_role": row.author_role,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _old_user(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "role": row.role,
+        "graduation_year": row.graduation_year,
+        "major": row.major,
+        "company": row.company,
+        "position": row.position,
+        "bio": row.bio,
+        "skills": row.skills
+    }
+
+
+def _old_admin_user(row):
+    return {
+        "id": row.id,
+        "name": row.name,
+        "email": row.email,
+        "role": row.role,
+        "graduation_year": row.graduation_year,
+        "major": row.major,
+        "company": row.company,
+        "position": row.position,
+        "cgpa": float(row.cgpa) if row.cgpa else None,
+        "category": row.category,
+        "phone": row.phone,
+        "email_verified": row.email_verified,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+def _old_admin_scholarship(row):
+    return {
+        "id": row.id,
+        "title": row.title,
+        "amount": float(row.amount) if row.amount else None,
+        "deadline": row.deadline.isoformat() if row.deadline else None,
+        "status": row.status,
+        "cgpa_requirement": float(row.cgpa_requirement) if row.cgpa_requirement else None,
+        "category_requirement": row.category_requirement,
+        "created_by_name": row.created_by_name,
+        "created_by_email": row.created_by_email,
+        "application_count": row.application_count,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
+# The old query selected the full content and sender_id and built the
+# snippet and is_from_me in Python; the rows here are already trimmed, so
+# this slightly flatters the old path.
+def _old_conversation(row):
+    return {
+        "id": row.id,
+        "other_user": {
+            "id": row.other_user_id,
+            "name": row.other_user_name,
+            "role": row.other_user_role
+        },
+        "unread_count": row.unread_count,
+        "last_message": {
+            "id": row.last_message_id,
+            "subject": row.last_message_subject,
+            "snippet": row.last_message_snippet[:200] if row.last_message_snippet else None,
+            "is_from_me": row.last_message_is_from_me == 1,
+            "created_at": row.last_message_created_at.isoformat() if row.last_message_created_at else None
+        }
+    }
+
+
+def _labels(columns):
+    return columns.keys + tuple(key for group in columns.groups for key in group.labels)
+
+
+ROUTES = (
+    ("opportunities.list_opportunities", OPPORTUNITY_COLUMNS, _opportunity, _old_opportunity),
+    ("scholarships.list_scholarships", SCHOLARSHIP_COLUMNS, _scholarship, _old_scholarship),
+    ("stories.list_stories", STORY_COLUMNS, _story, _old_story),
+    ("users.list_users", USER_COLUMNS, _user, _old_user),
+    ("admin.list_all_users", ADMIN_USER_COLUMNS, _admin_user, _old_admin_user),
+    ("admin.list_all_scholarships", ADMIN_SCHOLARSHIP_COLUMNS, _admin_scholarship, _old_admin_scholarship),
+    ("messages.list_conversations", CONVERSATION_COLUMNS, _conversation, _old_conversation),
+)
+
+
+def _best(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list route serialisation")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    old_app, new_app = Flask("old"), Flask("new")
+    old_app.json = DefaultJSONProvider(old_app)
+    new_app.json = AppJSONProvider(new_app)
+
+    print(f"{args.rows} rows, best of {args.repeat}, encoder: {'orjson' if orjson else 'stdlib json'}")
+    for endpoint, columns, make, old_serialize in ROUTES:
+        Row = namedtuple("Row", _labels(columns))
+        rows = [Row(*make(i)) for i in range(args.rows)]
+
+        with old_app.app_context():
+            old = _best(lambda: old_app.json.response([old_serialize(r) for r in rows]).get_data(), args.repeat)
+        with new_app.app_context():
+            new = _best(lambda: new_app.json.response(columns.dump(rows)).get_data(), args.repeat)
+        print(f"{endpoint:<36} before {old * 1000:8.1f} ms  after {new * 1000:8.1f} ms  {old / new:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
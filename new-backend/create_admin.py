@@ -1,10 +1,10 @@
-import bcrypt
 from app.models import get_engine
+from app.passwords import hash_password
 from sqlalchemy import text
 
 def create_admin_user(email, password, name="Admin User"):
     # Hash the password
-    password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    password_hash = hash_password(password)
     
     engine = get_engine()
     try:
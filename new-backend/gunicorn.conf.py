@@ -0,0 +1,62 @@
+import glob
+import multiprocessing
+import os
+import tempfile
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Lets the app warn about per-process state (memory backends) it would
+# otherwise silently split across workers.
+os.environ["APP_WORKER_PROCESSES"] = str(workers)
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# Each open /api/events/stream holds a thread for its lifetime, so threaded
+# workers only accept a few; use an async worker class (e.g. gevent) to
+# serve many streams.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+# Threads that bound a worker's concurrency; async workers (gevent, eventlet)
+# have no such limit. The app caps open event streams below this.
+os.environ["APP_WORKER_THREADS"] = str({"sync": 1, "gthread": threads}.get(worker_class, 0))
+
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# Recycle workers periodically to bound memory growth; the jitter keeps them
+# from all restarting at once.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# Workers write their metrics here so any of them can serve the totals.
+metrics_dir = os.environ.setdefault("METRICS_DIR", tempfile.mkdtemp(prefix="alumni-metrics-"))
+
+accesslog = "-"
+# The default format logs the full request line; log the path without the
+# query string so tokens passed as parameters never reach the logs.
+access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(m)s %(U)s %(H)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # With preload_app the engine is built in the master; give each worker
+    # its own pool instead of sharing the master's sockets.
+    from app.models import reset_engine_after_fork
+    from app.passwords import reset_password_hasher_after_fork
+    reset_engine_after_fork()
+    reset_password_hasher_after_fork()
+
+
+def on_starting(server):
+    # Counters restart with the server; drop what a previous run left behind.
+    for path in glob.glob(os.path.join(metrics_dir, "*.json")):
+        os.remove(path)
+
+
+def worker_exit(server, worker):
+    # Recycled workers (max_requests) hand over their final totals.
+    from app.metrics import flush_metrics
+    flush_metrics()
@@ -0,0 +1,37 @@
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_alembic_config():
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    return config
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    args = sys.argv[1:] or ["upgrade"]
+    config = get_alembic_config()
+
+    if args[0] == "upgrade":
+        command.upgrade(config, args[1] if len(args) > 1 else "head")
+    elif args[0] == "downgrade" and len(args) > 1:
+        command.downgrade(config, args[1])
+    elif args[0] == "current":
+        command.current(config, verbose=True)
+    elif args[0] == "history":
+        command.history(config)
+    else:
+        print("Usage: python migrate.py [upgrade [revision] | downgrade <revision> | current | history]")
+        sys.exit(1)
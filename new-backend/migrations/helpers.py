@@ -0,0 +1,32 @@
+from alembic import op
+from sqlalchemy import text
+
+
+# MySQL has no CREATE INDEX IF NOT EXISTS; these keep migrations safe to run
+# against databases that were created by hand before migrations existed.
+def index_exists(table, index_name):
+    result = op.get_bind().execute(text("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index_name
+        LIMIT 1
+    """), {"table": table, "index_name": index_name})
+    return result.fetchone() is not None
+
+
+def column_exists(table, column):
+    result = op.get_bind().execute(text("""
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = :table AND column_name = :column
+        LIMIT 1
+    """), {"table": table, "column": column})
+    return result.fetchone() is not None
+
+
+def create_index_if_missing(table, index_name, columns, kind="INDEX"):
+    if not index_exists(table, index_name):
+        op.execute(f"ALTER TABLE {table} ADD {kind} {index_name} ({', '.join(columns)})")
+
+
+def drop_index_if_exists(table, index_name):
+    if index_exists(table, index_name):
+        op.execute(f"ALTER TABLE {table} DROP INDEX {index_name}")
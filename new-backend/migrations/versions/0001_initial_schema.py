@@ -0,0 +1,150 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# IF NOT EXISTS lets this run against databases created from the old
+# db/init.sql; later revisions bring those up to date.
+TABLES = [
+    ("users", """
+        CREATE TABLE IF NOT EXISTS users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            role ENUM('student', 'alumni', 'admin') NOT NULL DEFAULT 'student',
+            graduation_year INT NULL,
+            major VARCHAR(255) NULL,
+            company VARCHAR(255) NULL,
+            position VARCHAR(255) NULL,
+            bio TEXT NULL,
+            skills TEXT NULL,
+            cgpa DECIMAL(4, 2) NULL,
+            category VARCHAR(50) NULL,
+            phone VARCHAR(20) NULL,
+            email_verified BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_users_email (email),
+            CONSTRAINT chk_users_cgpa CHECK (cgpa IS NULL OR (cgpa >= 0.00 AND cgpa <= 10.00))
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("opportunities", """
+        CREATE TABLE IF NOT EXISTS opportunities (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            company VARCHAR(255) NOT NULL,
+            description TEXT NULL,
+            requirements TEXT NULL,
+            location VARCHAR(255) NULL,
+            salary_range VARCHAR(100) NULL,
+            type VARCHAR(50) NOT NULL,
+            posted_by INT NULL,
+            is_active BOOLEAN NOT NULL DEFAULT TRUE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_opportunities_posted_by FOREIGN KEY (posted_by) REFERENCES users (id) ON DELETE SET NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("scholarships", """
+        CREATE TABLE IF NOT EXISTS scholarships (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            description TEXT NULL,
+            eligibility_criteria TEXT NULL,
+            cgpa_requirement DECIMAL(4, 2) NULL,
+            category_requirement VARCHAR(50) NULL,
+            amount DECIMAL(12, 2) NOT NULL,
+            deadline DATE NULL,
+            created_by INT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'active',
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_scholarships_created_by FOREIGN KEY (created_by) REFERENCES users (id) ON DELETE SET NULL,
+            CONSTRAINT chk_scholarships_cgpa CHECK (cgpa_requirement IS NULL OR (cgpa_requirement >= 0.00 AND cgpa_requirement <= 10.00))
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("scholarship_applications", """
+        CREATE TABLE IF NOT EXISTS scholarship_applications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            student_id INT NOT NULL,
+            scholarship_id INT NOT NULL,
+            cover_letter TEXT NULL,
+            additional_info TEXT NULL,
+            status ENUM('submitted', 'under_review', 'approved', 'rejected') NOT NULL DEFAULT 'submitted',
+            application_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_scholarship_applications_student FOREIGN KEY (student_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_scholarship_applications_scholarship FOREIGN KEY (scholarship_id) REFERENCES scholarships (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("applications", """
+        CREATE TABLE IF NOT EXISTS applications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            opportunity_id INT NULL,
+            scholarship_id INT NULL,
+            type VARCHAR(20) NOT NULL,
+            cover_letter TEXT NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_applications_applicant FOREIGN KEY (applicant_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_applications_opportunity FOREIGN KEY (opportunity_id) REFERENCES opportunities (id) ON DELETE SET NULL,
+            CONSTRAINT fk_applications_scholarship FOREIGN KEY (scholarship_id) REFERENCES scholarships (id) ON DELETE SET NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("mentorship_requests", """
+        CREATE TABLE IF NOT EXISTS mentorship_requests (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            student_id INT NOT NULL,
+            mentor_id INT NOT NULL,
+            subject VARCHAR(255) NOT NULL,
+            message TEXT NULL,
+            status ENUM('pending', 'accepted', 'rejected', 'completed') NOT NULL DEFAULT 'pending',
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_mentorship_requests_student FOREIGN KEY (student_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_mentorship_requests_mentor FOREIGN KEY (mentor_id) REFERENCES users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("messages", """
+        CREATE TABLE IF NOT EXISTS messages (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            sender_id INT NOT NULL,
+            receiver_id INT NOT NULL,
+            subject VARCHAR(255) NULL,
+            content TEXT NOT NULL,
+            is_read BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_messages_sender FOREIGN KEY (sender_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_messages_receiver FOREIGN KEY (receiver_id) REFERENCES users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+    ("stories", """
+        CREATE TABLE IF NOT EXISTS stories (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            author_id INT NULL,
+            title VARCHAR(255) NOT NULL,
+            content TEXT NOT NULL,
+            category VARCHAR(100) NULL,
+            is_featured BOOLEAN NOT NULL DEFAULT FALSE,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_stories_author FOREIGN KEY (author_id) REFERENCES users (id) ON DELETE SET NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """),
+]
+
+
+def upgrade():
+    for _, ddl in TABLES:
+        op.execute(ddl)
+
+
+def downgrade():
+    for table, _ in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
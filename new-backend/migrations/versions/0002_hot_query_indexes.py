@@ -0,0 +1,45 @@
+"""indexes for hot route queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from migrations.helpers import create_index_if_missing, drop_index_if_exists
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# InnoDB secondary indexes carry the primary key, so (role, name) also
+# serves the (name, id) keyset order used by the paginated user lists.
+INDEXES = [
+    ("users", "idx_users_role_name", ("role", "name")),
+    ("users", "idx_users_name", ("name",)),
+    ("users", "idx_users_created_at", ("created_at",)),
+    ("messages", "idx_messages_receiver_created", ("receiver_id", "created_at")),
+    ("messages", "idx_messages_sender_created", ("sender_id", "created_at")),
+    ("opportunities", "idx_opportunities_active_created", ("is_active", "created_at")),
+    ("opportunities", "idx_opportunities_posted_by_active", ("posted_by", "is_active")),
+    ("scholarships", "idx_scholarships_status_deadline", ("status", "deadline")),
+    ("scholarships", "idx_scholarships_created_by_status", ("created_by", "status")),
+    ("scholarship_applications", "idx_scholarship_applications_student_scholarship", ("student_id", "scholarship_id")),
+    ("mentorship_requests", "idx_mentorship_requests_mentor_status", ("mentor_id", "status")),
+    ("mentorship_requests", "idx_mentorship_requests_created", ("created_at",)),
+    ("applications", "idx_applications_applicant_created", ("applicant_id", "created_at")),
+    ("applications", "idx_applications_created", ("created_at",)),
+    ("stories", "idx_stories_featured_created", ("is_featured", "created_at")),
+]
+
+
+def upgrade():
+    create_index_if_missing("users", "uq_users_email", ("email",), kind="UNIQUE INDEX")
+    for table, index_name, columns in INDEXES:
+        create_index_if_missing(table, index_name, columns)
+
+
+def downgrade():
+    for table, index_name, _ in reversed(INDEXES):
+        drop_index_if_exists(table, index_name)
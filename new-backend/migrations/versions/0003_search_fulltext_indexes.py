@@ -0,0 +1,32 @@
+"""FULLTEXT indexes for unified search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from migrations.helpers import create_index_if_missing, drop_index_if_exists
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+# Column lists must stay identical to app.search_index.FULLTEXT_INDEXES.
+INDEXES = [
+    ("users", "ft_users_search", ("name", "major", "company", "position", "bio")),
+    ("opportunities", "ft_opportunities_search", ("title", "company", "description", "requirements")),
+    ("mentorship_requests", "ft_mentorship_requests_search", ("subject", "message")),
+    ("scholarships", "ft_scholarships_search", ("title", "description", "eligibility_criteria")),
+]
+
+
+def upgrade():
+    for table, index_name, columns in INDEXES:
+        create_index_if_missing(table, index_name, columns, kind="FULLTEXT INDEX")
+
+
+def downgrade():
+    for table, index_name, _ in reversed(INDEXES):
+        drop_index_if_exists(table, index_name)
@@ -0,0 +1,99 @@
+"""conversation threads with per-member unread counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import column_exists, create_index_if_missing
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS conversations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            user_low_id INT NOT NULL,
+            user_high_id INT NOT NULL,
+            last_message_id INT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_conversations_pair (user_low_id, user_high_id),
+            CONSTRAINT fk_conversations_user_low FOREIGN KEY (user_low_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_conversations_user_high FOREIGN KEY (user_high_id) REFERENCES users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # One row per participant: the inbox is a range scan on
+    # (user_id, last_message_id) and unread counts are maintained in place.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS conversation_members (
+            conversation_id INT NOT NULL,
+            user_id INT NOT NULL,
+            other_user_id INT NOT NULL,
+            unread_count INT NOT NULL DEFAULT 0,
+            last_message_id INT NULL,
+            PRIMARY KEY (conversation_id, user_id),
+            KEY idx_conversation_members_inbox (user_id, last_message_id),
+            CONSTRAINT fk_conversation_members_conversation FOREIGN KEY (conversation_id) REFERENCES conversations (id) ON DELETE CASCADE,
+            CONSTRAINT fk_conversation_members_user FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            CONSTRAINT fk_conversation_members_other_user FOREIGN KEY (other_user_id) REFERENCES users (id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    if not column_exists("messages", "conversation_id"):
+        op.execute("""
+            ALTER TABLE messages
+                ADD COLUMN conversation_id INT NULL,
+                ADD CONSTRAINT fk_messages_conversation FOREIGN KEY (conversation_id) REFERENCES conversations (id) ON DELETE CASCADE
+        """)
+    create_index_if_missing("messages", "idx_messages_conversation_id", ("conversation_id", "id"))
+    create_index_if_missing("messages", "idx_messages_receiver_unread", ("receiver_id", "is_read", "conversation_id"))
+
+    # Backfill threads from existing messages.
+    op.execute("""
+        INSERT IGNORE INTO conversations (user_low_id, user_high_id)
+        SELECT DISTINCT LEAST(sender_id, receiver_id), GREATEST(sender_id, receiver_id) FROM messages
+    """)
+    op.execute("""
+        UPDATE messages m
+        JOIN conversations c ON c.user_low_id = LEAST(m.sender_id, m.receiver_id)
+                            AND c.user_high_id = GREATEST(m.sender_id, m.receiver_id)
+        SET m.conversation_id = c.id
+        WHERE m.conversation_id IS NULL
+    """)
+    op.execute("""
+        UPDATE conversations c
+        JOIN (SELECT conversation_id, MAX(id) as last_id FROM messages GROUP BY conversation_id) last
+            ON last.conversation_id = c.id
+        SET c.last_message_id = last.last_id
+    """)
+    op.execute("""
+        INSERT IGNORE INTO conversation_members (conversation_id, user_id, other_user_id, unread_count, last_message_id)
+        SELECT c.id, c.user_low_id, c.user_high_id,
+               (SELECT COUNT(*) FROM messages m
+                WHERE m.conversation_id = c.id AND m.receiver_id = c.user_low_id AND m.is_read = FALSE),
+               c.last_message_id
+        FROM conversations c
+        UNION ALL
+        SELECT c.id, c.user_high_id, c.user_low_id,
+               (SELECT COUNT(*) FROM messages m
+                WHERE m.conversation_id = c.id AND m.receiver_id = c.user_high_id AND m.is_read = FALSE),
+               c.last_message_id
+        FROM conversations c
+        WHERE c.user_high_id <> c.user_low_id
+    """)
+
+
+def downgrade():
+    op.execute("ALTER TABLE messages DROP FOREIGN KEY fk_messages_conversation")
+    op.execute("ALTER TABLE messages DROP INDEX idx_messages_conversation_id")
+    op.execute("ALTER TABLE messages DROP INDEX idx_messages_receiver_unread")
+    op.execute("ALTER TABLE messages DROP COLUMN conversation_id")
+    op.execute("DROP TABLE IF EXISTS conversation_members")
+    op.execute("DROP TABLE IF EXISTS conversations")
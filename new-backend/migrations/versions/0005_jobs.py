@@ -0,0 +1,39 @@
+"""durable background job queue
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Workers claim due rows with SELECT ... FOR UPDATE SKIP LOCKED over
+    # (status, run_at); rows in status 'dead' are the dead-letter list.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            payload JSON NULL,
+            status ENUM('queued', 'running', 'dead') NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            max_attempts INT NOT NULL DEFAULT 5,
+            run_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            locked_by VARCHAR(100) NULL,
+            locked_at TIMESTAMP NULL,
+            last_error TEXT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            KEY idx_jobs_status_run_at (status, run_at),
+            KEY idx_jobs_status_locked_at (status, locked_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS jobs")
@@ -0,0 +1,35 @@
+"""scholarship major requirement and change tracking
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import column_exists, create_index_if_missing
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not column_exists("scholarships", "major_requirement"):
+        op.execute("ALTER TABLE scholarships ADD COLUMN major_requirement VARCHAR(255) NULL AFTER category_requirement")
+    # updated_at lets each worker's eligibility index pull only the rows
+    # that changed since its last sync.
+    if not column_exists("scholarships", "updated_at"):
+        op.execute("""
+            ALTER TABLE scholarships
+                ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """)
+        op.execute("UPDATE scholarships SET updated_at = created_at")
+    create_index_if_missing("scholarships", "idx_scholarships_updated_at", ("updated_at",))
+
+
+def downgrade():
+    op.execute("ALTER TABLE scholarships DROP INDEX idx_scholarships_updated_at")
+    op.execute("ALTER TABLE scholarships DROP COLUMN updated_at")
+    op.execute("ALTER TABLE scholarships DROP COLUMN major_requirement")
@@ -0,0 +1,32 @@
+"""track user profile changes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import column_exists, create_index_if_missing
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets per-worker in-memory indexes (mentor recommendations) pull only
+    # the profiles that changed since their last sync.
+    if not column_exists("users", "updated_at"):
+        op.execute("""
+            ALTER TABLE users
+                ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """)
+        op.execute("UPDATE users SET updated_at = created_at")
+    create_index_if_missing("users", "idx_users_updated_at", ("updated_at",))
+
+
+def downgrade():
+    op.execute("ALTER TABLE users DROP INDEX idx_users_updated_at")
+    op.execute("ALTER TABLE users DROP COLUMN updated_at")
@@ -0,0 +1,32 @@
+"""track opportunity changes
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import column_exists, create_index_if_missing
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MAX(updated_at) is an index lookup, which makes it a cheap change
+    # fingerprint for the per-worker opportunity feed index.
+    if not column_exists("opportunities", "updated_at"):
+        op.execute("""
+            ALTER TABLE opportunities
+                ADD COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """)
+        op.execute("UPDATE opportunities SET updated_at = created_at")
+    create_index_if_missing("opportunities", "idx_opportunities_updated_at", ("updated_at",))
+
+
+def downgrade():
+    op.execute("ALTER TABLE opportunities DROP INDEX idx_opportunities_updated_at")
+    op.execute("ALTER TABLE opportunities DROP COLUMN updated_at")
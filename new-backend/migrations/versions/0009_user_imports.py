@@ -0,0 +1,35 @@
+"""bulk user import progress
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One row per admin import; each batch runs as its own job and folds
+    # its per-row results in here, so the admin can poll for the outcome.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_imports (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            created_by INT NULL,
+            total INT NOT NULL,
+            created INT NOT NULL DEFAULT 0,
+            failed INT NOT NULL DEFAULT 0,
+            pending_batches INT NOT NULL DEFAULT 0,
+            results JSON NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS user_imports")
@@ -0,0 +1,34 @@
+"""microsecond precision for updated_at
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+TABLES = ("scholarships", "users", "opportunities")
+
+
+def upgrade():
+    # Detail ETags are derived from updated_at; at whole seconds, two edits
+    # within the same second left clients revalidating against the first.
+    for table in TABLES:
+        op.execute(f"""
+            ALTER TABLE {table}
+                MODIFY COLUMN updated_at TIMESTAMP(6) NOT NULL
+                    DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)
+        """)
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"""
+            ALTER TABLE {table}
+                MODIFY COLUMN updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """)
@@ -0,0 +1,29 @@
+"""shared dashboard statistics snapshot
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A single row holding the latest dashboard counts, so one worker runs
+    # the COUNT queries per interval and every other worker reads the result.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_stats (
+            id TINYINT PRIMARY KEY,
+            stats JSON NOT NULL,
+            taken_at TIMESTAMP(6) NOT NULL
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS dashboard_stats")
@@ -0,0 +1,33 @@
+"""index the scholarship list order
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from migrations.helpers import column_exists, create_index_if_missing, drop_index_if_exists
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The public list sorts open-ended scholarships last. Sorting on the
+    # expression `deadline IS NULL` forces a filesort; a generated column
+    # indexed after status lets the index return rows already in order.
+    if not column_exists("scholarships", "no_deadline"):
+        op.execute("""
+            ALTER TABLE scholarships
+                ADD COLUMN no_deadline TINYINT(1) AS (deadline IS NULL) VIRTUAL
+        """)
+    create_index_if_missing("scholarships", "idx_scholarships_status_no_deadline",
+                            ("status", "no_deadline", "deadline", "id"))
+
+
+def downgrade():
+    drop_index_if_exists("scholarships", "idx_scholarships_status_no_deadline")
+    op.execute("ALTER TABLE scholarships DROP COLUMN no_deadline")
@@ -0,0 +1,31 @@
+"""record processed user import batches
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A batch inserts its row here in the same transaction as its users and
+    # the progress update, so a retried job sees the batch is done and skips
+    # it instead of counting it twice.
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_import_batches (
+            import_id BIGINT NOT NULL,
+            batch INT NOT NULL,
+            PRIMARY KEY (import_id, batch),
+            FOREIGN KEY (import_id) REFERENCES user_imports(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS user_import_batches")
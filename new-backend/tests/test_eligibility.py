@@ -0,0 +1,78 @@
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.eligibility import EligibilityIndex
+
+
+Row = namedtuple("Row", "id title description eligibility_criteria cgpa_requirement category_requirement "
+                        "major_requirement amount deadline status created_by_name created_at")
+
+
+def row(id, cgpa=None, category=None, majors=None, deadline=None, status="active"):
+    return Row(id, f"Scholarship {id}", "", "", cgpa, category, majors, Decimal("1000"), deadline, status,
+               "Admin", datetime(2026, 1, 1))
+
+
+def index_of(*rows):
+    index = EligibilityIndex(sync_interval=3600, full_reload_interval=3600)
+    index._load(rows)
+    # Mark the index as freshly synced so eligible() never touches the database.
+    index._since = datetime(2026, 1, 1)
+    index._last_sync = time.monotonic()
+    return index
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+@pytest.mark.parametrize("cgpa, expected", [(7.49, []), (7.5, [1]), (9.0, [1])])
+def test_cgpa_requirement_is_inclusive(cgpa, expected):
+    index = index_of(row(1, cgpa=Decimal("7.50")))
+    assert ids(index.eligible(cgpa, None, None)) == expected
+
+
+def test_no_cgpa_requirement_matches_zero_cgpa():
+    assert ids(index_of(row(1)).eligible(0.0, None, None)) == [1]
+
+
+def test_category_requirement():
+    index = index_of(row(1), row(2, category="OBC"), row(3, category="SC"))
+    assert ids(index.eligible(8.0, " obc ", None)) == [1, 2]
+    assert ids(index.eligible(8.0, None, None)) == [1]
+    assert ids(index.eligible(8.0, "", None)) == [1]
+
+
+def test_major_requirement():
+    index = index_of(row(1, majors="Computer Science, Physics"), row(2, majors=" , "), row(3))
+    assert ids(index.eligible(8.0, None, "physics")) == [1, 2, 3]
+    assert ids(index.eligible(8.0, None, "Chemistry")) == [2, 3]
+    assert ids(index.eligible(8.0, None, None)) == [2, 3]
+
+
+def test_deadline_today_is_still_open():
+    today = date.today()
+    index = index_of(row(1, deadline=today), row(2, deadline=today - timedelta(days=1)))
+    assert ids(index.eligible(8.0, None, None)) == [1]
+
+
+def test_results_sorted_by_deadline_with_open_ended_first():
+    today = date.today()
+    index = index_of(
+        row(4, deadline=today + timedelta(days=2)),
+        row(3, cgpa=Decimal("9.00"), deadline=today + timedelta(days=1)),
+        row(2, category="OBC"),
+        row(1, deadline=today + timedelta(days=1)),
+    )
+    assert ids(index.eligible(9.5, "OBC", None)) == [2, 1, 3, 4]
+
+
+def test_apply_moves_updated_and_drops_closed_rows():
+    index = index_of(row(1, category="OBC"), row(2), row(3))
+    index._apply([row(1), row(2, status="closed")], deleted=(3,))
+    assert ids(index.eligible(8.0, None, None)) == [1]
+    assert "obc" not in index._buckets
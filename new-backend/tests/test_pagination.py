@@ -0,0 +1,71 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from app.pagination import MAX_LIMIT, InvalidCursor, KeysetPage, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.mark.parametrize("values", [
+    [42],
+    ["Ada Lovelace", 7],
+    [datetime(2026, 10, 18, 9, 30, 15, 123456), 3],
+    [date(2026, 12, 31), Decimal("3.75"), None, 1],
+    [True, -5],
+])
+def test_cursor_round_trip(values):
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == values
+
+
+def test_cursor_preserves_types():
+    decoded = decode_cursor(encode_cursor([datetime(2026, 1, 2, 3, 4, 5), date(2026, 1, 2), Decimal("1.10")]))
+    assert [type(v) for v in decoded] == [datetime, date, Decimal]
+    assert str(decoded[2]) == "1.10"
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "%%%", "e30", "NDI", "W3siZHQiOiJub3BlIn1d", "é"])
+def test_decode_cursor_rejects_garbage(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_keyset_page_rejects_cursor_for_other_columns(app):
+    cursor = encode_cursor(["Ada", 7])
+    with app.test_request_context(f"/?cursor={cursor}"):
+        with pytest.raises(InvalidCursor):
+            KeysetPage(("id", "id", True))
+
+
+@pytest.mark.parametrize("query, expected", [("", 50), ("?limit=10", 10), ("?limit=0", 1),
+                                             ("?limit=100000", MAX_LIMIT), ("?limit=abc", 50)])
+def test_keyset_page_limit(app, query, expected):
+    with app.test_request_context(f"/{query}"):
+        page = KeysetPage(("id", "id", True))
+        assert page.limit == expected
+        assert page.params == {"page_limit": expected + 1}
+
+
+def test_keyset_page_where_expands_mixed_directions(app):
+    cursor = encode_cursor([1, "2026-01-01", 9])
+    with app.test_request_context(f"/?cursor={cursor}"):
+        page = KeysetPage(("a", "a", False), ("b", "b", True), ("c", "c", False))
+        assert page.order_by == "a ASC, b DESC, c ASC"
+        assert page.where() == (
+            "AND ((a > :cursor_0)"
+            " OR (a <=> :cursor_0 AND b < :cursor_1)"
+            " OR (a <=> :cursor_0 AND b <=> :cursor_1 AND c > :cursor_2))"
+        )
+        assert page.params == {"page_limit": 51, "cursor_0": 1, "cursor_1": "2026-01-01", "cursor_2": 9}
+
+
+def test_keyset_page_without_cursor_has_no_filter(app):
+    with app.test_request_context("/"):
+        assert KeysetPage(("id", "id", True)).where() == ""
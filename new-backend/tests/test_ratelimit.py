@@ -0,0 +1,80 @@
+import pytest
+
+from app import ratelimit
+from app.ratelimit import MemoryBackend, Rule, parse_limit, parse_rules
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_parse_rules():
+    rules = parse_rules(" auth.login=10/60 , search=30/60,")
+    assert rules == {
+        "auth.login": Rule("auth.login", 10, 10 / 60),
+        "search": Rule("search", 30, 0.5),
+    }
+
+
+def test_parse_rules_empty():
+    assert parse_rules("") == {}
+
+
+@pytest.mark.parametrize("spec", ["auth.login", "auth.login=10", "auth.login=x/60", "a=0/60", "a=5/0", "a=1/2=3"])
+def test_parse_rules_rejects_invalid_entries(spec):
+    with pytest.raises(ValueError):
+        parse_rules(spec)
+
+
+def test_parse_limit():
+    assert parse_limit("auth.login:email", "5/300") == Rule("auth.login:email", 5, 5 / 300)
+
+
+def test_take_allows_up_to_capacity(clock):
+    backend = MemoryBackend(max_keys=10)
+    assert [backend.take("k", 3, 1.0)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_take_reports_wait_until_next_token(clock):
+    backend = MemoryBackend(max_keys=10)
+    backend.take("k", 1, 0.5)
+    allowed, retry_after = backend.take("k", 1, 0.5)
+    assert not allowed
+    assert retry_after == pytest.approx(2.0)
+
+
+def test_take_refills_over_time(clock):
+    backend = MemoryBackend(max_keys=10)
+    backend.take("k", 2, 1.0)
+    backend.take("k", 2, 1.0)
+    assert not backend.take("k", 2, 1.0)[0]
+
+    clock[0] += 1.0
+    assert backend.take("k", 2, 1.0) == (True, 0.0)
+    assert not backend.take("k", 2, 1.0)[0]
+
+    # Refill is capped at capacity however long the bucket sat idle.
+    clock[0] += 3600
+    assert [backend.take("k", 2, 1.0)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_take_keys_are_independent(clock):
+    backend = MemoryBackend(max_keys=10)
+    assert backend.take("a", 1, 1.0)[0]
+    assert not backend.take("a", 1, 1.0)[0]
+    assert backend.take("b", 1, 1.0)[0]
+
+
+def test_take_evicts_least_recently_seen(clock):
+    backend = MemoryBackend(max_keys=2)
+    backend.take("a", 1, 0.001)
+    backend.take("b", 1, 0.001)
+    backend.take("a", 1, 0.001)
+    backend.take("c", 1, 0.001)
+
+    assert list(backend._buckets) == ["a", "c"]
+    # An evicted client comes back with a full bucket.
+    assert backend.take("b", 1, 0.001)[0]
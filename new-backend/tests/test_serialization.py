@@ -0,0 +1,47 @@
+from collections import namedtuple
+from datetime import datetime
+from decimal import Decimal
+
+from app.serialization import Columns, Nested
+
+CONVERSATION = Columns(
+    "cm.conversation_id as id",
+    Nested("other_user", "u.id as other_user_id", "u.name as other_user_name"),
+    "cm.unread_count",
+    Nested("last_message", "cm.last_message_id", "LEFT(m.content, 200) as last_message_snippet"),
+)
+
+
+def test_columns_keys_follow_aliases():
+    columns = Columns("s.id", "u.name as created_by_name", "LEFT(s.description, :excerpt_chars) as excerpt")
+    assert columns.keys == ("id", "created_by_name", "excerpt")
+
+
+def test_dump_passes_values_through():
+    columns = Columns("s.id", "s.amount", "s.created_at")
+    created = datetime(2024, 1, 1, 9, 30)
+    assert columns.dump([(1, Decimal("7.50"), created)]) == [{"id": 1, "amount": Decimal("7.50"), "created_at": created}]
+
+
+def test_select_with_skips_selected_columns():
+    columns = Columns("s.id", "s.deadline")
+    assert columns.select_with("s.deadline", "s.no_deadline") == "s.id, s.deadline, s.no_deadline"
+
+
+def test_nested_groups_select_after_parent_columns():
+    assert CONVERSATION.select == (
+        "cm.conversation_id as id, cm.unread_count, u.id as other_user_id, u.name as other_user_name, "
+        "cm.last_message_id, LEFT(m.content, 200) as last_message_snippet"
+    )
+    assert CONVERSATION.select_with("cm.last_message_id") == CONVERSATION.select
+
+
+def test_nested_dump_drops_prefix_and_extra_columns():
+    Row = namedtuple("Row", "id unread_count other_user_id other_user_name last_message_id last_message_snippet extra")
+    row = Row(7, 2, 3, "Ada", 41, "hello", "sort key")
+    assert CONVERSATION.dump([row]) == [{
+        "id": 7,
+        "unread_count": 2,
+        "other_user": {"id": 3, "name": "Ada"},
+        "last_message": {"id": 41, "snippet": "hello"},
+    }]
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from app import cache, create_app, events, ratelimit
+from app.config import get_config
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    client = mock.MagicMock()
+    module = SimpleNamespace(Redis=SimpleNamespace(from_url=mock.Mock(return_value=client)))
+    for target in (cache, events, ratelimit):
+        monkeypatch.setattr(target, "redis", module)
+    return module
+
+
+@pytest.fixture
+def redis_env(monkeypatch):
+    for name in ("RATELIMIT_BACKEND", "RATELIMIT_REDIS_URL", "EVENTS_BACKEND", "EVENTS_REDIS_URL", "CACHE_BACKEND"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("CACHE_REDIS_URL", "redis://cache:6379/1")
+
+
+def test_redis_url_selects_redis_backends(redis_env):
+    config = get_config()
+    assert config["RATELIMIT_BACKEND"] == "redis"
+    assert config["RATELIMIT_REDIS_URL"] == "redis://cache:6379/1"
+    assert config["EVENTS_BACKEND"] == "redis"
+    assert config["EVENTS_REDIS_URL"] == "redis://cache:6379/1"
+
+
+def test_memory_backends_without_redis_url(monkeypatch):
+    for name in ("RATELIMIT_BACKEND", "RATELIMIT_REDIS_URL", "EVENTS_BACKEND", "EVENTS_REDIS_URL", "CACHE_REDIS_URL"):
+        monkeypatch.delenv(name, raising=False)
+    config = get_config()
+    assert config["RATELIMIT_BACKEND"] == "memory"
+    assert config["EVENTS_BACKEND"] == "memory"
+
+
+def test_rate_limiter_uses_redis_script(redis_env, fake_redis):
+    limiter = ratelimit.RateLimiter(get_config())
+
+    assert isinstance(limiter.backend, ratelimit.RedisBackend)
+    fake_redis.Redis.from_url.assert_called_once_with("redis://cache:6379/1")
+    client = fake_redis.Redis.from_url.return_value
+    client.register_script.assert_called_once_with(ratelimit.TAKE_SCRIPT)
+
+    client.register_script.return_value.return_value = [0, "2.5"]
+    assert limiter.backend.take("auth.login:ip:1.2.3.4", 10, 1 / 6) == (False, 2.5)
+    client.register_script.return_value.assert_called_once_with(
+        keys=["alumni:ratelimit:auth.login:ip:1.2.3.4"], args=[10, 1 / 6]
+    )
+
+
+def test_create_app_starts_with_redis_selected(redis_env, fake_redis, monkeypatch):
+    monkeypatch.setenv("APP_WORKER_PROCESSES", "4")
+    monkeypatch.setenv("CACHE_BACKEND", "redis")
+
+    app = create_app()
+
+    assert isinstance(cache.get_cache().backend, cache.RedisBackend)
+    assert isinstance(events.get_broker(), events.RedisBroker)
+    assert "/api/auth/login" in {rule.rule for rule in app.url_map.iter_rules()}
+
+
+def test_redis_backend_without_package_fails_loudly(redis_env, monkeypatch):
+    monkeypatch.setattr(ratelimit, "redis", None)
+    with pytest.raises(RuntimeError, match="requires the 'redis' package"):
+        ratelimit.RateLimiter(get_config())
@@ -0,0 +1,14 @@
+import logging
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app  # noqa: E402
+from app.jobs import build_worker  # noqa: E402
+import app.tasks  # noqa: E402,F401  (registers job handlers)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    build_worker(create_app()).run()
@@ -8,6 +8,7 @@ from app import create_app  # noqa: E402
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
-
+    if os.getenv("APP_SERVER", "development") == "gunicorn":
+        os.execvp("gunicorn", ["gunicorn", "--config", "gunicorn.conf.py", "wsgi:app"])
 
+    app.run(host="0.0.0.0", port=int(os.getenv("PORT", "5000")), debug=os.getenv("FLASK_DEBUG", "1") == "1")
@@ -0,0 +1,55 @@
+// Opens the server-sent event stream for the logged-in user and calls
+// handlers[eventName](data) for each event. EventSource cannot send an
+// Authorization header, so each connection uses a short-lived stream token
+// from /api/events/token. The server closes streams periodically and an
+// expired token cannot be reused, so instead of EventSource's built-in
+// reconnect every error closes the stream and reopens it with a new token
+// (backing off up to 30s while the server is unreachable).
+// Returns a function that closes the stream for good.
+export function subscribeToEvents(handlers) {
+  let source = null
+  let retryTimer = null
+  let attempt = 0
+  let closed = false
+
+  const reconnect = () => {
+    if (closed) return
+    const delay = Math.min(30000, 1000 * 2 ** attempt)
+    attempt += 1
+    retryTimer = setTimeout(connect, delay)
+  }
+
+  const connect = async () => {
+    const jwt = localStorage.getItem('token')
+    if (!jwt || closed) return
+    try {
+      const response = await fetch('/api/events/token', {
+        method: 'POST',
+        headers: { Authorization: `Bearer ${jwt}` }
+      })
+      if (!response.ok) {
+        throw new Error(`Request failed with status ${response.status}`)
+      }
+      const { token } = await response.json()
+      if (closed) return
+      source = new EventSource(`/api/events/stream?token=${encodeURIComponent(token)}`)
+      source.onopen = () => { attempt = 0 }
+      source.onerror = () => {
+        source.close()
+        reconnect()
+      }
+      Object.entries(handlers).forEach(([event, handler]) => {
+        source.addEventListener(event, (e) => handler(JSON.parse(e.data)))
+      })
+    } catch {
+      reconnect()
+    }
+  }
+
+  connect()
+  return () => {
+    closed = true
+    clearTimeout(retryTimer)
+    if (source) source.close()
+  }
+}
@@ -3,10 +3,12 @@ import { useNavigate } from 'react-router-dom';
 import { toast } from 'react-toastify';
 import axios from 'axios';
 import { API_BASE_URL } from '../config';
+import { usePagedList } from '../pagination';
 
 const AdminDashboard = () => {
-  const [users, setUsers] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: users, loading, loadingMore, error, hasMore, loadMore, reload
+  } = usePagedList(`${API_BASE_URL}/admin/users`, { authorized: true });
   const [currentUser, setCurrentUser] = useState(null);
   const navigate = useNavigate();
 
@@ -18,23 +20,14 @@ const AdminDashboard = () => {
       return;
     }
     setCurrentUser(user);
-    fetchUsers();
   }, [navigate]);
 
-  const fetchUsers = async () => {
-    try {
-      const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_BASE_URL}/admin/users`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setUsers(response.data);
-    } catch (error) {
+  useEffect(() => {
+    if (error) {
       toast.error('Failed to fetch users');
       console.error('Error fetching users:', error);
-    } finally {
-      setLoading(false);
     }
-  };
+  }, [error]);
 
   const handleDeleteUser = async (userId) => {
     if (window.confirm('Are you sure you want to delete this user?')) {
@@ -44,7 +37,7 @@ const AdminDashboard = () => {
           headers: { Authorization: `Bearer ${token}` }
         });
         toast.success('User deleted successfully');
-        fetchUsers();
+        reload();
       } catch (error) {
         toast.error('Failed to delete user');
         console.error('Error deleting user:', error);
@@ -94,6 +87,17 @@ const AdminDashboard = () => {
             </tbody>
           </table>
         </div>
+        {hasMore && (
+          <div className="text-center mt-4">
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="bg-gray-200 hover:bg-gray-300 px-4 py-2 rounded text-sm"
+            >
+              {loadingMore ? 'Loading...' : 'Load more users'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -16,14 +16,17 @@ export default function Home() {
 
     // Load dashboard data
     Promise.all([
-      fetch('/api/opportunities').then(r => r.json()).catch(() => []),
-      fetch('/api/stories').then(r => r.json()).catch(() => [])
-    ]).then(([opportunities, stories]) => {
-      setRecentOpportunities(opportunities.slice(0, 3))
-      setRecentStories(stories.slice(0, 3))
+      fetch('/api/opportunities?view=summary&limit=3').then(r => r.json()).catch(() => []),
+      fetch('/api/stories?view=summary&limit=3').then(r => r.json()).catch(() => []),
+      fetch('/api/stats', {
+        headers: { Authorization: `Bearer ${localStorage.getItem('token')}` }
+      }).then(r => (r.ok ? r.json() : {})).catch(() => ({}))
+    ]).then(([opportunities, stories, counts]) => {
+      setRecentOpportunities(Array.isArray(opportunities) ? opportunities : [])
+      setRecentStories(Array.isArray(stories) ? stories : [])
       setStats({
-        opportunities: opportunities.length,
-        stories: stories.length
+        opportunities: counts.opportunities,
+        stories: counts.stories
       })
     })
   }, [])
@@ -148,7 +151,7 @@ export default function Home() {
                     By {story.author_name}
                   </p>
                   <p style={{ margin: '0 0 8px 0', fontSize: '13px', color: '#888', lineHeight: '1.4' }}>
-                    {story.content?.substring(0, 120)}...
+                    {story.excerpt?.substring(0, 120)}...
                   </p>
                   <div style={{ fontSize: '12px', color: '#666' }}>
                     {new Date(story.created_at).toLocaleDateString()}
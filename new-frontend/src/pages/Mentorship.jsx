@@ -1,9 +1,13 @@
 import { useEffect, useState } from 'react'
+import { usePagedList } from '../pagination'
+import { subscribeToEvents } from '../events'
 
 export default function Mentorship() {
-  const [requests, setRequests] = useState([])
-  const [alumni, setAlumni] = useState([])
-  const [loading, setLoading] = useState(true)
+  const requestList = usePagedList('/api/mentorship/')
+  const alumniList = usePagedList('/api/users/alumni')
+  const requests = requestList.items
+  const alumni = alumniList.items
+  const loading = requestList.loading || alumniList.loading
   const [showRequestForm, setShowRequestForm] = useState(false)
   const [newRequest, setNewRequest] = useState({
     mentor_id: '',
@@ -12,16 +16,11 @@ export default function Mentorship() {
   })
   const user = JSON.parse(localStorage.getItem('user') || '{}')
 
-  useEffect(() => {
-    Promise.all([
-      fetch('/api/mentorship/').then(r => r.json()).catch(() => []),
-      fetch('/api/users/alumni').then(r => r.json()).catch(() => [])
-    ]).then(([mentorshipRequests, alumniList]) => {
-      setRequests(mentorshipRequests)
-      setAlumni(alumniList)
-      setLoading(false)
-    })
-  }, [])
+  // New requests and status changes arrive as `mentorship` events.
+  const reloadRequests = requestList.reload
+  useEffect(() => subscribeToEvents({
+    mentorship: () => reloadRequests()
+  }), [reloadRequests])
 
   const handleSubmitRequest = async (e) => {
     e.preventDefault()
@@ -46,7 +45,7 @@ export default function Mentorship() {
         setShowRequestForm(false)
         setNewRequest({ mentor_id: '', subject: '', message: '' })
         // Refresh requests
-        fetch('/api/mentorship/').then(r => r.json()).then(setRequests)
+        requestList.reload()
       } else {
         const error = await response.json()
         alert('Error: ' + (error.error || 'Failed to submit request'))
@@ -71,7 +70,7 @@ export default function Mentorship() {
       if (response.ok) {
         alert(`Request ${status} successfully!`)
         // Refresh requests
-        fetch('/api/mentorship/').then(r => r.json()).then(setRequests)
+        requestList.reload()
       } else {
         const error = await response.json()
         alert('Error: ' + (error.error || 'Failed to update request'))
@@ -208,6 +207,13 @@ export default function Mentorship() {
               <p>No mentors available at the moment</p>
             </div>
           )}
+          {alumniList.hasMore && (
+            <div className="text-center mt-2">
+              <button onClick={alumniList.loadMore} disabled={alumniList.loadingMore} className="btn btn-secondary">
+                {alumniList.loadingMore ? 'Loading...' : 'Load more mentors'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
@@ -277,6 +283,13 @@ export default function Mentorship() {
               <p>No mentorship requests yet</p>
             </div>
           )}
+          {requestList.hasMore && (
+            <div className="text-center mt-2">
+              <button onClick={requestList.loadMore} disabled={requestList.loadingMore} className="btn btn-secondary">
+                {requestList.loadingMore ? 'Loading...' : 'Load more requests'}
+              </button>
+            </div>
+          )}
         </div>
       </div>
     </div>
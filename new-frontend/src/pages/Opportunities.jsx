@@ -1,19 +1,11 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
+import { usePagedList } from '../pagination'
 
 export default function Opportunities() {
-  const [items, setItems] = useState([])
-  const [loading, setLoading] = useState(true)
+  const { items, loading, loadingMore, hasMore, loadMore } = usePagedList('/api/opportunities')
   const [filter, setFilter] = useState('all')
   const user = JSON.parse(localStorage.getItem('user') || '{}')
 
-  useEffect(() => {
-    fetch('/api/opportunities')
-      .then(r => r.json())
-      .then(setItems)
-      .catch(() => setItems([]))
-      .finally(() => setLoading(false))
-  }, [])
-
   const filteredItems = items.filter(item => {
     if (filter === 'all') return true
     return item.type === filter
@@ -133,6 +125,13 @@ export default function Opportunities() {
             </div>
           </div>
         )}
+        {hasMore && (
+          <div className="text-center mb-3">
+            <button onClick={loadMore} disabled={loadingMore} className="btn btn-secondary">
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   )
@@ -1,8 +1,8 @@
-import { useEffect, useState } from 'react'
+import { useState } from 'react'
+import { usePagedList } from '../pagination'
 
 export default function Stories() {
-  const [stories, setStories] = useState([])
-  const [loading, setLoading] = useState(true)
+  const { items: stories, loading, loadingMore, hasMore, loadMore, reload } = usePagedList('/api/stories')
   const [showStoryForm, setShowStoryForm] = useState(false)
   const [newStory, setNewStory] = useState({
     title: '',
@@ -11,14 +11,6 @@ export default function Stories() {
   })
   const user = JSON.parse(localStorage.getItem('user') || '{}')
 
-  useEffect(() => {
-    fetch('/api/stories')
-      .then(r => r.json())
-      .then(setStories)
-      .catch(() => setStories([]))
-      .finally(() => setLoading(false))
-  }, [])
-
   const handleSubmitStory = async (e) => {
     e.preventDefault()
     if (user.role !== 'alumni') {
@@ -42,7 +34,7 @@ export default function Stories() {
         setShowStoryForm(false)
         setNewStory({ title: '', content: '', category: 'career' })
         // Refresh stories
-        fetch('/api/stories').then(r => r.json()).then(setStories)
+        reload()
       } else {
         const error = await response.json()
         alert('Error: ' + (error.error || 'Failed to share story'))
@@ -208,6 +200,13 @@ export default function Stories() {
             </div>
           </div>
         )}
+        {hasMore && (
+          <div className="text-center mb-3">
+            <button onClick={loadMore} disabled={loadingMore} className="btn btn-secondary">
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   )
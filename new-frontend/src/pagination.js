@@ -0,0 +1,52 @@
+import { useCallback, useEffect, useState } from 'react'
+
+// List endpoints return at most `limit` rows per request and put the cursor
+// for the next page in the X-Next-Cursor header.
+export const PAGE_SIZE = 20
+
+// Fetches one page; resolves with { items, nextCursor } (nextCursor is null
+// on the last page) and rejects on a non-2xx response.
+export async function fetchPage(url, { cursor = null, limit = PAGE_SIZE, authorized = false } = {}) {
+  const params = new URLSearchParams({ limit })
+  if (cursor) params.set('cursor', cursor)
+  const headers = authorized ? { Authorization: `Bearer ${localStorage.getItem('token')}` } : {}
+  const response = await fetch(`${url}${url.includes('?') ? '&' : '?'}${params}`, { headers })
+  if (!response.ok) {
+    throw new Error(`Request failed with status ${response.status}`)
+  }
+  return { items: await response.json(), nextCursor: response.headers.get('X-Next-Cursor') }
+}
+
+// Loads the first page of `url` and appends the next one on loadMore(), so a
+// list only ever downloads what the user has asked to see. reload() starts
+// again from the first page (e.g. after a write).
+export function usePagedList(url, { authorized = false } = {}) {
+  const [items, setItems] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [error, setError] = useState(null)
+
+  const load = useCallback(async (cursor) => {
+    const setBusy = cursor ? setLoadingMore : setLoading
+    setBusy(true)
+    try {
+      const page = await fetchPage(url, { cursor, authorized })
+      setItems(previous => (cursor ? [...previous, ...page.items] : page.items))
+      setNextCursor(page.nextCursor)
+      setError(null)
+    } catch (err) {
+      if (!cursor) setItems([])
+      setError(err)
+    } finally {
+      setBusy(false)
+    }
+  }, [url, authorized])
+
+  useEffect(() => { load(null) }, [load])
+
+  const loadMore = useCallback(() => load(nextCursor), [load, nextCursor])
+  const reload = useCallback(() => load(null), [load])
+
+  return { items, loading, loadingMore, error, hasMore: Boolean(nextCursor), loadMore, reload }
+}
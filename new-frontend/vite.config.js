@@ -11,6 +11,7 @@ export default defineConfig({
         target: 'http://backend:5000',
         changeOrigin: true,
         secure: false,
+        xfwd: true,
       },
     },
   },